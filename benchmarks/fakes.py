@@ -0,0 +1,116 @@
+"""
+In-memory stand-ins for the external services the load test must not reach.
+
+MinIO keeps objects in a dict, Paddle only answers the listing calls and refuses everything else,
+docling returns a fixed markdown resume and Gemini returns empty JSON results.
+"""
+
+import json
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Any, BinaryIO
+
+from minio.error import S3Error
+from urllib3 import HTTPHeaderDict, HTTPResponse
+
+from src.talentgate.resume import service as resume_service
+
+RESUME_MARKDOWN = """
+# Jane Doe
+
+jane.doe@example.com | +1 202 555 0143
+
+## Experience
+
+Senior Python Engineer, Example Corp, 2019 - present. Built FastAPI services on Postgres and Redis.
+
+## Skills
+
+python, fastapi, postgresql, redis, kubernetes
+"""
+
+
+class FakeMinio:
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+
+    def put_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        content_type: str = "application/octet-stream",  # noqa: ARG002
+    ) -> SimpleNamespace:
+        self.objects[bucket_name, object_name] = data.read(length)
+        return SimpleNamespace(bucket_name=bucket_name, object_name=object_name, etag="etag", version_id=None)
+
+    def get_object(self, bucket_name: str, object_name: str) -> HTTPResponse:
+        if (bucket_name, object_name) not in self.objects:
+            raise S3Error(
+                response=HTTPResponse(status=404, headers=HTTPHeaderDict()),
+                code="NoSuchKey",
+                message="The specified key does not exist.",
+                resource=f"/{bucket_name}/{object_name}",
+                request_id="",
+                host_id="",
+                bucket_name=bucket_name,
+                object_name=object_name,
+            )
+
+        return HTTPResponse(body=BytesIO(self.objects[bucket_name, object_name]), preload_content=True)
+
+
+class FakePaddleResource:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def list(self, *args: Any, **kwargs: Any) -> list:  # noqa: ANN401, ARG002
+        return []
+
+    def __getattr__(self, method: str) -> Any:  # noqa: ANN401
+        """Refuse every call the load test does not expect to make."""
+        msg = f"paddle {self.name}.{method} is not faked"
+        raise NotImplementedError(msg)
+
+
+class FakePaddle:
+    def __init__(self) -> None:
+        self.customers = FakePaddleResource("customers")
+        self.products = FakePaddleResource("products")
+        self.subscriptions = FakePaddleResource("subscriptions")
+        self.transactions = FakePaddleResource("transactions")
+
+
+class FakeGeminiModels:
+    def generate_content(self, *, model: str, contents: str, config: Any) -> SimpleNamespace:  # noqa: ANN401, ARG002
+        return SimpleNamespace(text=json.dumps({}))
+
+
+class FakeGeminiAsyncModels:
+    async def generate_content(self, *, model: str, contents: str, config: Any) -> SimpleNamespace:  # noqa: ANN401, ARG002
+        return SimpleNamespace(text=json.dumps([]))
+
+
+class FakeGeminiAsyncCaches:
+    async def create(self, *, model: str, config: Any) -> SimpleNamespace:  # noqa: ANN401, ARG002
+        return SimpleNamespace(name="cachedContents/load-test")
+
+    async def delete(self, *, name: str) -> None:
+        pass
+
+
+class FakeGemini:
+    def __init__(self) -> None:
+        self.models = FakeGeminiModels()
+        self.aio = SimpleNamespace(models=FakeGeminiAsyncModels(), caches=FakeGeminiAsyncCaches())
+
+
+def convert(file: bytes) -> str:  # noqa: ARG001
+    return RESUME_MARKDOWN
+
+
+def install() -> None:
+    """Replace the module level docling and Gemini clients of the resume service."""
+    resume_service.convert = convert
+    resume_service.client = FakeGemini()
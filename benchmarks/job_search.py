@@ -0,0 +1,124 @@
+"""
+Benchmark full-text job search against a large Postgres table.
+
+Seeds a throwaway company with synthetic jobs through generate_series, analyzes the table and
+times search_by_query_parameters for a handful of queries, then prints the plan of the last one:
+
+    python -m benchmarks.job_search --rows 1000000 --rounds 20
+
+The search_vector column comes from the alembic migrations, run alembic upgrade head first.
+"""
+
+import argparse
+import asyncio
+import secrets
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, delete
+
+from src.talentgate.company.models import Company
+from src.talentgate.database.service import get_sqlmodel_engine
+from src.talentgate.job.models import JobQueryParameters
+from src.talentgate.job.service import search_by_query_parameters
+
+QUERIES = ["python engineer", "senior data", '"account manager"', "backend -java", "kubernetes platform"]
+
+SEED_STATEMENT = text(
+    """
+    INSERT INTO job (title, department, description, employment_type, company_id, created_at, updated_at)
+    SELECT
+        (ARRAY['Senior', 'Junior', 'Staff', 'Lead', 'Principal'])[1 + i % 5] || ' ' ||
+        (ARRAY['Python', 'Java', 'Data', 'Backend', 'Platform', 'Account'])[1 + i % 6] || ' ' ||
+        (ARRAY['Engineer', 'Manager', 'Analyst', 'Scientist'])[1 + i % 4],
+        (ARRAY['Engineering', 'Data', 'Sales', 'Operations'])[1 + i % 4],
+        'Work on ' || (ARRAY['kubernetes', 'postgres', 'pipelines', 'accounts', 'apis'])[1 + i % 5] ||
+        ' with a team of ' || i % 50 || ' people in a ' ||
+        (ARRAY['remote', 'hybrid', 'onsite'])[1 + i % 3] || ' setting.',
+        'full-time',
+        :company_id,
+        extract(epoch from now()),
+        extract(epoch from now())
+    FROM generate_series(1, :rows) AS i
+    """
+)
+
+
+def percentile(latencies: list[float], q: int) -> float:
+    return statistics.quantiles(latencies, n=100)[q - 1]
+
+
+async def measure(sqlmodel_session: Session, company_id: int, q: str, limit: int, rounds: int) -> list[float]:
+    latencies = []
+
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        await search_by_query_parameters(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company_id,
+            query_parameters=JobQueryParameters(q=q, limit=limit),
+        )
+        latencies.append(time.perf_counter() - started_at)
+
+    return latencies
+
+
+async def benchmark(rows: int, limit: int, rounds: int) -> None:
+    engine = get_sqlmodel_engine()
+
+    if engine.dialect.name != "postgresql":
+        print("full-text search benchmark requires postgres")  # noqa: T201
+        return
+
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as sqlmodel_session:
+        company = Company(name=f"benchmark-{secrets.token_hex(6)}")
+        sqlmodel_session.add(company)
+        sqlmodel_session.commit()
+        sqlmodel_session.refresh(company)
+
+        try:
+            started_at = time.perf_counter()
+            sqlmodel_session.exec(SEED_STATEMENT, params={"company_id": company.id, "rows": rows})
+            sqlmodel_session.exec(text("ANALYZE job"))
+            sqlmodel_session.commit()
+            print(f"seeded {rows} jobs in {time.perf_counter() - started_at:.1f}s")  # noqa: T201
+
+            for q in QUERIES:
+                latencies = await measure(sqlmodel_session, company.id, q, limit, rounds)
+                print(  # noqa: T201
+                    f"{q!r:<24} p50={percentile(latencies, 50) * 1000:.1f}ms "
+                    f"p95={percentile(latencies, 95) * 1000:.1f}ms "
+                    f"p99={percentile(latencies, 99) * 1000:.1f}ms"
+                )
+
+            plan = sqlmodel_session.exec(
+                text(
+                    "EXPLAIN ANALYZE SELECT id FROM job "
+                    "WHERE company_id = :company_id AND search_vector @@ websearch_to_tsquery('english', :q) "
+                    "ORDER BY ts_rank(search_vector, websearch_to_tsquery('english', :q)) DESC, id LIMIT :limit"
+                ),
+                params={"company_id": company.id, "q": QUERIES[-1], "limit": limit},
+            )
+            for (line,) in plan:
+                print(line)  # noqa: T201
+        finally:
+            sqlmodel_session.rollback()
+            sqlmodel_session.exec(delete(Company).where(Company.id == company.id))
+            sqlmodel_session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of jobs to seed")
+    parser.add_argument("--limit", type=int, default=20, help="page size per search")
+    parser.add_argument("--rounds", type=int, default=20, help="measurements per query")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(rows=args.rows, limit=args.limit, rounds=args.rounds))
+
+
+if __name__ == "__main__":
+    main()
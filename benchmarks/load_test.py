@@ -0,0 +1,384 @@
+"""
+Load test the API in process against the local Postgres and Redis.
+
+Boots main.app with MinIO, Paddle, docling and Gemini replaced by the in-memory fakes of
+benchmarks.fakes, seeds a company with a verified founder, an invitation and a set of jobs, then
+drives every scenario with --concurrency clients for --requests requests and prints p50/p95/p99
+and throughput per route. The seeded rows are deleted afterwards.
+
+With --baseline the p95 of every route is compared to a stored run, and the command exits non-zero
+when one of them regressed by more than --threshold or a request failed:
+
+    python -m benchmarks.load_test --concurrency 20 --requests 500 --baseline benchmarks/load_test.json
+    python -m benchmarks.load_test --baseline benchmarks/load_test.json --update-baseline
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import secrets
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+from sqlmodel import Session, delete
+
+from benchmarks import fakes
+from benchmarks.job_search import QUERIES
+from config import Settings, get_settings
+from main import app, lifespan
+from src.talentgate.company import service as company_service
+from src.talentgate.company.enums import CompanyEmployeeTitle, CompanyInvitationStatus
+from src.talentgate.company.models import CreateCompany, CreateCompanyEmployee, UpsertCompanyInvitation
+from src.talentgate.database.service import get_sqlmodel_engine
+from src.talentgate.email.models import EmailOutbox
+from src.talentgate.job import service as job_service
+from src.talentgate.job.models import CreateJob
+from src.talentgate.payment.service import get_paddle_client
+from src.talentgate.storage.service import get_minio_client
+from src.talentgate.user import service as user_service
+from src.talentgate.user.enums import UserSubscriptionPlan
+from src.talentgate.user.models import CreateUser, CreateUserSubscription
+
+PASSWORD = "load-test-password"  # noqa: S105
+
+TITLES = ["Senior Python Engineer", "Junior Data Analyst", "Staff Platform Engineer", "Lead Account Manager"]
+
+DEPARTMENTS = ["Engineering", "Data", "Sales", "Operations"]
+
+RESUME = b"%PDF-1.4\n% load test resume\n"
+
+SEQUENCE = itertools.count()
+
+
+@dataclass(frozen=True)
+class Seed:
+    domain: str
+    email: str
+    company_id: int
+    job_ids: list[int]
+    access_token: str | None = None
+
+
+def percentile(latencies: list[float], q: int) -> float:
+    return statistics.quantiles(latencies, n=100)[q - 1]
+
+
+def next_email(seed: Seed, prefix: str) -> str:
+    return f"{prefix}-{next(SEQUENCE)}@{seed.domain}"
+
+
+def pick_job(seed: Seed) -> int:
+    return seed.job_ids[next(SEQUENCE) % len(seed.job_ids)]
+
+
+def authorization(seed: Seed) -> dict[str, str]:
+    return {"Authorization": f"Bearer {seed.access_token}"}
+
+
+async def login(client: httpx.AsyncClient, seed: Seed) -> httpx.Response:
+    return await client.post("/api/v1/auth/login", json={"email": seed.email, "password": PASSWORD})
+
+
+async def retrieve_current_company(client: httpx.AsyncClient, seed: Seed) -> httpx.Response:
+    return await client.get("/api/v1/me/company", headers=authorization(seed))
+
+
+async def list_career_jobs(client: httpx.AsyncClient, seed: Seed) -> httpx.Response:
+    return await client.get(
+        f"/api/v1/careers/companies/{seed.company_id}/jobs",
+        params={"offset": next(SEQUENCE) % 100, "limit": 20},
+    )
+
+
+async def search_career_jobs(client: httpx.AsyncClient, seed: Seed) -> httpx.Response:
+    return await client.get(
+        f"/api/v1/careers/companies/{seed.company_id}/jobs",
+        params={"q": QUERIES[next(SEQUENCE) % len(QUERIES)], "limit": 20},
+    )
+
+
+async def submit_application(client: httpx.AsyncClient, seed: Seed) -> httpx.Response:
+    return await client.post(
+        "/api/v1/applications",
+        json={
+            "job_id": pick_job(seed),
+            "applicant": {"firstname": "Load", "lastname": "Test", "email": next_email(seed, "applicant")},
+        },
+    )
+
+
+async def upload_resume(client: httpx.AsyncClient, seed: Seed) -> httpx.Response:
+    """Submit an application untimed, then upload its resume, only the upload is measured."""
+    job_id = pick_job(seed)
+    response = await client.post(
+        "/api/v1/applications",
+        json={
+            "job_id": job_id,
+            "applicant": {"firstname": "Load", "lastname": "Test", "email": next_email(seed, "resume")},
+        },
+    )
+    response.raise_for_status()
+
+    return await client.post(
+        f"/api/v1/jobs/{job_id}/applications/{response.json()['id']}/resume",
+        files={"file": ("resume.pdf", RESUME, "application/pdf")},
+    )
+
+
+async def invite_employee(client: httpx.AsyncClient, seed: Seed) -> httpx.Response:
+    return await client.post(
+        "/api/v1/me/company/employee-invitations",
+        json={"title": "Recruiter", "email": next_email(seed, "invitee")},
+        headers=authorization(seed),
+    )
+
+
+SCENARIOS: dict[str, tuple[str, Callable[[httpx.AsyncClient, Seed], Awaitable[httpx.Response]]]] = {
+    "login": ("POST /api/v1/auth/login", login),
+    "company": ("GET /api/v1/me/company", retrieve_current_company),
+    "careers": ("GET /api/v1/careers/companies/{company_id}/jobs", list_career_jobs),
+    "search": ("GET /api/v1/careers/companies/{company_id}/jobs?q", search_career_jobs),
+    "apply": ("POST /api/v1/applications", submit_application),
+    "resume": ("POST /api/v1/jobs/{job_id}/applications/{application_id}/resume", upload_resume),
+    "invite": ("POST /api/v1/me/company/employee-invitations", invite_employee),
+}
+
+
+async def seed_company(sqlmodel_session: Session, jobs: int) -> Seed:
+    token = secrets.token_hex(6)
+    domain = f"{token}.load-test.invalid"
+
+    company = await company_service.create(sqlmodel_session=sqlmodel_session, company=CreateCompany(name=token))
+
+    await company_service.create_employee(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        employee=CreateCompanyEmployee(
+            title=CompanyEmployeeTitle.FOUNDER.value,
+            user=CreateUser(
+                firstname="Load",
+                lastname="Test",
+                username=f"load-test-{token}",
+                email=f"founder@{domain}",
+                password=PASSWORD,
+                verified=True,
+                subscription=CreateUserSubscription(
+                    plan=UserSubscriptionPlan.STANDARD.value,
+                    start_date=datetime.now(UTC).timestamp(),
+                ),
+            ),
+        ),
+    )
+
+    # inviting requires a pending invitation to exist already
+    await company_service.upsert_invitation(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        retrieved_invitation=None,
+        invitation=UpsertCompanyInvitation(email=f"seed@{domain}", status=CompanyInvitationStatus.PENDING.value),
+    )
+
+    job_ids = job_service.insert_jobs(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        jobs=[
+            CreateJob(
+                title=TITLES[index % len(TITLES)],
+                department=DEPARTMENTS[index % len(DEPARTMENTS)],
+                description=f"Work on kubernetes, postgres and apis with a team of {index % 50} people.",
+                employment_type="full-time",
+            )
+            for index in range(jobs)
+        ],
+    )
+    sqlmodel_session.commit()
+
+    return Seed(domain=domain, email=f"founder@{domain}", company_id=company.id, job_ids=job_ids)
+
+
+async def remove_company(sqlmodel_session: Session, seed: Seed) -> None:
+    sqlmodel_session.rollback()
+
+    retrieved_user = await user_service.retrieve_by_email(sqlmodel_session=sqlmodel_session, email=seed.email)
+    retrieved_company = await company_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session, company_id=seed.company_id
+    )
+
+    if retrieved_company:
+        await company_service.delete(sqlmodel_session=sqlmodel_session, retrieved_company=retrieved_company)
+
+    if retrieved_user:
+        await user_service.delete(sqlmodel_session=sqlmodel_session, retrieved_user=retrieved_user)
+
+    sqlmodel_session.exec(delete(EmailOutbox).where(EmailOutbox.to_addrs.endswith(f"@{seed.domain}")))
+    sqlmodel_session.commit()
+
+
+def relax_login_throttle() -> Settings:
+    """Lift the login throttle, every simulated client shares one address and one account."""
+    return get_settings().model_copy(
+        update={
+            "login_throttle_email_limit": 10**9,
+            "login_throttle_ip_limit": 10**9,
+            "login_throttle_free_attempts": 10**9,
+        }
+    )
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: Callable[[httpx.AsyncClient, Seed], Awaitable[httpx.Response]],
+    seed: Seed,
+    concurrency: int,
+    requests: int,
+) -> tuple[list[float], int, float]:
+    """Run the scenario requests times over concurrency clients, returns the latencies, errors and duration."""
+    remaining = iter(range(requests))
+    latencies = []
+    errors = 0
+
+    async def run() -> None:
+        nonlocal errors
+
+        for _ in remaining:
+            try:
+                response = await scenario(client, seed)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+
+            if response.is_error:
+                errors += 1
+            else:
+                latencies.append(response.elapsed.total_seconds())
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(run() for _ in range(concurrency)))
+
+    return latencies, errors, time.perf_counter() - started_at
+
+
+async def benchmark(
+    scenarios: list[str],
+    concurrency: int,
+    requests: int,
+    warmup: int,
+    jobs: int,
+) -> dict[str, dict[str, float]]:
+    fakes.install()
+    app.dependency_overrides[get_minio_client] = lambda minio_client=fakes.FakeMinio(): minio_client
+    app.dependency_overrides[get_paddle_client] = fakes.FakePaddle
+    app.dependency_overrides[get_settings] = relax_login_throttle
+
+    results = {}
+
+    async with lifespan(app):
+        with Session(get_sqlmodel_engine()) as sqlmodel_session:
+            seed = await seed_company(sqlmodel_session, jobs)
+
+            try:
+                async with httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app),
+                    base_url="http://load-test",
+                    timeout=60.0,
+                ) as client:
+                    response = await login(client, seed)
+                    response.raise_for_status()
+                    seed = replace(seed, access_token=response.json()["access_token"])
+
+                    for name in scenarios:
+                        route, scenario = SCENARIOS[name]
+
+                        await drive(client, scenario, seed, concurrency, warmup)
+                        latencies, errors, duration = await drive(client, scenario, seed, concurrency, requests)
+
+                        results[route] = {
+                            "requests": requests,
+                            "errors": errors,
+                            "p50": percentile(latencies, 50) if len(latencies) > 1 else None,
+                            "p95": percentile(latencies, 95) if len(latencies) > 1 else None,
+                            "p99": percentile(latencies, 99) if len(latencies) > 1 else None,
+                            "throughput": len(latencies) / duration,
+                        }
+
+                        print(  # noqa: T201
+                            f"{route:<64} p50={(results[route]['p50'] or 0) * 1000:.1f}ms "
+                            f"p95={(results[route]['p95'] or 0) * 1000:.1f}ms "
+                            f"p99={(results[route]['p99'] or 0) * 1000:.1f}ms "
+                            f"throughput={results[route]['throughput']:.1f}/s errors={errors}"
+                        )
+            finally:
+                await remove_company(sqlmodel_session, seed)
+
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float) -> list[str]:
+    """Routes that failed a request, or whose p95 exceeds the baseline p95 by more than the threshold."""
+    regressions = []
+
+    for route, result in results.items():
+        if result["errors"] or result["p95"] is None:
+            regressions.append(f"{route} failed {result['errors']} of {result['requests']} requests")
+            continue
+
+        if route not in baseline or not baseline[route].get("p95"):
+            continue
+
+        ratio = result["p95"] / baseline[route]["p95"]
+
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{route} p95 {result['p95'] * 1000:.1f}ms is {ratio - 1:.0%} above the baseline "
+                f"{baseline[route]['p95'] * 1000:.1f}ms"
+            )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent clients per scenario")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per scenario")
+    parser.add_argument("--jobs", type=int, default=500, help="number of jobs to seed")
+    parser.add_argument("--baseline", type=Path, help="json file of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p95 regression, 0.2 is 20%%")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        benchmark(
+            scenarios=args.scenarios,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            warmup=args.warmup,
+            jobs=args.jobs,
+        )
+    )
+
+    if args.baseline and args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"stored baseline in {args.baseline}")  # noqa: T201
+        return
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline and args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.threshold)
+
+    for regression in regressions:
+        print(f"regression: {regression}")  # noqa: T201
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
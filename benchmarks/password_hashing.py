@@ -0,0 +1,72 @@
+"""
+Calibrate the scrypt cost for password hashing on the current hardware.
+
+Measures PasswordHashLibrary.encode for increasing values of n and prints the settings
+for the largest cost whose median latency stays within the target:
+
+    python -m benchmarks.password_hashing --target 0.25
+"""
+
+import argparse
+import secrets
+import statistics
+import time
+
+from pytography import PasswordHashLibrary
+
+# hashlib.scrypt refuses to use more than 32 MiB unless maxmem is raised, which pytography does not do
+MAX_MEMORY = 32 * 1024 * 1024
+
+
+def measure(n: int, r: int, p: int, rounds: int) -> float:
+    latencies = []
+
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        PasswordHashLibrary.encode(
+            password=secrets.token_hex(16),
+            salt=secrets.token_hex(16),
+            algorithm="scrypt",
+            n=n,
+            r=r,
+            p=p,
+        )
+        latencies.append(time.perf_counter() - started_at)
+
+    return statistics.median(latencies)
+
+
+def calibrate(target: float, r: int, p: int, rounds: int) -> int:
+    n = 2**10
+    calibrated = n
+
+    while 128 * r * n < MAX_MEMORY:
+        latency = measure(n=n, r=r, p=p, rounds=rounds)
+        print(f"n={n:<8} r={r} p={p} median={latency * 1000:.1f}ms")  # noqa: T201
+
+        if latency > target:
+            break
+
+        calibrated = n
+        n *= 2
+
+    return calibrated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", type=float, default=0.25, help="target latency per hash in seconds")
+    parser.add_argument("--r", type=int, default=8, help="scrypt block size")
+    parser.add_argument("--p", type=int, default=1, help="scrypt parallelization factor")
+    parser.add_argument("--rounds", type=int, default=5, help="measurements per cost")
+    args = parser.parse_args()
+
+    n = calibrate(target=args.target, r=args.r, p=args.p, rounds=args.rounds)
+
+    print(f"PASSWORD_HASH_SCRYPT_N={n}")  # noqa: T201
+    print(f"PASSWORD_HASH_SCRYPT_R={args.r}")  # noqa: T201
+    print(f"PASSWORD_HASH_SCRYPT_P={args.p}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -26,13 +26,35 @@ class Settings(BaseSettings):
     docling_port: str
     docling_api_key: str
     gemini_api_key: str
+    resume_evaluation_batch_size: int = 5
+    resume_conversion_concurrency: int = 4
+    resume_similarity_threshold: float = 0.0
+    resume_similarity_top_k: int = 0
+    resume_similarity_dimensions: int = 4096
+
+    applicant_phone_default_country_code: str | None = None
     google_client_id: str
     password_hash_algorithm: str
+    password_hash_scrypt_n: int = 16384
+    password_hash_scrypt_r: int = 8
+    password_hash_scrypt_p: int = 1
+    password_hash_pool_size: int = 2
+    password_hash_queue_limit: int = 64
+    login_throttle_window: float = 900.0
+    login_throttle_email_limit: int = 10
+    login_throttle_ip_limit: int = 100
+    login_throttle_lockout: float = 900.0
+    login_throttle_free_attempts: int = 3
+    login_throttle_delay: float = 0.5
+    login_throttle_max_delay: float = 8.0
+    trusted_proxies: list[str] = ["127.0.0.1/32", "::1/128"]
     message_digest_algorithm: str
     access_token_expiration: float
     access_token_key: str
     access_token_algorithm: str
     access_token_type: str
+    access_token_signing_keys_dir: str | None = None
+    access_token_signing_kid: str | None = None
     refresh_token_expiration: float
     refresh_token_key: str
     refresh_token_algorithm: str
@@ -46,8 +68,36 @@ class Settings(BaseSettings):
     smtp_user: str
     smtp_email: str
     smtp_password: str
+    smtp_pool_size: int = 4
+    smtp_max_messages_per_connection: int = 100
+    smtp_keepalive: float = 30.0
+    smtp_rate_limit: float = 0.0
+    email_outbox_batch_size: int = 50
+    email_outbox_max_attempts: int = 5
+    email_outbox_retry_backoff: float = 30.0
+    email_outbox_poll_interval: float = 1.0
     paddle_api_secret_key: str
     paddle_api_environment: str
+    paddle_webhook_secret_key: str = ""
+    payment_event_max_attempts: int = 5
+    payment_reconcile_delay: float = 600.0
+    payment_reconcile_interval: float = 300.0
+    payment_reconcile_batch_size: int = 100
+    payment_transaction_expiration: float = 86400.0
+
+    job_facets_cache_ttl: int = 300
+    job_import_batch_size: int = 500
+    job_import_max_errors: int = 100
+    application_export_batch_size: int = 1000
+    counter_reconcile_interval: float = 3600.0
+    analytics_refresh_interval: float = 300.0
+    analytics_refresh_lag: float = 60.0
+    analytics_refresh_batch_size: int = 500
+    partition_months_ahead: int = 3
+    partition_retention_months: int = 0
+    partition_maintenance_interval: float = 86400.0
+    metrics_event_loop_interval: float = 0.5
+    metrics_worker_port: int | None = None
 
     model_config = SettingsConfigDict(
         extra="allow",
@@ -1,16 +1,22 @@
+import asyncio
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import SQLModel
 
+from config import get_settings
 from src.talentgate.application.views import router as application_router
+from src.talentgate.auth.hashing import get_password_hash_pool
 from src.talentgate.auth.views import router as auth_router
 from src.talentgate.company.views import router as company_router
 from src.talentgate.database.service import get_sqlmodel_engine
 from src.talentgate.job.views import router as job_router
+from src.talentgate.metrics import service as metrics_service
+from src.talentgate.metrics.middleware import MetricsMiddleware
+from src.talentgate.metrics.views import router as metrics_router
 from src.talentgate.payment.views import router as payment_router
 from src.talentgate.user.views import router as user_router
 
@@ -19,7 +25,15 @@ from src.talentgate.user.views import router as user_router
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, Any]:
     engine = get_sqlmodel_engine()
     SQLModel.metadata.create_all(engine)
+    event_loop_monitor = asyncio.create_task(
+        metrics_service.monitor_event_loop(interval=get_settings().metrics_event_loop_interval)
+    )
     yield
+    event_loop_monitor.cancel()
+    with suppress(asyncio.CancelledError):
+        await event_loop_monitor
+    get_password_hash_pool().shutdown()
+    metrics_service.mark_process_dead()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -34,6 +48,7 @@ app.openapi_tags = [
     {"name": "applications", "description": "Operations with applications"},
     {"name": "jobs", "description": "Operations with jobs"},
     {"name": "payment", "description": "Operations with payments"},
+    {"name": "metrics", "description": "Operations with metrics"},
 ]
 
 app.include_router(auth_router)
@@ -42,6 +57,7 @@ app.include_router(company_router)
 app.include_router(application_router)
 app.include_router(job_router)
 app.include_router(payment_router)
+app.include_router(metrics_router)
 
 
 app.add_middleware(
@@ -51,3 +67,5 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,37 @@
+from sqlmodel import Field, SQLModel
+
+from src.talentgate.database.models import BaseModel
+
+
+class ApplicationSummary(SQLModel, table=True):
+    __tablename__ = "application_summary"
+
+    job_id: int = Field(primary_key=True, foreign_key="job.id", ondelete="CASCADE")
+    status: str = Field(primary_key=True)
+    company_id: int = Field(index=True, foreign_key="company.id", ondelete="CASCADE")
+    applications: int = Field(default=0)
+    scored_applications: int = Field(default=0)
+    overall_score_sum: float = Field(default=0.0)
+    status_changed_at_sum: float = Field(default=0.0)
+    refreshed_at: float = Field(index=True)
+
+
+class StageAnalytics(BaseModel):
+    status: str
+    applications: int
+    average_overall_score: float | None = None
+    average_days_in_stage: float | None = None
+
+
+class JobAnalytics(BaseModel):
+    job_id: int
+    applications: int
+    average_overall_score: float | None = None
+    stages: list[StageAnalytics] | None = None
+
+
+class CompanyAnalytics(BaseModel):
+    applications: int = 0
+    average_overall_score: float | None = None
+    jobs: list[JobAnalytics] | None = None
+    refreshed_at: float | None = None
@@ -0,0 +1,172 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from itertools import groupby
+from typing import Any
+
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import func, insert, literal
+from sqlalchemy import update as sql_update
+from sqlmodel import Session, select
+
+from src.talentgate.analytics.models import ApplicationSummary, CompanyAnalytics, JobAnalytics, StageAnalytics
+from src.talentgate.application.models import Application
+from src.talentgate.job.models import Job
+
+SECONDS_PER_DAY = 86400
+
+
+def refresh(*, sqlmodel_session: Session, job_ids: Sequence[int], refreshed_at: float | None = None) -> None:
+    """
+    Stage a recomputation of the summary rows of the given jobs, the caller commits.
+
+    The rows of a job are replaced as a whole, so statuses a job no longer has disappear.
+    """
+    if not job_ids:
+        return
+
+    refreshed_at = refreshed_at or datetime.now(UTC).timestamp()
+
+    sqlmodel_session.execute(sql_delete(ApplicationSummary).where(ApplicationSummary.job_id.in_(job_ids)))
+
+    summaries: Any = (
+        select(
+            Application.job_id,
+            Application.status,
+            Job.company_id,
+            func.count(),
+            func.count(Application.overall_score),
+            func.coalesce(func.sum(Application.overall_score), 0.0),
+            func.sum(func.coalesce(Application.status_changed_at, Application.created_at)),
+            literal(refreshed_at),
+        )
+        .join(Job, Job.id == Application.job_id)
+        .where(Application.job_id.in_(job_ids), Application.status.is_not(None))
+        .group_by(Application.job_id, Application.status, Job.company_id)
+    )
+
+    sqlmodel_session.execute(
+        insert(ApplicationSummary).from_select(
+            [
+                "job_id",
+                "status",
+                "company_id",
+                "applications",
+                "scored_applications",
+                "overall_score_sum",
+                "status_changed_at_sum",
+                "refreshed_at",
+            ],
+            summaries,
+        )
+    )
+
+
+def subtract(*, sqlmodel_session: Session, retrieved_application: Application) -> None:
+    """
+    Stage the removal of a deleted application from its summary row, the caller commits.
+
+    A deleted row leaves no updated_at behind for refresh_changed to find, so its contribution is taken
+    out as a delta instead.
+    """
+    status_changed_at = retrieved_application.status_changed_at or retrieved_application.created_at
+    overall_score = retrieved_application.overall_score
+
+    statement: Any = (
+        sql_update(ApplicationSummary)
+        .where(
+            ApplicationSummary.job_id == retrieved_application.job_id,
+            ApplicationSummary.status == retrieved_application.status,
+            ApplicationSummary.applications > 0,
+        )
+        .values(
+            applications=ApplicationSummary.applications - 1,
+            scored_applications=ApplicationSummary.scored_applications - int(overall_score is not None),
+            overall_score_sum=ApplicationSummary.overall_score_sum - (overall_score or 0.0),
+            status_changed_at_sum=ApplicationSummary.status_changed_at_sum - status_changed_at,
+        )
+    )
+
+    sqlmodel_session.execute(statement)
+
+
+async def refresh_changed(*, sqlmodel_session: Session, lag: float, batch_size: int) -> int:
+    """
+    Refresh the summaries of the jobs whose applications changed since the last refresh.
+
+    The last refresh time is the watermark, moved back by lag so that rows committed by transactions
+    that were still open at the time are picked up on the next run. The changed jobs are read from
+    ix_application_updated_at_job_id, one index range per partition. Jobs are refreshed and committed
+    batch_size at a time and the number of refreshed jobs is returned.
+    """
+    refreshed_at = datetime.now(UTC).timestamp()
+
+    watermark = sqlmodel_session.exec(select(func.max(ApplicationSummary.refreshed_at))).one()
+
+    statement: Any = select(Application.job_id).distinct()
+
+    if watermark is not None:
+        statement = statement.where(Application.updated_at >= watermark - lag)
+
+    job_ids = list(sqlmodel_session.exec(statement).all())
+
+    for start in range(0, len(job_ids), batch_size):
+        refresh(
+            sqlmodel_session=sqlmodel_session, job_ids=job_ids[start : start + batch_size], refreshed_at=refreshed_at
+        )
+        sqlmodel_session.commit()
+
+    return len(job_ids)
+
+
+def average(total: float, count: int) -> float | None:
+    return total / count if count else None
+
+
+async def retrieve_company_analytics(*, sqlmodel_session: Session, company_id: int) -> CompanyAnalytics:
+    """Hiring funnel of a company read from the summary table only, one row per job and status."""
+    statement: Any = (
+        select(ApplicationSummary)
+        .where(ApplicationSummary.company_id == company_id)
+        .order_by(ApplicationSummary.job_id, ApplicationSummary.status)
+    )
+
+    summaries = sqlmodel_session.exec(statement).all()
+
+    now = datetime.now(UTC).timestamp()
+    jobs = []
+
+    summaries = [summary for summary in summaries if summary.applications]
+
+    for job_id, group in groupby(summaries, key=lambda summary: summary.job_id):
+        job_summaries = list(group)
+
+        jobs.append(
+            JobAnalytics(
+                job_id=job_id,
+                applications=sum(summary.applications for summary in job_summaries),
+                average_overall_score=average(
+                    sum(summary.overall_score_sum for summary in job_summaries),
+                    sum(summary.scored_applications for summary in job_summaries),
+                ),
+                stages=[
+                    StageAnalytics(
+                        status=summary.status,
+                        applications=summary.applications,
+                        average_overall_score=average(summary.overall_score_sum, summary.scored_applications),
+                        average_days_in_stage=(now - summary.status_changed_at_sum / summary.applications)
+                        / SECONDS_PER_DAY,
+                    )
+                    for summary in job_summaries
+                ],
+            )
+        )
+
+    return CompanyAnalytics(
+        applications=sum(summary.applications for summary in summaries),
+        average_overall_score=average(
+            sum(summary.overall_score_sum for summary in summaries),
+            sum(summary.scored_applications for summary in summaries),
+        ),
+        jobs=jobs,
+        refreshed_at=min((summary.refreshed_at for summary in summaries), default=None),
+    )
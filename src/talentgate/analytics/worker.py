@@ -0,0 +1,38 @@
+import asyncio
+import logging
+
+from sqlmodel import Session, SQLModel
+
+from config import get_settings
+from src.talentgate.analytics import service as analytics_service
+from src.talentgate.database.service import get_sqlmodel_engine
+from src.talentgate.metrics import service as metrics_service
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+async def run() -> None:
+    if settings.metrics_worker_port:
+        metrics_service.start_http_server(port=settings.metrics_worker_port)
+
+    engine = get_sqlmodel_engine()
+    SQLModel.metadata.create_all(engine)
+
+    while True:
+        with Session(engine, autocommit=False, autoflush=False) as sqlmodel_session:
+            refreshed = await analytics_service.refresh_changed(
+                sqlmodel_session=sqlmodel_session,
+                lag=settings.analytics_refresh_lag,
+                batch_size=settings.analytics_refresh_batch_size,
+            )
+
+        logger.info("Refreshed the application summaries of %s jobs", refreshed)
+
+        await asyncio.sleep(settings.analytics_refresh_interval)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
@@ -6,4 +6,17 @@ class ApplicationStatus(StrEnum):
     SCREENING = "screening"
     INTERVIEW = "interview"
     OFFER = "offer"
+    REJECTED = "rejected"
     WITHDRAWN = "withdrawn"
+
+
+class EvaluationProgressStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ApplicationExportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
@@ -1,5 +1,6 @@
 from fastapi import HTTPException
 from starlette.status import (
+    HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
     HTTP_409_CONFLICT,
 )
@@ -20,3 +21,18 @@ DuplicatePhoneException = HTTPException(
 )
 
 ResumeAlreadyExistsException = HTTPException(status_code=HTTP_409_CONFLICT, detail="Resume already exists.")
+
+EvaluationInProgressException = HTTPException(
+    status_code=HTTP_409_CONFLICT,
+    detail="An evaluation is already in progress for this job.",
+)
+
+InvalidStatusTransitionException = HTTPException(
+    status_code=HTTP_400_BAD_REQUEST,
+    detail="No application can be moved to the requested status.",
+)
+
+MissingTransitionFilterException = HTTPException(
+    status_code=HTTP_400_BAD_REQUEST,
+    detail="Either application ids or a current status must be provided.",
+)
@@ -2,9 +2,10 @@ import uuid
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
-from src.talentgate.application.enums import ApplicationStatus
+from src.talentgate.application.enums import ApplicationExportFormat, ApplicationStatus
 from src.talentgate.database.models import BaseModel
 
 if TYPE_CHECKING:
@@ -90,7 +91,7 @@ class EducationEvaluation(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     score: float | None = Field(default=None)
     evaluation_id: uuid.UUID | None = Field(default=None, foreign_key="evaluation.id", ondelete="CASCADE")
-    evaluation: Optional["Evaluation"] = Relationship(back_populates="education_evaluation")
+    evaluation: Optional["Evaluation"] = Relationship(back_populates="education")
 
 
 class ExperienceEvaluation(SQLModel, table=True):
@@ -99,7 +100,7 @@ class ExperienceEvaluation(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     score: float | None = Field(default=None)
     evaluation_id: uuid.UUID | None = Field(default=None, foreign_key="evaluation.id", ondelete="CASCADE")
-    evaluation: Optional["Evaluation"] = Relationship(back_populates="experience_evaluation")
+    evaluation: Optional["Evaluation"] = Relationship(back_populates="experience")
 
 
 class Evaluation(SQLModel, table=True):
@@ -112,6 +113,9 @@ class Evaluation(SQLModel, table=True):
     overall_score: float | None = Field(default=None)
     application_id: uuid.UUID | None = Field(default=None, foreign_key="application.id", ondelete="CASCADE")
     application: Optional["Application"] = Relationship(back_populates="evaluation")
+    created_at: float = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+    )
 
 
 class Application(SQLModel, table=True):
@@ -119,9 +123,13 @@ class Application(SQLModel, table=True):
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     status: str | None = Field(default=ApplicationStatus.APPLIED.value)
+    status_changed_at: float | None = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+    )
     applicant: Applicant | None = Relationship(back_populates="application", cascade_delete=True)
-    evaluation: Evaluation | None = Relationship(back_populates="evaluation", cascade_delete=True)
-    job_id: uuid.UUID | None = Field(default=None, foreign_key="job.id", ondelete="CASCADE")
+    evaluation: Evaluation | None = Relationship(back_populates="application", cascade_delete=True)
+    overall_score: float | None = Field(default=None)
+    job_id: int | None = Field(default=None, foreign_key="job.id", ondelete="CASCADE")
     job: Optional["Job"] = Relationship(back_populates="applications")
     created_at: float = Field(
         default_factory=lambda: datetime.now(UTC).timestamp(),
@@ -132,6 +140,34 @@ class Application(SQLModel, table=True):
     )
 
 
+# overall_score is copied from the evaluation so the ranking is a single ordered index range scan per job
+Index(
+    "ix_application_job_id_overall_score_id",
+    Application.job_id,
+    Application.overall_score.desc(),
+    Application.id,
+)
+
+# the analytics refresh reads the jobs of the applications changed since its watermark from this index alone
+Index("ix_application_updated_at_job_id", Application.updated_at, Application.job_id)
+
+
+class ApplicationKey(SQLModel, table=True):
+    """
+    Email and phone keys an applicant already applied to a job with, one row per key.
+
+    An applicant applies once per job, whichever of its email or phone number is repeated. Unique indexes
+    of a partitioned table have to include the partition key, so the uniqueness is kept out of
+    application in this small unpartitioned table.
+    """
+
+    __tablename__ = "application_key"
+
+    job_id: int = Field(primary_key=True, foreign_key="job.id", ondelete="CASCADE")
+    key: str = Field(primary_key=True)
+    application_id: uuid.UUID = Field(foreign_key="application.id", ondelete="CASCADE", index=True)
+
+
 class CreateApplicantAddress(BaseModel):
     unit: str | None = None
     street: str | None = None
@@ -161,6 +197,25 @@ class RetrievedApplicantAddress(BaseModel):
     postal_code: str | None = None
 
 
+class UpdateApplicantAddress(BaseModel):
+    unit: str | None = None
+    street: str | None = None
+    city: str | None = None
+    state: str | None = None
+    country: str | None = None
+    postal_code: str | None = None
+
+
+class UpdatedApplicantAddress(BaseModel):
+    id: uuid.UUID | None = None
+    unit: str | None = None
+    street: str | None = None
+    city: str | None = None
+    state: str | None = None
+    country: str | None = None
+    postal_code: str | None = None
+
+
 class CreateApplicantLink(BaseModel):
     type: str | None = None
     url: str | None = None
@@ -369,6 +424,7 @@ class RetrievedEvaluation(BaseModel):
 
 
 class CreateApplication(BaseModel):
+    job_id: int | None = None
     applicant: CreateApplicant | None = None
     evaluation: CreateEvaluation | None = None
     status: str | None = None
@@ -392,10 +448,69 @@ class RetrievedApplication(BaseModel):
     updated_at: float
 
 
+class UpdateApplication(BaseModel):
+    status: str | None = None
+
+
+class UpdatedApplication(BaseModel):
+    id: uuid.UUID | None = None
+    status: str | None = None
+    created_at: float
+    updated_at: float
+
+
+class EvaluationProgress(BaseModel):
+    status: str | None = None
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
 class ApplicationQueryParameters(BaseModel):
     offset: int | None = None
     limit: int | None = None
 
 
+class ApplicationRankingQueryParameters(BaseModel):
+    limit: int = Field(default=20, ge=1, le=100)
+    min_score: float | None = None
+    max_score: float | None = None
+    after_score: float | None = None
+    after_id: uuid.UUID | None = None
+
+
+class RankedApplication(BaseModel):
+    id: uuid.UUID
+    status: str | None = None
+    overall_score: float
+    percentile: float
+    firstname: str | None = None
+    lastname: str | None = None
+    email: str | None = None
+    created_at: float
+
+
+class ApplicationStatusTransition(BaseModel):
+    status: ApplicationStatus
+    ids: list[uuid.UUID] | None = Field(default=None, max_length=1000)
+    from_status: ApplicationStatus | None = None
+    notify: bool = True
+
+
+class TransitionedApplication(BaseModel):
+    id: uuid.UUID
+    status: str
+
+
+class TransitionedApplications(BaseModel):
+    updated: list[TransitionedApplication] | None = None
+    skipped: list[uuid.UUID] | None = None
+
+
+class ApplicationExportQueryParameters(BaseModel):
+    format: ApplicationExportFormat = ApplicationExportFormat.NDJSON
+
+
 class DeletedApplication(BaseModel):
     id: uuid.UUID | None = None
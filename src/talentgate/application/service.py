@@ -1,24 +1,69 @@
-from collections.abc import Sequence
-from io import BytesIO
+import csv
+import json
+import re
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import UTC, datetime
+from functools import partial
+from io import BytesIO, StringIO
 from typing import Any
 
+import urllib3
 from minio import Minio
+from minio.error import S3Error
 from minio.helpers import ObjectWriteResult
+from redis.asyncio import Redis
+from sqlalchemy import Float, and_, bindparam, cast, func, insert, or_
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import update as sql_update
+from sqlalchemy.orm import aliased
 from sqlmodel import Session, select
 
+from config import get_settings
+from src.talentgate.analytics import service as analytics_service
+from src.talentgate.application.enums import ApplicationExportFormat, ApplicationStatus, EvaluationProgressStatus
 from src.talentgate.application.models import (
+    Applicant,
+    ApplicantAddress,
+    ApplicantEducation,
+    ApplicantExperience,
+    ApplicantLink,
     Application,
-    ApplicationAddress,
-    ApplicationLink,
+    ApplicationKey,
     ApplicationQueryParameters,
+    ApplicationRankingQueryParameters,
+    ApplicationStatusTransition,
+    CreateApplicant,
+    CreateApplicantAddress,
+    CreateApplicantLink,
     CreateApplication,
-    CreateApplicationAddress,
-    CreateApplicationLink,
+    CreateEvaluation,
+    EducationEvaluation,
+    Evaluation,
+    EvaluationProgress,
+    ExperienceEvaluation,
+    RankedApplication,
+    TransitionedApplication,
+    TransitionedApplications,
+    UpdateApplicantAddress,
+    UpdateApplicantLink,
     UpdateApplication,
-    UpdateApplicationAddress,
-    UpdateApplicationLink,
 )
+from src.talentgate.counter import service as counter_service
+from src.talentgate.counter.enums import CounterScope
+from src.talentgate.database.service import dialect_insert
+from src.talentgate.email import service as email_service
+from src.talentgate.email.models import CreateEmailOutbox
+from src.talentgate.job import service as job_service
 from src.talentgate.job.models import Job
+from src.talentgate.metrics import service as metrics_service
+from src.talentgate.resume import service as resume_service
+from src.talentgate.skill import service as skill_service
+
+settings = get_settings()
+
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
 
 
 async def upload_resume(
@@ -30,24 +75,30 @@ async def upload_resume(
     length: int,
     content_type: str,
 ) -> ObjectWriteResult:
-    return minio_client.put_object(
-        bucket_name=bucket_name,
-        object_name=object_name,
-        data=data,
-        length=length,
-        content_type=content_type,
-    )
+    with metrics_service.observe("minio", "put_object"):
+        return minio_client.put_object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            data=data,
+            length=length,
+            content_type=content_type,
+        )
 
 
 async def retrieve_resume(*, minio_client: Minio, bucket_name: str, object_name: str) -> bytes:
+    return read_resume(minio_client=minio_client, bucket_name=bucket_name, object_name=object_name)
+
+
+def read_resume(*, minio_client: Minio, bucket_name: str, object_name: str) -> bytes:
     response = None
 
     try:
-        response = minio_client.get_object(
-            bucket_name=bucket_name,
-            object_name=object_name,
-        )
-        data = response.data
+        with metrics_service.observe("minio", "get_object"):
+            response = minio_client.get_object(
+                bucket_name=bucket_name,
+                object_name=object_name,
+            )
+            data = response.data
     finally:
         if response:
             response.close()
@@ -59,9 +110,9 @@ async def retrieve_resume(*, minio_client: Minio, bucket_name: str, object_name:
 async def create_address(
     *,
     sqlmodel_session: Session,
-    address: CreateApplicationAddress,
-) -> ApplicationAddress:
-    created_address = ApplicationAddress(
+    address: CreateApplicantAddress,
+) -> ApplicantAddress:
+    created_address = ApplicantAddress(
         **address.model_dump(exclude_unset=True, exclude_none=True),
     )
 
@@ -75,10 +126,10 @@ async def create_address(
 async def retrieve_address_by_id(
     *,
     sqlmodel_session: Session,
-    address_id: int,
-) -> ApplicationAddress:
-    statement: Any = select(ApplicationAddress).where(
-        ApplicationAddress.id == address_id,
+    address_id: uuid.UUID,
+) -> ApplicantAddress:
+    statement: Any = select(ApplicantAddress).where(
+        ApplicantAddress.id == address_id,
     )
 
     return sqlmodel_session.exec(statement).one_or_none()
@@ -87,9 +138,9 @@ async def retrieve_address_by_id(
 async def update_address(
     *,
     sqlmodel_session: Session,
-    retrieved_address: ApplicationAddress,
-    address: UpdateApplicationAddress,
-) -> ApplicationAddress:
+    retrieved_address: ApplicantAddress,
+    address: UpdateApplicantAddress,
+) -> ApplicantAddress:
     retrieved_address.sqlmodel_update(
         address.model_dump(exclude_none=True, exclude_unset=True),
     )
@@ -104,9 +155,9 @@ async def update_address(
 async def create_link(
     *,
     sqlmodel_session: Session,
-    link: CreateApplicationLink,
-) -> ApplicationLink:
-    created_link = ApplicationLink(
+    link: CreateApplicantLink,
+) -> ApplicantLink:
+    created_link = ApplicantLink(
         **link.model_dump(exclude_unset=True, exclude_none=True),
     )
 
@@ -120,9 +171,9 @@ async def create_link(
 async def retrieve_link_by_id(
     *,
     sqlmodel_session: Session,
-    link_id: int,
-) -> ApplicationLink:
-    statement: Any = select(ApplicationLink).where(ApplicationLink.id == link_id)
+    link_id: uuid.UUID,
+) -> ApplicantLink:
+    statement: Any = select(ApplicantLink).where(ApplicantLink.id == link_id)
 
     return sqlmodel_session.exec(statement).one_or_none()
 
@@ -130,9 +181,9 @@ async def retrieve_link_by_id(
 async def update_link(
     *,
     sqlmodel_session: Session,
-    retrieved_link: ApplicationLink,
-    link: UpdateApplicationLink,
-) -> ApplicationLink:
+    retrieved_link: ApplicantLink,
+    link: UpdateApplicantLink,
+) -> ApplicantLink:
     retrieved_link.sqlmodel_update(
         link.model_dump(exclude_none=True, exclude_unset=True),
     )
@@ -147,11 +198,12 @@ async def update_link(
 async def upsert_link(
     *,
     sqlmodel_session: Session,
-    link: CreateApplicationLink | UpdateApplicationLink,
-) -> ApplicationLink:
+    link_id: uuid.UUID | None,
+    link: CreateApplicantLink | UpdateApplicantLink,
+) -> ApplicantLink:
     retrieved_link = await retrieve_link_by_id(
         sqlmodel_session=sqlmodel_session,
-        link_id=link.id,
+        link_id=link_id,
     )
     if retrieved_link:
         return await update_link(
@@ -167,25 +219,22 @@ async def create(
     sqlmodel_session: Session,
     application: CreateApplication,
 ) -> Application:
-    address = None
-    if getattr(application, "address", None) is not None:
-        address = await create_address(
-            sqlmodel_session=sqlmodel_session,
-            address=application.address,
-        )
-
-    links = []
-    if (getattr(application, "links", None) or None) is not None:
-        links = [await upsert_link(sqlmodel_session=sqlmodel_session, link=link) for link in application.links]
-
     created_application = Application(
         **application.model_dump(
             exclude_unset=True,
             exclude_none=True,
-            exclude={"address", "links"},
+            exclude={"applicant", "evaluation"},
         ),
-        address=address,
-        links=links,
+    )
+
+    if "applicant" in application.model_fields_set and application.applicant is not None:
+        created_application.applicant = build_applicant(applicant=application.applicant)
+
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.JOB,
+        scope_id=created_application.job_id,
+        name=created_application.status,
     )
 
     sqlmodel_session.add(created_application)
@@ -195,13 +244,166 @@ async def create(
     return created_application
 
 
+def build_applicant(applicant: CreateApplicant) -> Applicant:
+    return Applicant(
+        **applicant.model_dump(
+            exclude_unset=True,
+            exclude_none=True,
+            exclude={"address", "links", "education", "experiences"},
+        ),
+        address=ApplicantAddress(**applicant.address.model_dump()) if applicant.address else None,
+        links=[ApplicantLink(**link.model_dump()) for link in applicant.links or []],
+        education=ApplicantEducation(**applicant.education.model_dump()) if applicant.education else None,
+        experiences=[ApplicantExperience(**experience.model_dump()) for experience in applicant.experiences or []],
+    )
+
+
+def normalize_email(email: str | None) -> str | None:
+    email = (email or "").strip().lower()
+
+    return email if "@" in email else None
+
+
+def normalize_phone(phone: str | None, default_country_code: str | None = None) -> str | None:
+    """
+    E.164 form of a phone number, or None when it cannot be one.
+
+    Numbers written without a + or 00 prefix are national, the default country code replaces their trunk 0.
+    """
+    phone = (phone or "").strip()
+    digits = re.sub(r"\D", "", phone)
+
+    international = phone.startswith("+")
+
+    if not international and digits.startswith("00"):
+        digits = digits[2:]
+    elif not international and default_country_code:
+        digits = default_country_code + digits.lstrip("0")
+
+    if not E164_MIN_DIGITS <= len(digits) <= E164_MAX_DIGITS:
+        return None
+
+    return f"+{digits}"
+
+
+def claim_keys(*, sqlmodel_session: Session, job_id: int, keys: list[str], application_id: uuid.UUID) -> bool:
+    statement: Any = (
+        dialect_insert(sqlmodel_session, ApplicationKey)
+        .values([{"job_id": job_id, "key": key, "application_id": application_id} for key in keys])
+        .on_conflict_do_nothing(index_elements=["job_id", "key"])
+        .returning(ApplicationKey.key)
+    )
+
+    return len(sqlmodel_session.execute(statement).scalars().all()) == len(keys)
+
+
+def retrieve_by_keys(*, sqlmodel_session: Session, job_id: int, keys: list[str]) -> Application | None:
+    statement: Any = (
+        select(Application)
+        .join(ApplicationKey, ApplicationKey.application_id == Application.id)
+        .where(ApplicationKey.job_id == job_id, ApplicationKey.key.in_(keys))
+        .order_by(ApplicationKey.key)
+        .limit(1)
+    )
+
+    return sqlmodel_session.exec(statement).first()
+
+
+def delete_stale_keys(*, sqlmodel_session: Session, job_id: int, keys: list[str]) -> None:
+    """
+    Delete the keys of applications that are gone.
+
+    The partitioned application table cannot be referenced by its id alone, so nothing cascades to
+    application_key and a key left behind would otherwise keep the applicant from applying again.
+    """
+    statement: Any = sql_delete(ApplicationKey).where(
+        ApplicationKey.job_id == job_id,
+        ApplicationKey.key.in_(keys),
+        ApplicationKey.application_id.not_in(select(Application.id).where(Application.job_id == job_id)),
+    )
+
+    sqlmodel_session.execute(statement)
+
+
+async def upsert(
+    *,
+    sqlmodel_session: Session,
+    application: CreateApplication,
+) -> tuple[Application, bool]:
+    """
+    Create the application unless the applicant already applied to the job, and tell which happened.
+
+    The dedup keys are the lowercased email and the E.164 phone number, each unique per job in
+    application_key. Both are claimed with one INSERT ... ON CONFLICT DO NOTHING RETURNING, the application
+    is new only when every key was claimed, otherwise the claim is rolled back and the application
+    holding the conflicting key is returned. Keys whose application is gone are deleted and claimed again.
+    """
+    applicant = application.applicant
+    email_key = normalize_email(applicant.email) if applicant else None
+    phone_key = (
+        normalize_phone(applicant.phone, default_country_code=settings.applicant_phone_default_country_code)
+        if applicant
+        else None
+    )
+    keys = [f"email:{email_key}"] * (email_key is not None) + [f"phone:{phone_key}"] * (phone_key is not None)
+
+    application_id = uuid.uuid4()
+
+    claim = partial(
+        claim_keys,
+        sqlmodel_session=sqlmodel_session,
+        job_id=application.job_id,
+        keys=keys,
+        application_id=application_id,
+    )
+
+    if keys and not claim():
+        sqlmodel_session.rollback()
+
+        retrieved_application = retrieve_by_keys(
+            sqlmodel_session=sqlmodel_session, job_id=application.job_id, keys=keys
+        )
+
+        if retrieved_application is not None:
+            return retrieved_application, False
+
+        delete_stale_keys(sqlmodel_session=sqlmodel_session, job_id=application.job_id, keys=keys)
+
+        if not claim():
+            sqlmodel_session.rollback()
+
+            return retrieve_by_keys(sqlmodel_session=sqlmodel_session, job_id=application.job_id, keys=keys), False
+
+    created_application = Application(
+        id=application_id,
+        job_id=application.job_id,
+        status=application.status or ApplicationStatus.APPLIED.value,
+    )
+
+    if applicant is not None:
+        created_application.applicant = build_applicant(applicant=applicant)
+
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.JOB,
+        scope_id=application.job_id,
+        name=created_application.status,
+    )
+
+    sqlmodel_session.add(created_application)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(created_application)
+
+    return created_application, True
+
+
 async def retrieve_by_id(
     *,
     sqlmodel_session: Session,
     job_id: int,
-    application_id: int,
+    application_id: uuid.UUID,
 ) -> Application:
-    statement: Any = select(Application).where(Job.id == job_id, Application.id == application_id)
+    statement: Any = select(Application).where(Application.job_id == job_id, Application.id == application_id)
 
     retrieved_application: Application = sqlmodel_session.exec(statement).one_or_none()
 
@@ -209,13 +411,13 @@ async def retrieve_by_id(
 
 
 async def retrieve_by_email(*, sqlmodel_session: Session, email: str) -> Application:
-    statement: Any = select(Application).where(Application.email == email)
+    statement: Any = select(Application).join(Applicant).where(Applicant.email == email)
 
     return sqlmodel_session.exec(statement).one_or_none()
 
 
 async def retrieve_by_phone(*, sqlmodel_session: Session, phone: str) -> Application:
-    statement: Any = select(Application).where(Application.phone == phone)
+    statement: Any = select(Application).join(Applicant).where(Applicant.phone == phone)
 
     return sqlmodel_session.exec(statement).one_or_none()
 
@@ -247,25 +449,24 @@ async def update(
     retrieved_application: Application,
     application: UpdateApplication,
 ) -> Application:
-    if getattr(application, "address", None) is not None:
-        retrieved_application.address = await update_address(
-            sqlmodel_session=sqlmodel_session,
-            address=application.address,
-        )
-
-    if getattr(application, "links", None) is not None:
-        retrieved_application.links = [
-            await upsert_link(sqlmodel_session=sqlmodel_session, link=link) for link in application.links
-        ]
+    status = retrieved_application.status
 
     retrieved_application.sqlmodel_update(
-        application.model_dump(
-            exclude_none=True,
-            exclude_unset=True,
-            exclude={"address", "links", "evaluations"},
-        ),
+        application.model_dump(exclude_none=True, exclude_unset=True),
     )
 
+    if retrieved_application.status != status:
+        retrieved_application.status_changed_at = datetime.now(UTC).timestamp()
+
+        for name, amount in ((status, -1), (retrieved_application.status, 1)):
+            counter_service.increment(
+                sqlmodel_session=sqlmodel_session,
+                scope=CounterScope.JOB,
+                scope_id=retrieved_application.job_id,
+                name=name,
+                amount=amount,
+            )
+
     sqlmodel_session.add(retrieved_application)
     sqlmodel_session.commit()
     sqlmodel_session.refresh(retrieved_application)
@@ -278,7 +479,509 @@ async def delete(
     sqlmodel_session: Session,
     retrieved_application: Application,
 ) -> Application:
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.JOB,
+        scope_id=retrieved_application.job_id,
+        name=retrieved_application.status,
+        amount=-1,
+    )
+
+    analytics_service.subtract(sqlmodel_session=sqlmodel_session, retrieved_application=retrieved_application)
+
+    # applicant and evaluation cascade through the ORM, the keys and skills have no relationship to cascade through
+    sqlmodel_session.execute(
+        sql_delete(ApplicationKey).where(ApplicationKey.application_id == retrieved_application.id)
+    )
+    skill_service.delete_applicant_skills(sqlmodel_session=sqlmodel_session, application_ids=[retrieved_application.id])
+
     sqlmodel_session.delete(retrieved_application)
     sqlmodel_session.commit()
 
     return retrieved_application
+
+
+APPLICATION_STATUS_TRANSITIONS = {
+    ApplicationStatus.APPLIED: {
+        ApplicationStatus.SCREENING,
+        ApplicationStatus.INTERVIEW,
+        ApplicationStatus.REJECTED,
+        ApplicationStatus.WITHDRAWN,
+    },
+    ApplicationStatus.SCREENING: {ApplicationStatus.INTERVIEW, ApplicationStatus.REJECTED, ApplicationStatus.WITHDRAWN},
+    ApplicationStatus.INTERVIEW: {ApplicationStatus.OFFER, ApplicationStatus.REJECTED, ApplicationStatus.WITHDRAWN},
+    ApplicationStatus.OFFER: {ApplicationStatus.REJECTED, ApplicationStatus.WITHDRAWN},
+    ApplicationStatus.REJECTED: set(),
+    ApplicationStatus.WITHDRAWN: set(),
+}
+
+
+def retrieve_source_statuses(status: ApplicationStatus) -> list[str]:
+    return [source.value for source, targets in APPLICATION_STATUS_TRANSITIONS.items() if status in targets]
+
+
+def build_status_emails(
+    *,
+    sqlmodel_session: Session,
+    retrieved_job: Job,
+    status: ApplicationStatus,
+    application_ids: list[uuid.UUID],
+) -> list[CreateEmailOutbox]:
+    body = email_service.load_template(file="src/talentgate/application/templates/status.txt")
+
+    html = email_service.load_template(file="src/talentgate/application/templates/status.html")
+
+    applicants = sqlmodel_session.exec(
+        select(Applicant.firstname, Applicant.email).where(
+            Applicant.application_id.in_(application_ids),
+            Applicant.created_at >= retrieved_job.created_at,
+            Applicant.email.is_not(None),
+        )
+    ).all()
+
+    emails = []
+
+    for firstname, email in applicants:
+        context = {
+            "firstname": firstname or "",
+            "job_title": retrieved_job.title,
+            "company_name": retrieved_job.company.name if retrieved_job.company else "",
+            "status": status.value,
+        }
+        emails.append(
+            CreateEmailOutbox(
+                subject="Application Status Update",
+                body=body.format(**context),
+                html=html.format(**context),
+                to_addrs=email,
+            )
+        )
+
+    return emails
+
+
+async def transition_status(
+    *,
+    sqlmodel_session: Session,
+    retrieved_job: Job,
+    transition: ApplicationStatusTransition,
+) -> TransitionedApplications:
+    """
+    Move the selected applications of a job to a new status in a single UPDATE ... RETURNING.
+
+    Applications are selected by id, by their current status, or both. Only those whose current
+    status may move to the new one according to APPLICATION_STATUS_TRANSITIONS are updated, the
+    requested ids that were not are reported back as skipped. Notification emails are written to
+    the outbox in the same transaction.
+    """
+    sources = retrieve_source_statuses(transition.status)
+
+    if transition.from_status:
+        sources = [source for source in sources if source == transition.from_status.value]
+
+    statement: Any = (
+        sql_update(Application)
+        .where(
+            Application.job_id == retrieved_job.id,
+            Application.created_at >= retrieved_job.created_at,
+            Application.status.in_(sources),
+        )
+        .values(status=transition.status.value, status_changed_at=datetime.now(UTC).timestamp())
+        .returning(Application.id, Application.status)
+    )
+
+    if transition.ids is not None:
+        statement = statement.where(Application.id.in_(transition.ids))
+
+    updated = [TransitionedApplication.model_validate(row) for row in sqlmodel_session.exec(statement).mappings()]
+
+    if transition.notify and updated:
+        email_service.enqueue_emails(
+            sqlmodel_session=sqlmodel_session,
+            emails=build_status_emails(
+                sqlmodel_session=sqlmodel_session,
+                retrieved_job=retrieved_job,
+                status=transition.status,
+                application_ids=[application.id for application in updated],
+            ),
+        )
+
+    # the statuses the rows moved away from are not returned, so the job is recounted instead
+    counter_service.reconcile(sqlmodel_session=sqlmodel_session, scope=CounterScope.JOB, scope_id=retrieved_job.id)
+
+    sqlmodel_session.commit()
+
+    updated_ids = {application.id for application in updated}
+
+    return TransitionedApplications(
+        updated=updated,
+        skipped=[application_id for application_id in transition.ids or [] if application_id not in updated_ids],
+    )
+
+
+def delete_evaluations(*, sqlmodel_session: Session, application_ids: list[uuid.UUID]) -> None:
+    """
+    Stage the deletion of the evaluations of the applications with their education and experience evaluations.
+
+    A bulk delete skips the ORM cascades, and the partitioned evaluation table has no foreign keys
+    pointing at it, so the children are deleted first.
+    """
+    evaluation_ids = select(Evaluation.id).where(Evaluation.application_id.in_(application_ids))
+
+    sqlmodel_session.execute(
+        sql_delete(EducationEvaluation).where(EducationEvaluation.evaluation_id.in_(evaluation_ids))
+    )
+    sqlmodel_session.execute(
+        sql_delete(ExperienceEvaluation).where(ExperienceEvaluation.evaluation_id.in_(evaluation_ids))
+    )
+    sqlmodel_session.execute(sql_delete(Evaluation).where(Evaluation.application_id.in_(application_ids)))
+
+
+async def create_evaluations(
+    *,
+    sqlmodel_session: Session,
+    evaluations: dict[uuid.UUID, CreateEvaluation],
+    skills: dict[uuid.UUID, list[str]] | None = None,
+) -> None:
+    evaluation_rows = []
+    education_rows = []
+    experience_rows = []
+
+    for application_id, evaluation in evaluations.items():
+        evaluation_id = uuid.uuid4()
+
+        evaluation_rows.append(
+            {
+                "id": evaluation_id,
+                "application_id": application_id,
+                "overview": evaluation.overview,
+                "overall_score": evaluation.overall_score,
+            }
+        )
+
+        if evaluation.education is not None:
+            education_rows.append(
+                {"id": uuid.uuid4(), "evaluation_id": evaluation_id, "score": evaluation.education.score},
+            )
+
+        if evaluation.experience is not None:
+            experience_rows.append(
+                {"id": uuid.uuid4(), "evaluation_id": evaluation_id, "score": evaluation.experience.score},
+            )
+
+    delete_evaluations(sqlmodel_session=sqlmodel_session, application_ids=list(evaluations))
+
+    if evaluation_rows:
+        sqlmodel_session.execute(insert(Evaluation), evaluation_rows)
+
+    if education_rows:
+        sqlmodel_session.execute(insert(EducationEvaluation), education_rows)
+
+    if experience_rows:
+        sqlmodel_session.execute(insert(ExperienceEvaluation), experience_rows)
+
+    if evaluation_rows:
+        sqlmodel_session.execute(
+            sql_update(Application.__table__)
+            .where(Application.id == bindparam("application_id"))
+            .values(overall_score=bindparam("overall_score")),
+            [
+                {"application_id": row["application_id"], "overall_score": row["overall_score"]}
+                for row in evaluation_rows
+            ],
+        )
+
+    if skills:
+        skill_service.replace_applicant_skills(sqlmodel_session=sqlmodel_session, skills=skills)
+
+    sqlmodel_session.commit()
+
+
+async def retrieve_ranking(
+    *,
+    sqlmodel_session: Session,
+    job_id: int,
+    query_parameters: ApplicationRankingQueryParameters,
+) -> list[RankedApplication]:
+    """
+    Rank the evaluated applications of a job, best overall score first.
+
+    Pages are keyed by the (overall_score, id) of the last row seen instead of an offset, so every page
+    is a range scan of ix_application_job_id_overall_score_id. The percentile is the percent_rank of the
+    score among all evaluated applications of the job, regardless of the score thresholds. It is counted
+    per returned row, from the same index, instead of ranking the whole job for every page.
+    """
+    job_created_at = job_service.select_created_at(job_id)
+
+    filters = [
+        Application.job_id == job_id,
+        Application.created_at >= job_created_at,
+        Application.overall_score.is_not(None),
+    ]
+
+    if query_parameters.min_score is not None:
+        filters.append(Application.overall_score >= query_parameters.min_score)
+
+    if query_parameters.max_score is not None:
+        filters.append(Application.overall_score <= query_parameters.max_score)
+
+    if query_parameters.after_score is not None and query_parameters.after_id is not None:
+        filters.append(
+            or_(
+                Application.overall_score < query_parameters.after_score,
+                and_(
+                    Application.overall_score == query_parameters.after_score,
+                    Application.id > query_parameters.after_id,
+                ),
+            )
+        )
+
+    page = (
+        select(Application.id, Application.status, Application.overall_score, Application.created_at)
+        .where(*filters)
+        .order_by(Application.overall_score.desc(), Application.id)
+        .limit(query_parameters.limit)
+        .subquery()
+    )
+
+    scored = aliased(Application)
+    evaluated = (
+        scored.job_id == job_id,
+        scored.created_at >= job_created_at,
+        scored.overall_score.is_not(None),
+    )
+
+    lower = (
+        select(func.count())
+        .select_from(scored)
+        .where(*evaluated, scored.overall_score < page.c.overall_score)
+        .scalar_subquery()
+    )
+    total = select(func.count()).select_from(scored).where(*evaluated).scalar_subquery()
+    percentile = func.coalesce(cast(lower, Float) / func.nullif(total - 1, 0), 0.0)
+
+    statement: Any = (
+        select(
+            page.c.id,
+            page.c.status,
+            page.c.overall_score,
+            percentile.label("percentile"),
+            Applicant.firstname,
+            Applicant.lastname,
+            Applicant.email,
+            page.c.created_at,
+        )
+        .outerjoin(
+            Applicant,
+            and_(Applicant.application_id == page.c.id, Applicant.created_at >= job_created_at),
+        )
+        .order_by(page.c.overall_score.desc(), page.c.id)
+    )
+
+    return [RankedApplication.model_validate(row) for row in sqlmodel_session.exec(statement).mappings().all()]
+
+
+APPLICATION_EXPORT_COLUMNS = (
+    Application.id,
+    Application.status,
+    Application.overall_score,
+    Applicant.firstname,
+    Applicant.lastname,
+    Applicant.email,
+    Applicant.phone,
+    ApplicantAddress.city,
+    ApplicantAddress.country,
+    Evaluation.overview,
+    Application.created_at,
+)
+
+
+def export_applications(*, sqlmodel_session: Session, job_id: int, batch_size: int) -> Iterator[dict]:
+    """
+    Yield the applications of a job as flat rows, one database round trip per batch.
+
+    Only the exported columns are selected, so no ORM objects or relationships are loaded, and with
+    yield_per the rows come from a server-side cursor on postgres instead of being buffered up front.
+    The iterator is synchronous on purpose, a streaming response runs it in the threadpool.
+    """
+    job_created_at = job_service.select_created_at(job_id)
+
+    statement: Any = (
+        select(*APPLICATION_EXPORT_COLUMNS)
+        .select_from(Application)
+        .outerjoin(
+            Applicant,
+            and_(Applicant.application_id == Application.id, Applicant.created_at >= job_created_at),
+        )
+        .outerjoin(ApplicantAddress, ApplicantAddress.applicant_id == Applicant.id)
+        .outerjoin(
+            Evaluation,
+            and_(Evaluation.application_id == Application.id, Evaluation.created_at >= job_created_at),
+        )
+        .where(Application.job_id == job_id, Application.created_at >= job_created_at)
+        .order_by(Application.created_at, Application.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    for row in sqlmodel_session.exec(statement).mappings():
+        yield {**row, "id": str(row["id"])}
+
+
+def write_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def write_csv(rows: Iterable[dict]) -> Iterator[str]:
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[column.key for column in APPLICATION_EXPORT_COLUMNS])
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def write_export(rows: Iterable[dict], export_format: ApplicationExportFormat) -> Iterator[str]:
+    if export_format == ApplicationExportFormat.CSV:
+        return write_csv(rows)
+    return write_ndjson(rows)
+
+
+async def retrieve_evaluation_progress(*, redis_client: Redis, job_id: int) -> EvaluationProgress | None:
+    name = f"job:{job_id}:evaluation"
+    progress = await redis_client.hgetall(name=name)
+    return EvaluationProgress(**progress) if progress else None
+
+
+async def update_evaluation_progress(
+    *,
+    redis_client: Redis,
+    job_id: int,
+    progress: EvaluationProgress,
+    ex: int = 86400,
+) -> None:
+    name = f"job:{job_id}:evaluation"
+
+    async with redis_client.pipeline(transaction=True) as pipeline:
+        pipeline.hset(name=name, mapping=progress.model_dump(exclude_none=True))
+        pipeline.expire(name=name, time=ex)
+        await pipeline.execute()
+
+
+def resume_object_names(*, retrieved_job: Job, application_id: uuid.UUID) -> list[str]:
+    """Where the resume of an application may be, uploaded by the company or by the applicant from the careers page."""
+    return [
+        f"companies/{retrieved_job.company_id}/jobs/{retrieved_job.id}/applications/{application_id}/resume",
+        f"jobs/{retrieved_job.id}/applications/{application_id}/resume",
+    ]
+
+
+def load_resume(*, minio_client: Minio, bucket_name: str, object_names: list[str]) -> bytes | None:
+    """
+    Read the first resume found at object_names, None when none exists or the storage fails to return one.
+
+    Storage errors are not raised, they would abort the evaluation of every other application of the job
+    instead of failing this one.
+    """
+    for object_name in object_names:
+        try:
+            return read_resume(minio_client=minio_client, bucket_name=bucket_name, object_name=object_name)
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                return None
+        except urllib3.exceptions.HTTPError:
+            return None
+
+    return None
+
+
+def retrieve_result_skills(result: dict) -> list[str]:
+    experiences = (result.get("applicant") or {}).get("experiences") or []
+
+    return skill_service.split_skills(
+        [
+            *(result.get("skills") or []),
+            *(skill for experience in experiences for skill in skill_service.split_skills(experience.get("skills"))),
+        ]
+    )
+
+
+async def evaluate_job_applications(
+    *,
+    sqlmodel_session: Session,
+    redis_client: Redis,
+    minio_client: Minio,
+    bucket_name: str,
+    retrieved_job: Job,
+    batch_size: int,
+    concurrency: int,
+    similarity_threshold: float = 0.0,
+    similarity_top_k: int = 0,
+) -> None:
+    """
+    Evaluate every application of a job and keep the progress counters in redis up to date.
+
+    Resumes are not read up front, each one is downloaded in the worker thread that converts it, so
+    at most concurrency of them are in memory at once. A missing or unreadable resume counts as a failed
+    evaluation.
+    """
+    statement: Any = select(Application.id).where(Application.job_id == retrieved_job.id)
+    application_ids = sqlmodel_session.exec(statement).all()
+
+    resumes = {
+        str(application_id): partial(
+            load_resume,
+            minio_client=minio_client,
+            bucket_name=bucket_name,
+            object_names=resume_object_names(retrieved_job=retrieved_job, application_id=application_id),
+        )
+        for application_id in application_ids
+    }
+
+    progress = EvaluationProgress(status=EvaluationProgressStatus.RUNNING.value, total=len(application_ids))
+
+    await update_evaluation_progress(redis_client=redis_client, job_id=retrieved_job.id, progress=progress)
+
+    async def on_progress(completed: int, failed: int, skipped: int) -> None:
+        progress.completed = completed
+        progress.failed = failed
+        progress.skipped = skipped
+        await update_evaluation_progress(redis_client=redis_client, job_id=retrieved_job.id, progress=progress)
+
+    try:
+        results = await resume_service.evaluate(
+            resumes=resumes,
+            job_description=retrieved_job.description or "",
+            batch_size=batch_size,
+            concurrency=concurrency,
+            similarity_threshold=similarity_threshold,
+            similarity_top_k=similarity_top_k,
+            on_progress=on_progress,
+        )
+
+        evaluations = {}
+        skills = {}
+
+        for key, result in results.items():
+            try:
+                evaluations[uuid.UUID(key)] = CreateEvaluation.model_validate(result.get("evaluation") or {})
+            except ValueError:
+                continue
+
+            skills[uuid.UUID(key)] = retrieve_result_skills(result)
+
+        await create_evaluations(sqlmodel_session=sqlmodel_session, evaluations=evaluations, skills=skills)
+    except Exception:
+        progress.status = EvaluationProgressStatus.FAILED.value
+        await update_evaluation_progress(redis_client=redis_client, job_id=retrieved_job.id, progress=progress)
+        raise
+
+    progress.status = EvaluationProgressStatus.COMPLETED.value
+    progress.completed = len(evaluations)
+    progress.failed = len(application_ids) - len(evaluations) - progress.skipped
+
+    await update_evaluation_progress(redis_client=redis_client, job_id=retrieved_job.id, progress=progress)
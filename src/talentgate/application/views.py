@@ -1,15 +1,11 @@
 from collections.abc import Sequence
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlmodel import Session
 
 from src.talentgate.application import service as application_service
-from src.talentgate.application.exceptions import (
-    ApplicationIdNotFoundException,
-    DuplicateEmailException,
-    DuplicatePhoneException,
-)
+from src.talentgate.application.exceptions import ApplicationIdNotFoundException
 from src.talentgate.application.models import (
     Application,
     ApplicationQueryParameters,
@@ -32,29 +28,19 @@ router = APIRouter(tags=["applications"])
 )
 async def create_application(
     *,
+    response: Response,
     sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
     application: CreateApplication,
 ) -> Application:
-    retrieved_application = await application_service.retrieve_by_email(
-        sqlmodel_session=sqlmodel_session,
-        email=application.email,
-    )
-
-    if retrieved_application:
-        raise DuplicateEmailException
-
-    retrieved_application = await application_service.retrieve_by_phone(
+    retrieved_application, created = await application_service.upsert(
         sqlmodel_session=sqlmodel_session,
-        phone=application.phone,
+        application=application,
     )
 
-    if retrieved_application:
-        raise DuplicatePhoneException
+    if not created:
+        response.status_code = 200
 
-    return await application_service.create(
-        sqlmodel_session=sqlmodel_session,
-        application=application,
-    )
+    return retrieved_application
 
 
 @router.get(
@@ -2,6 +2,8 @@ from fastapi import HTTPException
 from starlette.status import (
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
+    HTTP_429_TOO_MANY_REQUESTS,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 
 InvalidAccessTokenException = HTTPException(
@@ -38,3 +40,13 @@ InvalidAuthorizationException = HTTPException(
     status_code=HTTP_403_FORBIDDEN,
     detail="The required permissions are missing to access this resource.",
 )
+
+PasswordHashQueueFullException = HTTPException(
+    status_code=HTTP_503_SERVICE_UNAVAILABLE,
+    detail="The server is busy, please try again later.",
+)
+
+TooManyLoginAttemptsException = HTTPException(
+    status_code=HTTP_429_TOO_MANY_REQUESTS,
+    detail="Too many login attempts, please try again later.",
+)
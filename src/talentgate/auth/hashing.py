@@ -0,0 +1,75 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any
+
+from config import get_settings
+from src.talentgate.auth.exceptions import PasswordHashQueueFullException
+from src.talentgate.metrics import service as metrics_service
+
+settings = get_settings()
+
+
+class PasswordHashPool:
+    def __init__(self, max_workers: int, queue_limit: int) -> None:
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.executor: ProcessPoolExecutor | None = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        if self.pending >= self.queue_limit:
+            self.rejected += 1
+            raise PasswordHashQueueFullException
+
+        self.pending += 1
+        metrics_service.PASSWORD_HASH_QUEUE_DEPTH.inc()
+        started_at = time.perf_counter()
+
+        try:
+            if self.max_workers <= 0:
+                return func(*args)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.get_executor(), func, *args)
+        finally:
+            latency = time.perf_counter() - started_at
+            self.pending -= 1
+            metrics_service.PASSWORD_HASH_QUEUE_DEPTH.dec()
+            self.completed += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_avg": self.latency_total / self.completed if self.completed else None,
+            "latency_max": self.latency_max,
+        }
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+
+@lru_cache
+def get_password_hash_pool() -> PasswordHashPool:
+    return PasswordHashPool(
+        max_workers=settings.password_hash_pool_size,
+        queue_limit=settings.password_hash_queue_limit,
+    )
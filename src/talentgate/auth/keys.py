@@ -0,0 +1,123 @@
+import base64
+import json
+import sys
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from config import get_settings
+
+settings = get_settings()
+
+
+def urlsafe_b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
+
+
+def urlsafe_b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SigningKeySet:
+    """
+    Ed25519 keys used to sign access tokens, indexed by key id.
+
+    Every key verifies tokens that carry its kid, only the active key signs. Rotating means adding a
+    new key, making it active and removing the old one once the tokens it signed have expired.
+    """
+
+    algorithm = "EdDSA"
+
+    def __init__(self, keys: dict[str, Ed25519PrivateKey], active_kid: str) -> None:
+        self.keys = keys
+        self.active_kid = active_kid
+
+    def encode(self, payload: dict) -> str:
+        header = {"alg": self.algorithm, "typ": "JWT", "kid": self.active_kid}
+        base64_header = urlsafe_b64encode(json.dumps(header, separators=(",", ":")).encode("utf-8"))
+        base64_payload = urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        signature = self.keys[self.active_kid].sign(f"{base64_header}.{base64_payload}".encode())
+        return f"{base64_header}.{base64_payload}.{urlsafe_b64encode(signature)}"
+
+    def verify(self, token: str) -> bool:
+        try:
+            base64_header, base64_payload, base64_signature = token.split(".")
+            header = json.loads(urlsafe_b64decode(base64_header))
+            payload = json.loads(urlsafe_b64decode(base64_payload))
+            key = self.keys[header["kid"]]
+            key.public_key().verify(
+                urlsafe_b64decode(base64_signature),
+                f"{base64_header}.{base64_payload}".encode(),
+            )
+        except (ValueError, KeyError, TypeError, InvalidSignature):
+            return False
+
+        return header.get("alg") == self.algorithm and payload.get("exp", 0) > datetime.now(UTC).timestamp()
+
+    def jwks(self) -> dict:
+        return {
+            "keys": [
+                {
+                    "kty": "OKP",
+                    "crv": "Ed25519",
+                    "use": "sig",
+                    "alg": self.algorithm,
+                    "kid": kid,
+                    "x": urlsafe_b64encode(
+                        key.public_key().public_bytes(
+                            encoding=serialization.Encoding.Raw,
+                            format=serialization.PublicFormat.Raw,
+                        )
+                    ),
+                }
+                for kid, key in self.keys.items()
+            ]
+        }
+
+
+def load_signing_keys(directory: str) -> dict[str, Ed25519PrivateKey]:
+    keys = {}
+
+    for path in sorted(Path(directory).glob("*.pem")):
+        key = serialization.load_pem_private_key(path.read_bytes(), password=None)
+
+        if isinstance(key, Ed25519PrivateKey):
+            keys[path.stem] = key
+
+    return keys
+
+
+@lru_cache
+def get_signing_key_set() -> SigningKeySet | None:
+    if not settings.access_token_signing_keys_dir:
+        return None
+
+    keys = load_signing_keys(directory=settings.access_token_signing_keys_dir)
+
+    if not keys:
+        return None
+
+    return SigningKeySet(keys=keys, active_kid=settings.access_token_signing_kid or max(keys))
+
+
+def generate_signing_key(directory: str) -> Path:
+    kid = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+    path = Path(directory) / f"{kid}.pem"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(
+        Ed25519PrivateKey.generate().private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    path.chmod(0o600)
+    return path
+
+
+if __name__ == "__main__":
+    sys.stdout.write(f"{generate_signing_key(sys.argv[1])}\n")
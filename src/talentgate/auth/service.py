@@ -1,17 +1,33 @@
+import ipaddress
+import json
+import secrets
 import uuid
 from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
 
-from fastapi import BackgroundTasks
 from pytography import JsonWebToken, PasswordHashLibrary
 from redis.asyncio import Redis
+from sqlmodel import Session
 
+from config import get_settings
+from src.talentgate.auth.hashing import get_password_hash_pool
+from src.talentgate.auth.keys import SigningKeySet, get_signing_key_set, urlsafe_b64decode
 from src.talentgate.email import service as email_service
-from src.talentgate.email.client import EmailClient
+from src.talentgate.email.models import EmailOutbox
+from src.talentgate.metrics import service as metrics_service
+
+settings = get_settings()
 
 
 def encode_password(password: str) -> str:
-    return PasswordHashLibrary.encode(password=password)
+    return PasswordHashLibrary.encode(
+        password=password,
+        salt=secrets.token_hex(16),
+        algorithm=settings.password_hash_algorithm,
+        n=settings.password_hash_scrypt_n,
+        r=settings.password_hash_scrypt_r,
+        p=settings.password_hash_scrypt_p,
+    )
 
 
 def verify_password(password: str, encoded_password: str) -> bool:
@@ -21,6 +37,20 @@ def verify_password(password: str, encoded_password: str) -> bool:
     )
 
 
+def needs_rehash(encoded_password: str) -> bool:
+    parameters = f"${settings.password_hash_algorithm}$ln={settings.password_hash_scrypt_n}"
+    parameters = f"{parameters}$r={settings.password_hash_scrypt_r}$p={settings.password_hash_scrypt_p}$"
+    return not encoded_password.startswith(parameters)
+
+
+async def encode_password_async(password: str) -> str:
+    return await get_password_hash_pool().run(encode_password, password)
+
+
+async def verify_password_async(password: str, encoded_password: str) -> bool:
+    return await get_password_hash_pool().run(verify_password, password, encoded_password)
+
+
 def encode_token(payload: dict, key: str, seconds: float) -> str:
     now = datetime.now(UTC)
     exp = (now + timedelta(seconds=seconds)).timestamp()
@@ -36,13 +66,47 @@ def encode_token(payload: dict, key: str, seconds: float) -> str:
 
 
 def decode_token(token: str) -> tuple[dict, dict, str]:
-    return JsonWebToken.decode(token=token)
+    base64_header, base64_payload, signature = token.split(".")
+    header = json.loads(urlsafe_b64decode(base64_header))
+    payload = json.loads(urlsafe_b64decode(base64_payload))
+    return header, payload, signature
 
 
 def verify_token(token: str, key: str) -> bool:
     return JsonWebToken.verify(token=token, key=key)
 
 
+def encode_access_token(payload: dict, key: str, seconds: float) -> str:
+    signing_key_set = get_signing_key_set()
+
+    if not signing_key_set:
+        return encode_token(payload=payload, key=key, seconds=seconds)
+
+    now = datetime.now(UTC)
+    return signing_key_set.encode(
+        payload={
+            "iat": int(now.timestamp()),
+            "exp": (now + timedelta(seconds=seconds)).timestamp(),
+            "jti": str(uuid.uuid4()),
+            **payload,
+        },
+    )
+
+
+def verify_access_token(token: str, key: str) -> bool:
+    signing_key_set = get_signing_key_set()
+
+    try:
+        header, _, _ = decode_token(token=token)
+    except (ValueError, TypeError):
+        return False
+
+    if header.get("alg") == SigningKeySet.algorithm:
+        return bool(signing_key_set) and signing_key_set.verify(token=token)
+
+    return verify_token(token=token, key=key)
+
+
 async def blacklist_token(*, redis_client: Redis, jti: str, ex: int) -> bool:
     name = f"token:blacklist:{jti}"
     return await redis_client.set(name=name, value=jti, ex=ex)
@@ -53,25 +117,209 @@ async def retrieve_blacklisted_token(*, redis_client: Redis, jti: str | None) ->
     return await redis_client.get(name=name)
 
 
+ROTATE_REFRESH_TOKEN_SCRIPT = """
+if redis.call("EXISTS", KEYS[2]) == 1 then
+    return -1
+end
+
+if not redis.call("SET", KEYS[1], ARGV[1], "NX", "EX", ARGV[2]) then
+    redis.call("SET", KEYS[2], ARGV[1], "EX", ARGV[2])
+    return 0
+end
+
+if ARGV[3] == "1" then
+    redis.call("SET", KEYS[2], ARGV[1], "EX", ARGV[2])
+end
+
+return 1
+"""  # noqa: S105
+
+
+async def rotate_refresh_token(
+    *,
+    redis_client: Redis,
+    jti: str,
+    fid: str,
+    ex: int,
+    revoke_family: bool = False,
+) -> bool:
+    """
+    Atomically mark a refresh token as used, in one round trip.
+
+    Presenting an already used token is treated as theft: the whole token family is revoked, so every
+    token rotated from the same login stops working.
+    """
+    result = await redis_client.eval(
+        ROTATE_REFRESH_TOKEN_SCRIPT,
+        2,
+        f"token:blacklist:{jti}",
+        f"token:family:{fid}",
+        jti,
+        ex,
+        int(revoke_family),
+    )
+
+    return int(result) == 1
+
+
+LOGIN_THROTTLE_PREFIX = "{auth:login}"
+LOGIN_THROTTLE_STATS = f"{LOGIN_THROTTLE_PREFIX}:stats"
+
+# KEYS are the sliding windows, then their lock keys in the same order, then the stats hash, which is
+# returned with the outcome so the metrics are kept up to date without another round trip
+LOGIN_THROTTLE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local lockout = tonumber(ARGV[3])
+local member = ARGV[4]
+local windows = (#KEYS - 1) / 2
+local stats = KEYS[#KEYS]
+
+local function result(attempts, retry_after)
+    return {attempts, retry_after, redis.call("HGETALL", stats)}
+end
+
+redis.call("HINCRBY", stats, "attempts", 1)
+
+for i = 1, windows do
+    local ttl = redis.call("PTTL", KEYS[windows + i])
+    if ttl > 0 then
+        redis.call("HINCRBY", stats, "rejected", 1)
+        return result(0, ttl)
+    end
+end
+
+local attempts = 0
+
+for i = 1, windows do
+    local key = KEYS[i]
+    redis.call("ZREMRANGEBYSCORE", key, "-inf", now - window)
+    redis.call("ZADD", key, now, member)
+    redis.call("PEXPIRE", key, window)
+
+    local count = redis.call("ZCARD", key)
+    if count > tonumber(ARGV[4 + i]) then
+        redis.call("SET", KEYS[windows + i], 1, "PX", lockout)
+        redis.call("HINCRBY", stats, "lockouts", 1)
+        return result(0, lockout)
+    end
+
+    if i == 1 then
+        attempts = count
+    end
+end
+
+return result(attempts, 0)
+"""
+
+
+async def throttle_login(
+    *,
+    redis_client: Redis,
+    email: str,
+    ip: str,
+    email_limit: int,
+    ip_limit: int,
+    window: float,
+    lockout: float,
+) -> tuple[int, float]:
+    """
+    Record a login attempt in the per-email and per-IP sliding windows.
+
+    Returns the number of attempts for the email within the window, and the seconds until the
+    next attempt is allowed when the email or IP is locked out.
+
+    Every key shares the {auth:login} hash tag, so on a Redis Cluster the script runs on a single slot.
+    The login throttle gauges are set from the stats the script returns.
+    """
+    now = int(datetime.now(UTC).timestamp() * 1000)
+    keys = [f"{LOGIN_THROTTLE_PREFIX}:email:{email.lower()}", f"{LOGIN_THROTTLE_PREFIX}:ip:{ip}"]
+
+    attempts, retry_after, stats = await redis_client.eval(
+        LOGIN_THROTTLE_SCRIPT,
+        2 * len(keys) + 1,
+        *keys,
+        *(f"{key}:lock" for key in keys),
+        LOGIN_THROTTLE_STATS,
+        now,
+        int(window * 1000),
+        int(lockout * 1000),
+        f"{now}:{uuid.uuid4().hex}",
+        email_limit,
+        ip_limit,
+    )
+
+    for event, value in zip(stats[::2], stats[1::2], strict=True):
+        metrics_service.LOGIN_THROTTLE_EVENTS.labels(event=event).set(int(value))
+
+    return int(attempts), int(retry_after) / 1000
+
+
+def retrieve_client_ip(*, host: str | None, forwarded_for: str | None, trusted_proxies: list[str]) -> str:
+    """
+    Address of the client a request came from, behind any number of trusted proxies.
+
+    X-Forwarded-For is read from the right, each trusted proxy appends the address it received the
+    request from, so the first address that is not a trusted proxy is the client. Whatever the client
+    wrote into the header itself is left of it and never read.
+    """
+    networks = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies]
+
+    def is_trusted(address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in networks)
+
+    address = host or "unknown"
+    forwarded = [part.strip() for part in (forwarded_for or "").split(",") if part.strip()]
+
+    while is_trusted(address) and forwarded:
+        address = forwarded.pop()
+
+    return address
+
+
+def compute_login_delay(attempts: int, free_attempts: int, delay: float, max_delay: float) -> float:
+    if attempts <= free_attempts:
+        return 0.0
+
+    return min(max_delay, delay * 2 ** (attempts - free_attempts - 1))
+
+
+async def reset_login_throttle(*, redis_client: Redis, email: str) -> int:
+    return await redis_client.delete(f"{LOGIN_THROTTLE_PREFIX}:email:{email.lower()}")
+
+
+async def retrieve_login_throttle_stats(*, redis_client: Redis) -> dict[str, int]:
+    stats = await redis_client.hgetall(name=LOGIN_THROTTLE_STATS)
+    return {key: int(value) for key, value in stats.items()}
+
+
 async def send_verification_email(
     *,
-    email_client: EmailClient,
-    background_tasks: BackgroundTasks,
+    sqlmodel_session: Session,
     context: dict,
     from_addr: str | None = None,
-    to_addrs: str | Sequence[str] | None = None,
-) -> None:
+    to_addrs: str | Sequence[str],
+) -> EmailOutbox:
+    """Queue the verification email and commit it together with the user the caller staged."""
     body = email_service.load_template(file="src/talentgate/auth/templates/verification.txt")
 
     html = email_service.load_template(file="src/talentgate/auth/templates/verification.html")
 
-    background_tasks.add_task(
-        email_service.send_email,
-        email_client,
-        "Email Verification",
-        body,
-        html,
-        context,
-        from_addr,
-        to_addrs,
+    created_email = await email_service.enqueue_email(
+        sqlmodel_session=sqlmodel_session,
+        subject="Email Verification",
+        body=body,
+        html=html,
+        context=context,
+        from_addr=from_addr,
+        to_addrs=to_addrs,
     )
+
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(created_email)
+
+    return created_email
@@ -1,10 +1,13 @@
+import asyncio
+import math
 import random
 import string
+import uuid
 from datetime import UTC, datetime
 from typing import Annotated
 
 import requests
-from fastapi import APIRouter, BackgroundTasks, Depends, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from google.auth.exceptions import GoogleAuthError
 from google.auth.transport import requests as google_requests
@@ -18,11 +21,12 @@ from starlette.status import (
 
 from config import Settings, get_settings
 from src.talentgate.auth import service as auth_service
+from src.talentgate.auth.keys import get_signing_key_set
 from src.talentgate.company import service as company_service
 from src.talentgate.company.enums import CompanyEmployeeTitle
 from src.talentgate.company.models import CreateCompany, CreateCompanyEmployee
 from src.talentgate.database.service import get_redis_client, get_sqlmodel_session
-from src.talentgate.email.client import EmailClient, get_email_client
+from src.talentgate.metrics import service as metrics_service
 from src.talentgate.payment import service as payment_service
 from src.talentgate.payment.service import get_paddle_client
 from src.talentgate.user import service as user_service
@@ -42,6 +46,7 @@ from .exceptions import (
     InvalidLinkedInAccessTokenException,
     InvalidOneTimeTokenException,
     InvalidRefreshTokenException,
+    TooManyLoginAttemptsException,
 )
 from .models import (
     AuthenticationTokens,
@@ -59,15 +64,57 @@ from .models import (
 router = APIRouter(tags=["auth"])
 
 
+@router.get(path="/.well-known/jwks.json", status_code=200)
+async def retrieve_jwks() -> JSONResponse:
+    signing_key_set = get_signing_key_set()
+
+    content = signing_key_set.jwks() if signing_key_set else {"keys": []}
+
+    return JSONResponse(content=content, headers={"Cache-Control": "public, max-age=300"})
+
+
 @router.post(path="/api/v1/auth/login", status_code=200)
 async def login(
     *,
+    request: Request,
     settings: Annotated[Settings, Depends(get_settings)],
     paddle_client: Annotated[Client, Depends(get_paddle_client)],
+    redis_client: Annotated[Redis, Depends(get_redis_client)],
     sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
     background_tasks: BackgroundTasks,
     credentials: LoginCredentials,
 ) -> JSONResponse:
+    attempts, retry_after = await auth_service.throttle_login(
+        redis_client=redis_client,
+        email=credentials.email,
+        ip=auth_service.retrieve_client_ip(
+            host=request.client.host if request.client else None,
+            forwarded_for=request.headers.get("x-forwarded-for"),
+            trusted_proxies=settings.trusted_proxies,
+        ),
+        email_limit=settings.login_throttle_email_limit,
+        ip_limit=settings.login_throttle_ip_limit,
+        window=settings.login_throttle_window,
+        lockout=settings.login_throttle_lockout,
+    )
+
+    if retry_after:
+        raise HTTPException(
+            status_code=TooManyLoginAttemptsException.status_code,
+            detail=TooManyLoginAttemptsException.detail,
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    delay = auth_service.compute_login_delay(
+        attempts=attempts,
+        free_attempts=settings.login_throttle_free_attempts,
+        delay=settings.login_throttle_delay,
+        max_delay=settings.login_throttle_max_delay,
+    )
+
+    if delay:
+        await asyncio.sleep(delay)
+
     retrieved_user = await user_service.retrieve_by_email(
         sqlmodel_session=sqlmodel_session,
         email=credentials.email,
@@ -79,12 +126,21 @@ async def login(
     if not retrieved_user.verified:
         raise InvalidVerificationException
 
-    if not auth_service.verify_password(
+    if not await auth_service.verify_password_async(
         password=credentials.password,
         encoded_password=retrieved_user.password,
     ):
         raise InvalidCredentialsException
 
+    if auth_service.needs_rehash(encoded_password=retrieved_user.password):
+        await user_service.update(
+            sqlmodel_session=sqlmodel_session,
+            retrieved_user=retrieved_user,
+            user=UpdateUser(password=credentials.password),
+        )
+
+    await auth_service.reset_login_throttle(redis_client=redis_client, email=credentials.email)
+
     if retrieved_user.subscription.paddle_subscription_id:
         background_tasks.add_task(
             payment_service.sync_subscription,
@@ -93,14 +149,14 @@ async def login(
             retrieved_user,
         )
 
-    access_token = auth_service.encode_token(
+    access_token = auth_service.encode_access_token(
         payload={"user_id": str(retrieved_user.id)},
         key=settings.access_token_key,
         seconds=settings.access_token_expiration,
     )
 
     refresh_token = auth_service.encode_token(
-        payload={"user_id": str(retrieved_user.id)},
+        payload={"user_id": str(retrieved_user.id), "fid": str(uuid.uuid4())},
         key=settings.refresh_token_key,
         seconds=settings.refresh_token_expiration,
     )
@@ -140,11 +196,12 @@ async def google(
     request = google_requests.Request()
 
     try:
-        id_info = id_token.verify_oauth2_token(
-            id_token=credentials.token,
-            request=request,
-            audience=settings.google_client_id,
-        )
+        with metrics_service.observe("google", "verify_oauth2_token"):
+            id_info = id_token.verify_oauth2_token(
+                id_token=credentials.token,
+                request=request,
+                audience=settings.google_client_id,
+            )
     except (ValueError, GoogleAuthError) as err:
         raise InvalidGoogleIDTokenException from err
 
@@ -162,10 +219,8 @@ async def google(
         firstname = id_info["given_name"].lower()
         lastname = id_info["family_name"].lower()
         username = f"{firstname}{lastname}{random.randint(1000, 9999)}"
-        password = auth_service.encode_password(
-            password="".join(
-                random.choices(string.ascii_letters + string.digits, k=16),
-            ),
+        password = "".join(
+            random.choices(string.ascii_letters + string.digits, k=16),
         )
 
         company = await company_service.create(
@@ -209,14 +264,14 @@ async def google(
             retrieved_user,
         )
 
-    access_token = auth_service.encode_token(
+    access_token = auth_service.encode_access_token(
         payload={"user_id": str(retrieved_user.id)},
         key=settings.access_token_key,
         seconds=settings.access_token_expiration,
     )
 
     refresh_token = auth_service.encode_token(
-        payload={"user_id": str(retrieved_user.id)},
+        payload={"user_id": str(retrieved_user.id), "fid": str(uuid.uuid4())},
         key=settings.refresh_token_key,
         seconds=settings.refresh_token_expiration,
     )
@@ -255,13 +310,14 @@ async def linkedin(
     background_tasks: BackgroundTasks,
     credentials: LinkedInCredentials,
 ) -> JSONResponse:
-    response = requests.get(
-        "https://api.linkedin.com/v2/me",
-        headers={
-            "Authorization": f"Bearer {credentials.token}",
-        },
-        timeout=10,
-    )
+    with metrics_service.observe("linkedin", "retrieve_profile"):
+        response = requests.get(
+            "https://api.linkedin.com/v2/me",
+            headers={
+                "Authorization": f"Bearer {credentials.token}",
+            },
+            timeout=10,
+        )
 
     if response.status_code != HTTP_200_OK:
         raise InvalidLinkedInAccessTokenException
@@ -279,10 +335,8 @@ async def linkedin(
         firstname = response_body["localizedFirstName"].lower()
         lastname = response_body["localizedLastName"].lower()
         username = f"{firstname}{lastname}{random.randint(1000, 9999)}"
-        password = auth_service.encode_password(
-            password="".join(
-                random.choices(string.ascii_letters + string.digits, k=16),
-            ),
+        password = "".join(
+            random.choices(string.ascii_letters + string.digits, k=16),
         )
 
         company = await company_service.create(
@@ -326,14 +380,14 @@ async def linkedin(
             retrieved_user,
         )
 
-    access_token = auth_service.encode_token(
+    access_token = auth_service.encode_access_token(
         payload={"user_id": str(retrieved_user.id)},
         key=settings.access_token_key,
         seconds=settings.access_token_expiration,
     )
 
     refresh_token = auth_service.encode_token(
-        payload={"user_id": str(retrieved_user.id)},
+        payload={"user_id": str(retrieved_user.id), "fid": str(uuid.uuid4())},
         key=settings.refresh_token_key,
         seconds=settings.refresh_token_expiration,
     )
@@ -368,9 +422,7 @@ async def linkedin(
 async def register(
     *,
     sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
-    email_client: Annotated[EmailClient, Depends(get_email_client)],
     settings: Annotated[Settings, Depends(get_settings)],
-    background_tasks: BackgroundTasks,
     credentials: RegisterCredentials,
 ) -> User:
     retrieved_user = await user_service.retrieve_by_username(
@@ -389,16 +441,12 @@ async def register(
     if retrieved_user:
         raise DuplicateEmailException
 
-    company = await company_service.create(
+    # the company and its founder are only flushed, the verification email commits them all at once
+    employee = await company_service.create_with_employee(
         sqlmodel_session=sqlmodel_session,
         company=CreateCompany(
             name=f"{credentials.username}Company",
         ),
-    )
-
-    employee = await company_service.create_employee(
-        sqlmodel_session=sqlmodel_session,
-        company_id=company.id,
         employee=CreateCompanyEmployee(
             title=CompanyEmployeeTitle.FOUNDER.value,
             user=CreateUser(
@@ -424,8 +472,7 @@ async def register(
     }
 
     await auth_service.send_verification_email(
-        email_client=email_client,
-        background_tasks=background_tasks,
+        sqlmodel_session=sqlmodel_session,
         context=context,
         from_addr=settings.smtp_email,
         to_addrs=employee.user.email,
@@ -488,28 +535,26 @@ async def refresh(
 
     _, payload, _ = auth_service.decode_token(token=refresh_token)
 
-    retrieved_blacklisted_token = await auth_service.retrieve_blacklisted_token(
-        redis_client=redis_client,
-        jti=payload.get("jti"),
-    )
+    fid = payload.get("fid") or payload.get("jti")
 
-    if retrieved_blacklisted_token:
-        raise BlacklistedTokenException
-
-    await auth_service.blacklist_token(
+    is_rotated = await auth_service.rotate_refresh_token(
         redis_client=redis_client,
         jti=payload.get("jti"),
+        fid=fid,
         ex=int(settings.refresh_token_expiration),
     )
 
-    access_token = auth_service.encode_token(
+    if not is_rotated:
+        raise BlacklistedTokenException
+
+    access_token = auth_service.encode_access_token(
         payload={"user_id": str(payload["user_id"])},
         key=settings.access_token_key,
         seconds=settings.access_token_expiration,
     )
 
     refresh_token = auth_service.encode_token(
-        payload={"user_id": str(payload["user_id"])},
+        payload={"user_id": str(payload["user_id"]), "fid": fid},
         key=settings.refresh_token_key,
         seconds=settings.refresh_token_expiration,
     )
@@ -565,19 +610,17 @@ async def logout(
 
     _, payload, _ = auth_service.decode_token(token=refresh_token)
 
-    retrieved_blacklisted_token = await auth_service.retrieve_blacklisted_token(
-        redis_client=redis_client, jti=payload.get("jti")
-    )
-
-    if retrieved_blacklisted_token:
-        raise BlacklistedTokenException
-
-    await auth_service.blacklist_token(
+    is_revoked = await auth_service.rotate_refresh_token(
         redis_client=redis_client,
         jti=payload.get("jti"),
+        fid=payload.get("fid") or payload.get("jti"),
         ex=int(settings.refresh_token_expiration),
+        revoke_family=True,
     )
 
+    if not is_revoked:
+        raise BlacklistedTokenException
+
     content = AuthenticationTokens(access_token=None, refresh_token=None)
 
     response = JSONResponse(content=content.model_dump())
@@ -1,6 +1,7 @@
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from src.talentgate.company.enums import CompanyEmployeeTitle
@@ -62,7 +63,7 @@ class CompanyInvitation(SQLModel, table=True):
     __tablename__ = "company_invitation"
 
     id: int | None = Field(default=None, primary_key=True)
-    email: str = Field(unique=True)
+    email: str
     status: str | None = Field(default=None)
     company_id: int | None = Field(default=None, foreign_key="company.id", ondelete="CASCADE")
     company: Optional["Company"] = Relationship(back_populates="invitations")
@@ -75,6 +76,10 @@ class CompanyInvitation(SQLModel, table=True):
     )
 
 
+# the same email can be invited by several companies, but only once by each, re-inviting upserts the row
+Index("uq_company_invitation_company_id_email", CompanyInvitation.company_id, CompanyInvitation.email, unique=True)
+
+
 class CompanyEmployee(SQLModel, table=True):
     __tablename__ = "company_employee"
 
@@ -114,6 +119,7 @@ class Company(SQLModel, table=True):
         back_populates="company",
         cascade_delete=True,
     )
+    jobs_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: float | None = Field(
         default_factory=lambda: datetime.now(UTC).timestamp(),
     )
@@ -420,5 +426,13 @@ class EmployeeInvitation(SQLModel):
     email: str
 
 
+class EmployeeInvitations(SQLModel):
+    employees: list[EmployeeInvitation] = Field(min_length=1, max_length=500)
+
+
+class InvitedEmployees(SQLModel):
+    emails: list[str]
+
+
 class InvitationAcceptance(SQLModel):
     token: str
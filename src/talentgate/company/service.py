@@ -1,13 +1,16 @@
 from collections.abc import Sequence
+from datetime import UTC, datetime
 from io import BytesIO
 from typing import Any
 
-from fastapi import BackgroundTasks
 from minio import Minio
 from minio.helpers import ObjectWriteResult
+from sqlalchemy import delete as sql_delete
 from sqlmodel import Session, select
 
 from config import get_settings
+from src.talentgate.application.models import Application
+from src.talentgate.company.enums import CompanyInvitationStatus
 from src.talentgate.company.models import (
     Company,
     CompanyEmployee,
@@ -32,8 +35,14 @@ from src.talentgate.company.models import (
     UpdateCurrentCompany,
     UpsertCompanyInvitation,
 )
+from src.talentgate.counter import service as counter_service
+from src.talentgate.counter.enums import CompanyCounterName, CounterScope
+from src.talentgate.database.service import dialect_insert
 from src.talentgate.email import service as email_service
-from src.talentgate.email.client import EmailClient
+from src.talentgate.email.models import CreateEmailOutbox, EmailOutbox
+from src.talentgate.job.models import Job
+from src.talentgate.metrics import service as metrics_service
+from src.talentgate.skill.models import ApplicantSkill
 from src.talentgate.user import service as user_service
 from src.talentgate.user.models import User
 
@@ -49,24 +58,26 @@ async def upload_logo(
     length: int,
     content_type: str,
 ) -> ObjectWriteResult:
-    return minio_client.put_object(
-        bucket_name=bucket_name,
-        object_name=object_name,
-        data=data,
-        length=length,
-        content_type=content_type,
-    )
+    with metrics_service.observe("minio", "put_object"):
+        return minio_client.put_object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            data=data,
+            length=length,
+            content_type=content_type,
+        )
 
 
 async def retrieve_logo(*, minio_client: Minio, bucket_name: str, object_name: str) -> bytes:
     response = None
 
     try:
-        response = minio_client.get_object(
-            bucket_name=bucket_name,
-            object_name=object_name,
-        )
-        data = response.data
+        with metrics_service.observe("minio", "get_object"):
+            response = minio_client.get_object(
+                bucket_name=bucket_name,
+                object_name=object_name,
+            )
+            data = response.data
     finally:
         if response:
             response.close()
@@ -248,6 +259,13 @@ async def create_invitation(
         **invitation.model_dump(exclude_unset=True, exclude_none=True), company_id=company_id
     )
 
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=company_id,
+        name=CompanyCounterName.INVITATIONS.value,
+    )
+
     sqlmodel_session.add(created_invitation)
     sqlmodel_session.commit()
     sqlmodel_session.refresh(created_invitation)
@@ -311,6 +329,14 @@ async def upsert_invitation(
 
 
 async def delete_invitation(*, sqlmodel_session: Session, retrieved_invitation: CompanyInvitation) -> CompanyInvitation:
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=retrieved_invitation.company_id,
+        name=CompanyCounterName.INVITATIONS.value,
+        amount=-1,
+    )
+
     sqlmodel_session.delete(retrieved_invitation)
     sqlmodel_session.commit()
 
@@ -337,6 +363,13 @@ async def create_employee(
             user=employee.user,
         )
 
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=company_id,
+        name=CompanyCounterName.EMPLOYEES.value,
+    )
+
     sqlmodel_session.add(created_employee)
     sqlmodel_session.commit()
     sqlmodel_session.refresh(created_employee)
@@ -344,6 +377,33 @@ async def create_employee(
     return created_employee
 
 
+async def create_with_employee(
+    *, sqlmodel_session: Session, company: CreateCompany, employee: CreateCompanyEmployee
+) -> CompanyEmployee:
+    """Stage a new company with its first employee and flush them, the caller commits."""
+    created_employee = CompanyEmployee(
+        **employee.model_dump(exclude_unset=True, exclude_none=True, exclude={"user"}),
+        company=Company(
+            **company.model_dump(exclude_unset=True, exclude_none=True, exclude={"locations", "links", "employees"})
+        ),
+    )
+
+    if "user" in employee.model_fields_set and employee.user is not None:
+        created_employee.user = await user_service.build(user=employee.user)
+
+    sqlmodel_session.add(created_employee)
+    sqlmodel_session.flush()
+
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=created_employee.company_id,
+        name=CompanyCounterName.EMPLOYEES.value,
+    )
+
+    return created_employee
+
+
 async def retrieve_employee_by_id(*, sqlmodel_session: Session, company_id: int, employee_id: int) -> CompanyEmployee:
     statement: Any = select(CompanyEmployee).where(
         CompanyEmployee.company_id == company_id, CompanyEmployee.id == employee_id
@@ -418,6 +478,14 @@ async def delete_employee(
     sqlmodel_session: Session,
     retrieved_employee: CompanyEmployee,
 ) -> CompanyEmployee:
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=retrieved_employee.company_id,
+        name=CompanyCounterName.EMPLOYEES.value,
+        amount=-1,
+    )
+
     sqlmodel_session.delete(retrieved_employee)
     sqlmodel_session.commit()
 
@@ -539,6 +607,26 @@ async def update(
 
 
 async def delete(*, sqlmodel_session: Session, retrieved_company: Company) -> Company:
+    counter_service.delete(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.JOB,
+        scope_ids=select(Job.id).where(Job.company_id == retrieved_company.id),
+    )
+    counter_service.delete(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_ids=[retrieved_company.id],
+    )
+
+    # applications cascade through the ORM from the jobs, their skills have no relationship to cascade through
+    sqlmodel_session.execute(
+        sql_delete(ApplicantSkill).where(
+            ApplicantSkill.application_id.in_(
+                select(Application.id).join(Job).where(Job.company_id == retrieved_company.id),
+            ),
+        ),
+    )
+
     sqlmodel_session.delete(retrieved_company)
     sqlmodel_session.commit()
 
@@ -547,23 +635,85 @@ async def delete(*, sqlmodel_session: Session, retrieved_company: Company) -> Co
 
 async def send_invitation_email(
     *,
-    email_client: EmailClient,
-    background_tasks: BackgroundTasks,
+    sqlmodel_session: Session,
     context: dict,
     from_addr: str | None = None,
-    to_addrs: str | Sequence[str] | None = None,
+    to_addrs: str | Sequence[str],
+) -> EmailOutbox:
+    """Stage the invitation email, the caller commits it together with the invitation."""
+    body = email_service.load_template(file="src/talentgate/company/templates/invitation.txt")
+
+    html = email_service.load_template(file="src/talentgate/company/templates/invitation.html")
+
+    return await email_service.enqueue_email(
+        sqlmodel_session=sqlmodel_session,
+        subject="Employee Invitation",
+        body=body,
+        html=html,
+        context=context,
+        from_addr=from_addr,
+        to_addrs=to_addrs,
+    )
+
+
+async def invite_employees(
+    *,
+    sqlmodel_session: Session,
+    company_id: int,
+    contexts: dict[str, dict],
+    from_addr: str | None = None,
 ) -> None:
+    """
+    Upsert a pending invitation and queue an invitation email for every address in contexts.
+
+    Invitations are written with one INSERT ... ON CONFLICT (company_id, email) DO UPDATE and the emails
+    with one multi-row insert into the outbox, both in a single transaction. contexts maps each email to
+    the context its template is rendered with, so every address appears once.
+    """
+    if not contexts:
+        return
+
     body = email_service.load_template(file="src/talentgate/company/templates/invitation.txt")
 
     html = email_service.load_template(file="src/talentgate/company/templates/invitation.html")
 
-    background_tasks.add_task(
-        email_service.send_email,
-        email_client,
-        "Employee Invitation",
-        body,
-        html,
-        context,
-        from_addr,
-        to_addrs,
+    now = datetime.now(UTC).timestamp()
+
+    statement: Any = dialect_insert(sqlmodel_session, CompanyInvitation)
+    statement = statement.on_conflict_do_update(
+        index_elements=["company_id", "email"],
+        set_={"status": statement.excluded.status, "updated_at": statement.excluded.updated_at},
     )
+
+    sqlmodel_session.execute(
+        statement,
+        [
+            {
+                "email": email,
+                "status": CompanyInvitationStatus.PENDING.value,
+                "company_id": company_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for email in contexts
+        ],
+    )
+
+    email_service.enqueue_emails(
+        sqlmodel_session=sqlmodel_session,
+        emails=[
+            CreateEmailOutbox(
+                subject="Employee Invitation",
+                body=body.format(**context),
+                html=html.format(**context),
+                from_addr=from_addr,
+                to_addrs=email,
+            )
+            for email, context in contexts.items()
+        ],
+    )
+
+    # an upsert does not tell which invitations are new, so the company is recounted instead
+    counter_service.reconcile(sqlmodel_session=sqlmodel_session, scope=CounterScope.COMPANY, scope_id=company_id)
+
+    sqlmodel_session.commit()
@@ -1,8 +1,10 @@
 import random
 import string
+import uuid
 from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
-from io import BytesIO
+from io import BytesIO, TextIOWrapper
+from pathlib import PurePath
 from typing import Annotated
 
 from fastapi import (
@@ -14,11 +16,28 @@ from fastapi import (
     UploadFile,
 )
 from minio import Minio
+from redis.asyncio import Redis
 from sqlmodel import Session
 from starlette.responses import JSONResponse, StreamingResponse
 
 from config import Settings, get_settings
+from src.talentgate.analytics import service as analytics_service
+from src.talentgate.analytics.models import CompanyAnalytics
 from src.talentgate.application import service as application_service
+from src.talentgate.application.enums import ApplicationExportFormat, EvaluationProgressStatus
+from src.talentgate.application.exceptions import (
+    EvaluationInProgressException,
+    InvalidStatusTransitionException,
+    MissingTransitionFilterException,
+)
+from src.talentgate.application.models import (
+    ApplicationExportQueryParameters,
+    ApplicationRankingQueryParameters,
+    ApplicationStatusTransition,
+    EvaluationProgress,
+    RankedApplication,
+    TransitionedApplications,
+)
 from src.talentgate.auth import service as auth_service
 from src.talentgate.auth.exceptions import (
     InvalidAuthorizationException,
@@ -45,7 +64,9 @@ from src.talentgate.company.models import (
     DeletedCompanyEmployee,
     DeletedCurrentCompany,
     EmployeeInvitation,
+    EmployeeInvitations,
     InvitationAcceptance,
+    InvitedEmployees,
     RetrievedCompany,
     RetrievedCurrentCompany,
     RetrievedCurrentCompanyJob,
@@ -56,13 +77,22 @@ from src.talentgate.company.models import (
     UpdatedCompany,
     UpsertCompanyInvitation,
 )
-from src.talentgate.database.service import get_sqlmodel_session
-from src.talentgate.email.client import EmailClient, get_email_client
+from src.talentgate.counter import service as counter_service
+from src.talentgate.counter.models import CompanyCounters, JobApplicationCounters
+from src.talentgate.database.service import get_redis_client, get_sqlmodel_session
+from src.talentgate.job import service as job_service
+from src.talentgate.job.enums import JobImportFormat
+from src.talentgate.job.exceptions import IdNotFoundException as JobIdNotFoundException
+from src.talentgate.job.exceptions import UnsupportedImportFormatException
 from src.talentgate.job.models import (
+    ImportedJobs,
     Job,
+    JobFacets,
     JobQueryParameters,
     RetrievedJob,
 )
+from src.talentgate.skill import service as skill_service
+from src.talentgate.skill.models import SkilledApplication, SkillQueryParameters
 from src.talentgate.storage.service import get_minio_client
 from src.talentgate.user import service as user_service
 from src.talentgate.user.enums import UserSubscriptionPlan
@@ -120,10 +150,17 @@ async def retrieve_current_company(
 
 
 class CreateEmployeeInvitationDependency:
-    def __call__(
-        self, user: User = Depends(retrieve_current_user), company: Company = Depends(retrieve_current_company)
+    async def __call__(
+        self,
+        user: User = Depends(retrieve_current_user),
+        company: Company = Depends(retrieve_current_company),
+        sqlmodel_session: Session = Depends(get_sqlmodel_session),
     ) -> bool:
-        if (len(company.invitations) >= 1) and user.employee.title == CompanyEmployeeTitle.FOUNDER:
+        counters = await counter_service.retrieve_company_counters(
+            sqlmodel_session=sqlmodel_session, company_id=company.id
+        )
+
+        if (counters.invitations >= 1) and user.employee.title == CompanyEmployeeTitle.FOUNDER:
             return True
         raise InvalidAuthorizationException
 
@@ -311,6 +348,88 @@ async def retrieve_current_company_jobs(
     return retrieved_company.jobs
 
 
+@router.get(
+    path="/api/v1/me/company/analytics",
+    status_code=200,
+)
+async def retrieve_current_company_analytics(
+    *,
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+) -> CompanyAnalytics:
+    return await analytics_service.retrieve_company_analytics(
+        sqlmodel_session=sqlmodel_session,
+        company_id=retrieved_company.id,
+    )
+
+
+@router.get(
+    path="/api/v1/me/company/counters",
+    status_code=200,
+)
+async def retrieve_current_company_counters(
+    *,
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+) -> CompanyCounters:
+    return await counter_service.retrieve_company_counters(
+        sqlmodel_session=sqlmodel_session,
+        company_id=retrieved_company.id,
+    )
+
+
+@router.get(
+    path="/api/v1/me/company/jobs/{job_id}/applications/counters",
+    status_code=200,
+)
+async def retrieve_current_company_job_application_counters(
+    *,
+    job_id: int,
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+) -> JobApplicationCounters:
+    retrieved_job = await job_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session, company_id=retrieved_company.id, job_id=job_id
+    )
+
+    if not retrieved_job:
+        raise JobIdNotFoundException
+
+    return await counter_service.retrieve_job_application_counters(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job_id,
+    )
+
+
+@router.post(
+    path="/api/v1/me/company/jobs/import",
+    status_code=200,
+)
+async def import_current_company_jobs(
+    *,
+    file: Annotated[UploadFile, File()],
+    settings: Annotated[Settings, Depends(get_settings)],
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+) -> ImportedJobs:
+    suffix = PurePath(file.filename or "").suffix.lower()
+
+    if suffix == ".csv":
+        import_format = JobImportFormat.CSV
+    elif suffix in {".jsonl", ".ndjson"}:
+        import_format = JobImportFormat.JSONL
+    else:
+        raise UnsupportedImportFormatException
+
+    return await job_service.import_jobs(
+        sqlmodel_session=sqlmodel_session,
+        company_id=retrieved_company.id,
+        rows=job_service.read_rows(TextIOWrapper(file.file, encoding="utf-8", newline=""), import_format),
+        batch_size=settings.job_import_batch_size,
+        max_errors=settings.job_import_max_errors,
+    )
+
+
 @router.get(
     path="/api/v1/me/company/jobs/{job_id}/applications",
     response_model=list[RetrievedCurrentCompanyJob],
@@ -331,6 +450,198 @@ async def retrieve_current_company_job_applications(
     return job.applications
 
 
+@router.get(
+    path="/api/v1/me/company/jobs/{job_id}/applications/ranking",
+    status_code=200,
+)
+async def retrieve_current_company_job_application_ranking(
+    *,
+    job_id: int,
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+    query_parameters: Annotated[ApplicationRankingQueryParameters, Query()],
+) -> list[RankedApplication]:
+    retrieved_job = await job_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session, company_id=retrieved_company.id, job_id=job_id
+    )
+
+    if not retrieved_job:
+        raise JobIdNotFoundException
+
+    return await application_service.retrieve_ranking(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job_id,
+        query_parameters=query_parameters,
+    )
+
+
+@router.get(
+    path="/api/v1/me/company/jobs/{job_id}/applications/skills",
+    status_code=200,
+)
+async def retrieve_current_company_job_applications_by_skills(
+    *,
+    job_id: int,
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+    query_parameters: Annotated[SkillQueryParameters, Query()],
+) -> list[SkilledApplication]:
+    retrieved_job = await job_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session, company_id=retrieved_company.id, job_id=job_id
+    )
+
+    if not retrieved_job:
+        raise JobIdNotFoundException
+
+    return await skill_service.retrieve_applications_by_skills(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job_id,
+        query_parameters=query_parameters,
+    )
+
+
+@router.post(
+    path="/api/v1/me/company/jobs/{job_id}/applications/status",
+    status_code=200,
+)
+async def transition_current_company_job_application_status(
+    *,
+    job_id: int,
+    transition: ApplicationStatusTransition,
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+) -> TransitionedApplications:
+    if transition.ids is None and transition.from_status is None:
+        raise MissingTransitionFilterException
+
+    if not application_service.retrieve_source_statuses(transition.status):
+        raise InvalidStatusTransitionException
+
+    retrieved_job = await job_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session, company_id=retrieved_company.id, job_id=job_id
+    )
+
+    if not retrieved_job:
+        raise JobIdNotFoundException
+
+    return await application_service.transition_status(
+        sqlmodel_session=sqlmodel_session,
+        retrieved_job=retrieved_job,
+        transition=transition,
+    )
+
+
+@router.get(
+    path="/api/v1/me/company/jobs/{job_id}/applications/export",
+    response_model=None,
+    status_code=200,
+)
+async def export_current_company_job_applications(
+    *,
+    job_id: int,
+    settings: Annotated[Settings, Depends(get_settings)],
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+    query_parameters: Annotated[ApplicationExportQueryParameters, Query()],
+) -> StreamingResponse:
+    retrieved_job = await job_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session, company_id=retrieved_company.id, job_id=job_id
+    )
+
+    if not retrieved_job:
+        raise JobIdNotFoundException
+
+    rows = application_service.export_applications(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job_id,
+        batch_size=settings.application_export_batch_size,
+    )
+
+    return StreamingResponse(
+        content=application_service.write_export(rows, query_parameters.format),
+        media_type="text/csv" if query_parameters.format == ApplicationExportFormat.CSV else "application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="job-{job_id}-applications.{query_parameters.format}"',
+        },
+    )
+
+
+@router.post(
+    path="/api/v1/me/company/jobs/{job_id}/applications/evaluations",
+    status_code=202,
+)
+async def evaluate_current_company_job_applications(
+    *,
+    job_id: int,
+    settings: Annotated[Settings, Depends(get_settings)],
+    redis_client: Annotated[Redis, Depends(get_redis_client)],
+    minio_client: Annotated[Minio, Depends(get_minio_client)],
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+    background_tasks: BackgroundTasks,
+) -> EvaluationProgress:
+    retrieved_job = await job_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session, company_id=retrieved_company.id, job_id=job_id
+    )
+
+    if not retrieved_job:
+        raise JobIdNotFoundException
+
+    retrieved_progress = await application_service.retrieve_evaluation_progress(
+        redis_client=redis_client, job_id=job_id
+    )
+
+    if retrieved_progress and retrieved_progress.status in [
+        EvaluationProgressStatus.PENDING,
+        EvaluationProgressStatus.RUNNING,
+    ]:
+        raise EvaluationInProgressException
+
+    progress = EvaluationProgress(status=EvaluationProgressStatus.PENDING.value)
+
+    await application_service.update_evaluation_progress(redis_client=redis_client, job_id=job_id, progress=progress)
+
+    background_tasks.add_task(
+        application_service.evaluate_job_applications,
+        sqlmodel_session=sqlmodel_session,
+        redis_client=redis_client,
+        minio_client=minio_client,
+        bucket_name=settings.minio_default_bucket,
+        retrieved_job=retrieved_job,
+        batch_size=settings.resume_evaluation_batch_size,
+        concurrency=settings.resume_conversion_concurrency,
+        similarity_threshold=settings.resume_similarity_threshold,
+        similarity_top_k=settings.resume_similarity_top_k,
+    )
+
+    return progress
+
+
+@router.get(
+    path="/api/v1/me/company/jobs/{job_id}/applications/evaluations",
+    status_code=200,
+)
+async def retrieve_current_company_job_evaluation_progress(
+    *,
+    job_id: int,
+    redis_client: Annotated[Redis, Depends(get_redis_client)],
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+) -> EvaluationProgress:
+    retrieved_job = await job_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session, company_id=retrieved_company.id, job_id=job_id
+    )
+
+    if not retrieved_job:
+        raise JobIdNotFoundException
+
+    retrieved_progress = await application_service.retrieve_evaluation_progress(
+        redis_client=redis_client, job_id=job_id
+    )
+
+    return retrieved_progress or EvaluationProgress()
+
+
 class CreateCompanyDependency:
     def __call__(self, user: User = Depends(retrieve_current_user)) -> bool:
         if (user.role == UserRole.ADMIN) or (
@@ -406,11 +717,44 @@ async def retrieved_career_jobs(
     company_id: int,
     sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
     query_parameters: Annotated[JobQueryParameters, Query()],
-) -> Sequence[Job]:
-    return await company_service.retrieve_jobs_by_query_parameters(
+) -> Sequence[Job] | list[RetrievedJob]:
+    if query_parameters.latitude is not None and query_parameters.longitude is not None:
+        return await job_service.retrieve_nearby_by_query_parameters(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company_id,
+            query_parameters=query_parameters,
+        )
+
+    if query_parameters.q:
+        return await job_service.search_by_query_parameters(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company_id,
+            query_parameters=query_parameters,
+        )
+
+    return await job_service.retrieve_by_query_parameters(
         sqlmodel_session=sqlmodel_session,
+        company_id=company_id,
         query_parameters=query_parameters,
+    )
+
+
+@router.get(
+    path="/api/v1/careers/companies/{company_id}/jobs/facets",
+    status_code=200,
+)
+async def retrieve_career_job_facets(
+    *,
+    company_id: int,
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    redis_client: Annotated[Redis, Depends(get_redis_client)],
+    query_parameters: Annotated[JobQueryParameters, Query()],
+) -> JobFacets:
+    return await job_service.retrieve_cached_facets_by_query_parameters(
+        sqlmodel_session=sqlmodel_session,
+        redis_client=redis_client,
         company_id=company_id,
+        query_parameters=query_parameters,
     )
 
 
@@ -425,12 +769,17 @@ async def retrieved_careers_job(
     job_id: int,
     sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
 ) -> Job:
-    return await company_service.retrieve_job_by_id(
+    retrieved_job = await job_service.retrieve_by_id(
         sqlmodel_session=sqlmodel_session,
         company_id=company_id,
         job_id=job_id,
     )
 
+    if not retrieved_job:
+        raise JobIdNotFoundException
+
+    return retrieved_job
+
 
 @router.get(
     path="/api/v1/companies/{company_id}/jobs",
@@ -442,11 +791,25 @@ async def retrieved_company_jobs(
     company_id: int,
     sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
     query_parameters: Annotated[JobQueryParameters, Query()],
-) -> Sequence[Job]:
-    return await company_service.retrieve_jobs_by_query_parameters(
+) -> Sequence[Job] | list[RetrievedJob]:
+    if query_parameters.latitude is not None and query_parameters.longitude is not None:
+        return await job_service.retrieve_nearby_by_query_parameters(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company_id,
+            query_parameters=query_parameters,
+        )
+
+    if query_parameters.q:
+        return await job_service.search_by_query_parameters(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company_id,
+            query_parameters=query_parameters,
+        )
+
+    return await job_service.retrieve_by_query_parameters(
         sqlmodel_session=sqlmodel_session,
-        query_parameters=query_parameters,
         company_id=company_id,
+        query_parameters=query_parameters,
     )
 
 
@@ -650,10 +1013,8 @@ async def delete_current_company_link(
 async def invite_employee(
     *,
     settings: Annotated[Settings, Depends(get_settings)],
-    email_client: Annotated[EmailClient, Depends(get_email_client)],
     sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
     retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
-    background_tasks: BackgroundTasks,
     employee: EmployeeInvitation,
 ) -> None:
     token = auth_service.encode_token(
@@ -671,9 +1032,9 @@ async def invite_employee(
         "link": f"{settings.frontend_base_url}/company/accept-invitation?token={token}",
     }
 
+    # the email is only staged, upserting the invitation commits both
     await company_service.send_invitation_email(
-        email_client=email_client,
-        background_tasks=background_tasks,
+        sqlmodel_session=sqlmodel_session,
         context=context,
         from_addr=settings.smtp_email,
         to_addrs=employee.email,
@@ -691,6 +1052,49 @@ async def invite_employee(
     )
 
 
+@router.post(
+    path="/api/v1/me/company/employee-invitations/batch",
+    status_code=200,
+    dependencies=[Depends(CreateEmployeeInvitationDependency())],
+)
+async def invite_employees(
+    *,
+    settings: Annotated[Settings, Depends(get_settings)],
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    retrieved_company: Annotated[Company, Depends(retrieve_current_company)],
+    invitations: EmployeeInvitations,
+) -> InvitedEmployees:
+    # a repeated email keeps its last title, every token is signed before anything is written
+    employees = {employee.email: employee for employee in invitations.employees}
+
+    contexts = {}
+
+    for email, employee in employees.items():
+        token = auth_service.encode_token(
+            payload={
+                "title": employee.title,
+                "email": email,
+                "company_id": str(retrieved_company.id),
+            },
+            key=settings.one_time_token_key,
+            seconds=settings.one_time_token_expiration,
+        )
+
+        contexts[email] = {
+            "company_name": retrieved_company.name,
+            "link": f"{settings.frontend_base_url}/company/accept-invitation?token={token}",
+        }
+
+    await company_service.invite_employees(
+        sqlmodel_session=sqlmodel_session,
+        company_id=retrieved_company.id,
+        contexts=contexts,
+        from_addr=settings.smtp_email,
+    )
+
+    return InvitedEmployees(emails=list(contexts))
+
+
 @router.post(
     path="/api/v1/company/employee-invitations/accept",
     status_code=200,
@@ -719,10 +1123,8 @@ async def accept_employee_invitation(
         firstname = "".join(random.choices(string.ascii_letters, k=5)).title()
         lastname = "".join(random.choices(string.ascii_letters, k=5)).title()
         username = f"{firstname}{lastname}{random.randint(1000, 9999)}"
-        password = auth_service.encode_password(
-            password="".join(
-                random.choices(string.ascii_letters + string.digits, k=16),
-            ),
+        password = "".join(
+            random.choices(string.ascii_letters + string.digits, k=16),
         )
 
         await company_service.create_employee(
@@ -770,14 +1172,14 @@ async def accept_employee_invitation(
         invitation=UpdateCompanyInvitation(status=CompanyInvitationStatus.ACCEPTED.value),
     )
 
-    access_token = auth_service.encode_token(
+    access_token = auth_service.encode_access_token(
         payload={"user_id": str(retrieved_user.id)},
         key=settings.access_token_key,
         seconds=settings.access_token_expiration,
     )
 
     refresh_token = auth_service.encode_token(
-        payload={"user_id": str(retrieved_user.id)},
+        payload={"user_id": str(retrieved_user.id), "fid": str(uuid.uuid4())},
         key=settings.refresh_token_key,
         seconds=settings.refresh_token_expiration,
     )
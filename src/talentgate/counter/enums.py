@@ -0,0 +1,12 @@
+from enum import StrEnum
+
+
+class CounterScope(StrEnum):
+    COMPANY = "company"
+    JOB = "job"
+
+
+class CompanyCounterName(StrEnum):
+    JOBS = "jobs"
+    EMPLOYEES = "employees"
+    INVITATIONS = "invitations"
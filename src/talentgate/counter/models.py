@@ -0,0 +1,23 @@
+from sqlmodel import Field, SQLModel
+
+from src.talentgate.database.models import BaseModel
+
+
+class Counter(SQLModel, table=True):
+    __tablename__ = "counter"
+
+    scope: str = Field(primary_key=True)
+    scope_id: int = Field(primary_key=True)
+    name: str = Field(primary_key=True)
+    value: int = Field(default=0)
+
+
+class CompanyCounters(BaseModel):
+    jobs: int = 0
+    employees: int = 0
+    invitations: int = 0
+
+
+class JobApplicationCounters(BaseModel):
+    total: int = 0
+    statuses: dict[str, int] | None = None
@@ -0,0 +1,127 @@
+from typing import Any
+
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import func, literal
+from sqlalchemy import update as sql_update
+from sqlmodel import Session, select
+
+from src.talentgate.application.models import Application
+from src.talentgate.company.models import CompanyEmployee, CompanyInvitation
+from src.talentgate.counter.enums import CompanyCounterName, CounterScope
+from src.talentgate.counter.models import CompanyCounters, Counter, JobApplicationCounters
+from src.talentgate.database.service import dialect_insert
+from src.talentgate.job.models import Job
+
+# what every counter counts, as (scope id column, counter name), a column name counts per value of that column
+COUNTED_COLUMNS = {
+    CounterScope.COMPANY: [
+        (Job.company_id, CompanyCounterName.JOBS.value),
+        (CompanyEmployee.company_id, CompanyCounterName.EMPLOYEES.value),
+        (CompanyInvitation.company_id, CompanyCounterName.INVITATIONS.value),
+    ],
+    CounterScope.JOB: [
+        (Application.job_id, Application.status),
+    ],
+}
+
+
+def increment(
+    *,
+    sqlmodel_session: Session,
+    scope: CounterScope,
+    scope_id: int | None,
+    name: str | None,
+    amount: int = 1,
+) -> None:
+    """Stage an atomic change of one counter, the caller commits it together with the rows it counts."""
+    if scope_id is None or name is None or not amount:
+        return
+
+    statement: Any = dialect_insert(sqlmodel_session, Counter).values(
+        scope=scope.value, scope_id=scope_id, name=name, value=amount
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["scope", "scope_id", "name"],
+        set_={"value": Counter.value + statement.excluded.value},
+    )
+
+    sqlmodel_session.execute(statement)
+
+
+def delete(*, sqlmodel_session: Session, scope: CounterScope, scope_ids: Any) -> None:  # noqa: ANN401
+    """Stage the removal of the counters of deleted rows, scope_ids is a list or a subquery of ids."""
+    sqlmodel_session.execute(
+        sql_delete(Counter).where(Counter.scope == scope.value, Counter.scope_id.in_(scope_ids)),
+    )
+
+
+def reconcile(*, sqlmodel_session: Session, scope: CounterScope, scope_id: int | None = None) -> None:
+    """
+    Stage a recount of the counters of one scope, of a single scope id or of all of them.
+
+    Counters are zeroed first so that those whose rows are all gone end at 0, then overwritten with
+    a COUNT(*) ... GROUP BY per counted column through INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+    Used after bulk writes whose effect on the counts is not known up front and periodically by the
+    counter worker to repair any drift.
+    """
+    statement: Any = sql_update(Counter).where(Counter.scope == scope.value).values(value=0)
+
+    if scope_id is not None:
+        statement = statement.where(Counter.scope_id == scope_id)
+
+    sqlmodel_session.execute(statement)
+
+    for column, name in COUNTED_COLUMNS[scope]:
+        group_by = [column] if isinstance(name, str) else [column, name]
+
+        counts: Any = (
+            select(literal(scope.value), column, literal(name) if isinstance(name, str) else name, func.count())
+            .where(*(expression.is_not(None) for expression in group_by))
+            .group_by(*group_by)
+        )
+
+        if scope_id is not None:
+            counts = counts.where(column == scope_id)
+
+        statement = dialect_insert(sqlmodel_session, Counter).from_select(
+            ["scope", "scope_id", "name", "value"], counts
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["scope", "scope_id", "name"],
+            set_={"value": statement.excluded.value},
+        )
+
+        sqlmodel_session.execute(statement)
+
+
+async def retrieve(*, sqlmodel_session: Session, scope: CounterScope, scope_id: int) -> dict[str, int]:
+    statement: Any = select(Counter.name, Counter.value).where(
+        Counter.scope == scope.value,
+        Counter.scope_id == scope_id,
+    )
+
+    return dict(sqlmodel_session.exec(statement).all())
+
+
+async def retrieve_company_counters(*, sqlmodel_session: Session, company_id: int) -> CompanyCounters:
+    """
+    Counters of a company, recounted and committed first when it has none yet.
+
+    Companies created before the counters were maintained have no rows until the counter worker runs,
+    reading them as zero would refuse their founders invitations in the meantime.
+    """
+    counters = await retrieve(sqlmodel_session=sqlmodel_session, scope=CounterScope.COMPANY, scope_id=company_id)
+
+    if not counters:
+        reconcile(sqlmodel_session=sqlmodel_session, scope=CounterScope.COMPANY, scope_id=company_id)
+        sqlmodel_session.commit()
+
+        counters = await retrieve(sqlmodel_session=sqlmodel_session, scope=CounterScope.COMPANY, scope_id=company_id)
+
+    return CompanyCounters.model_validate(counters)
+
+
+async def retrieve_job_application_counters(*, sqlmodel_session: Session, job_id: int) -> JobApplicationCounters:
+    statuses = await retrieve(sqlmodel_session=sqlmodel_session, scope=CounterScope.JOB, scope_id=job_id)
+
+    return JobApplicationCounters(total=sum(statuses.values()), statuses=statuses)
@@ -0,0 +1,45 @@
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, SQLModel
+
+from config import get_settings
+from src.talentgate.counter import service as counter_service
+from src.talentgate.counter.enums import CounterScope
+from src.talentgate.database.service import get_sqlmodel_engine
+from src.talentgate.metrics import service as metrics_service
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile(*, sqlmodel_session: Session) -> None:
+    """Recount every counter, one transaction per scope."""
+    for scope in CounterScope:
+        counter_service.reconcile(sqlmodel_session=sqlmodel_session, scope=scope)
+        sqlmodel_session.commit()
+        logger.info("Reconciled %s counters", scope.value)
+
+
+async def run() -> None:
+    if settings.metrics_worker_port:
+        metrics_service.start_http_server(port=settings.metrics_worker_port)
+
+    engine = get_sqlmodel_engine()
+    SQLModel.metadata.create_all(engine)
+
+    while True:
+        try:
+            with Session(engine, autocommit=False, autoflush=False) as sqlmodel_session:
+                await reconcile(sqlmodel_session=sqlmodel_session)
+        except SQLAlchemyError:
+            logger.exception("Failed to reconcile the counters")
+
+        await asyncio.sleep(settings.counter_reconcile_interval)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
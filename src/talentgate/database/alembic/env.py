@@ -17,9 +17,12 @@ from src.talentgate.company.models import (
 )
 from src.talentgate.job.models import JobLocation, JobSalary, Job
 from src.talentgate.application.models import (
-    ApplicationAddress,
-    ApplicationLink,
+    Applicant,
+    ApplicantAddress,
+    ApplicantLink,
     Application,
+    ApplicationKey,
+    Evaluation,
 )
 
 settings = get_settings()
@@ -0,0 +1,202 @@
+"""partition application, applicant and evaluation by month
+
+Converts the three tables created by SQLModel.metadata.create_all into tables range partitioned by
+month on created_at, copying their rows over. Primary keys become (id, created_at) and foreign keys
+pointing at the partitioned tables are dropped, postgres only accepts them against unique constraints
+that include the partition key. Deletes still cascade through the ORM relationships, the services delete
+the application_key and applicant_skill rows and the bulk replaced evaluations explicitly. The dedup
+keys of application move to application_key for the same reason. Columns, defaults and check
+constraints are copied with LIKE, every index but the primary key is recreated from its definition.
+
+Partitions exist from the month of the oldest row to three months ahead, plus a default partition;
+python -m src.talentgate.database.worker keeps creating the upcoming months.
+
+Revision ID: 3f9c2a7d1b4e
+Revises: 5c7e2b9d4f1a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from datetime import UTC, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2a7d1b4e"
+down_revision: Union[str, Sequence[str], None] = "5c7e2b9d4f1a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+INDEXES = {
+    "application": [
+        "CREATE INDEX IF NOT EXISTS ix_application_job_id_overall_score_id "
+        "ON application (job_id, overall_score DESC, id)"
+    ],
+    "applicant": ["CREATE INDEX IF NOT EXISTS ix_applicant_application_id ON applicant (application_id)"],
+    "evaluation": ["CREATE INDEX IF NOT EXISTS ix_evaluation_application_id ON evaluation (application_id)"],
+}
+
+FOREIGN_KEYS = [
+    ("application", "job_id", "job"),
+    ("applicant", "application_id", "application"),
+    ("evaluation", "application_id", "application"),
+    ("applicant_address", "applicant_id", "applicant"),
+    ("applicant_link", "applicant_id", "applicant"),
+    ("applicant_education", "applicant_id", "applicant"),
+    ("applicant_experience", "applicant_id", "applicant"),
+    ("education_evaluation", "evaluation_id", "evaluation"),
+    ("experience_evaluation", "evaluation_id", "evaluation"),
+    ("applicant_skill", "application_id", "application"),
+    ("application_key", "application_id", "application"),
+]
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return datetime(year, month_index + 1, 1, tzinfo=UTC)
+
+
+def drop_foreign_keys_to(tables: Sequence[str]) -> None:
+    op.execute(
+        f"""
+        DO $$
+        DECLARE constraint_row record;
+        BEGIN
+            FOR constraint_row IN
+                SELECT conrelid::regclass AS table_name, conname
+                FROM pg_constraint
+                WHERE contype = 'f' AND confrelid IN ({", ".join(f"'{table}'::regclass" for table in tables)})
+            LOOP
+                EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', constraint_row.table_name, constraint_row.conname);
+            END LOOP;
+        END $$
+        """
+    )
+
+
+def retrieve_indexes(table: str) -> list[str]:
+    """Definitions of the indexes of a table other than its primary key, to recreate them on its replacement."""
+    statement = sa.text(
+        "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+        "WHERE indrelid = CAST(:table AS regclass) AND NOT indisprimary ORDER BY indexrelid"
+    )
+
+    # indexes of a partitioned table are defined ON ONLY the parent and attached to each partition
+    return [
+        definition.replace(" ON ONLY ", " ON ")
+        for definition in op.get_bind().execute(statement, {"table": table}).scalars()
+    ]
+
+
+def create_indexes(table: str, definitions: Sequence[str]) -> None:
+    for definition in definitions:
+        op.execute(definition)
+
+    for index in INDEXES[table]:
+        op.execute(index)
+
+
+def partition(table: str) -> None:
+    bind = op.get_bind()
+
+    oldest = bind.execute(sa.text(f"SELECT min(created_at) FROM {table}")).scalar()
+    now = datetime.now(UTC)
+    month = datetime.fromtimestamp(oldest, UTC) if oldest is not None else now
+    month = datetime(month.year, month.month, 1, tzinfo=UTC)
+    last = add_months(datetime(now.year, now.month, 1, tzinfo=UTC), MONTHS_AHEAD)
+
+    indexes = retrieve_indexes(table)
+
+    op.execute(
+        f"CREATE TABLE {table}_partitioned (LIKE {table} INCLUDING ALL EXCLUDING INDEXES) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute(f"ALTER TABLE {table}_partitioned ALTER COLUMN created_at SET NOT NULL")
+    op.execute(f"ALTER TABLE {table}_partitioned ADD PRIMARY KEY (id, created_at)")
+
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table}_partitioned "
+            f"FOR VALUES FROM ({month.timestamp()}) TO ({add_months(month, 1).timestamp()})"
+        )
+        month = add_months(month, 1)
+
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table}_partitioned DEFAULT")
+
+    op.execute(f"INSERT INTO {table}_partitioned SELECT * FROM {table}")
+    op.execute(f"DROP TABLE {table} CASCADE")
+    op.execute(f"ALTER TABLE {table}_partitioned RENAME TO {table}")
+
+    create_indexes(table, indexes)
+
+
+def unpartition(table: str) -> None:
+    indexes = retrieve_indexes(table)
+
+    op.execute(f"CREATE TABLE {table}_unpartitioned (LIKE {table} INCLUDING ALL EXCLUDING INDEXES)")
+    op.execute(f"INSERT INTO {table}_unpartitioned SELECT * FROM {table}")
+    op.execute(f"DROP TABLE {table} CASCADE")
+    op.execute(f"ALTER TABLE {table}_unpartitioned RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+
+    create_indexes(table, indexes)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS application_key ("
+        "job_id integer NOT NULL REFERENCES job (id) ON DELETE CASCADE, "
+        "key varchar NOT NULL, "
+        "application_id uuid NOT NULL, "
+        "PRIMARY KEY (job_id, key))"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_application_key_application_id ON application_key (application_id)")
+
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("application")}
+
+    for column in ("email_key", "phone_key"):
+        if column in columns:
+            op.execute(
+                f"INSERT INTO application_key (job_id, key, application_id) "
+                f"SELECT job_id, '{column.removesuffix('_key')}:' || {column}, id FROM application "
+                f"WHERE job_id IS NOT NULL AND {column} IS NOT NULL ON CONFLICT DO NOTHING"
+            )
+
+    op.execute("DROP INDEX IF EXISTS uq_application_job_id_email_key")
+    op.execute("DROP INDEX IF EXISTS uq_application_job_id_phone_key")
+    op.execute("ALTER TABLE application DROP COLUMN IF EXISTS email_key, DROP COLUMN IF EXISTS phone_key")
+
+    op.execute("ALTER TABLE evaluation ADD COLUMN IF NOT EXISTS created_at double precision")
+    op.execute(
+        "UPDATE evaluation SET created_at = coalesce("
+        "(SELECT application.created_at FROM application WHERE application.id = evaluation.application_id), "
+        "extract(epoch from now())) WHERE created_at IS NULL"
+    )
+
+    drop_foreign_keys_to(["application", "applicant", "evaluation"])
+
+    for table in ("application", "applicant", "evaluation"):
+        partition(table)
+
+    op.execute("ALTER TABLE application ADD FOREIGN KEY (job_id) REFERENCES job (id) ON DELETE CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table in ("application", "applicant", "evaluation"):
+        unpartition(table)
+
+    for table, column, referenced in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) REFERENCES {referenced} (id) ON DELETE CASCADE")
@@ -0,0 +1,49 @@
+"""add application overall score
+
+Copies the overall score of the evaluation onto application and indexes it per job, so the ranking is
+an ordered range scan of one index. Databases created by SQLModel.metadata.create_all after the column
+was added already have both, so they are only added when missing.
+
+Revision ID: 5c7e2b9d4f1a
+Revises: 8b1d4e6f2a9c
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c7e2b9d4f1a"
+down_revision: Union[str, Sequence[str], None] = "8b1d4e6f2a9c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE application ADD COLUMN IF NOT EXISTS overall_score double precision")
+
+    # create_evaluations replaces the evaluation of an application, so each one has at most one
+    op.execute(
+        "UPDATE application SET overall_score = evaluation.overall_score FROM evaluation "
+        "WHERE evaluation.application_id = application.id AND application.overall_score IS NULL"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_application_job_id_overall_score_id "
+        "ON application (job_id, overall_score DESC, id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_application_job_id_overall_score_id")
+    op.execute("ALTER TABLE application DROP COLUMN IF EXISTS overall_score")
@@ -0,0 +1,48 @@
+"""add job search vector
+
+Adds the generated tsvector column job search ranks on, weighting the title over the department over
+the description, and the GIN index that matches it. Databases created while the column came from an
+after_create listener already have both, so they are only added when missing.
+
+Revision ID: 8b1d4e6f2a9c
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b1d4e6f2a9c"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JOB_SEARCH_CONFIG = "english"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "ALTER TABLE job ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('{JOB_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{JOB_SEARCH_CONFIG}', coalesce(department, '')), 'B') || "
+        f"setweight(to_tsvector('{JOB_SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+        ") STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_job_search_vector ON job USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_job_search_vector")
+    op.execute("ALTER TABLE job DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,54 @@
+"""scope company invitation email by company
+
+company_invitation.email was unique across all companies. It becomes unique per company, the conflict
+target of the batch invitation upsert. Rows repeating a (company_id, email) pair are deleted first,
+keeping the most recently updated one.
+
+The downgrade restores the global constraint, which fails while several companies invite the same
+address.
+
+Revision ID: a4d8e1c7b3f2
+Revises: 3f9c2a7d1b4e
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d8e1c7b3f2"
+down_revision: Union[str, Sequence[str], None] = "3f9c2a7d1b4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "DELETE FROM company_invitation WHERE id IN ("
+        "SELECT id FROM ("
+        "SELECT id, row_number() OVER ("
+        "PARTITION BY company_id, email ORDER BY updated_at DESC NULLS LAST, id DESC"
+        ") AS position FROM company_invitation"
+        ") AS ranked WHERE position > 1)"
+    )
+    op.execute("ALTER TABLE company_invitation DROP CONSTRAINT IF EXISTS company_invitation_email_key")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_company_invitation_company_id_email "
+        "ON company_invitation (company_id, email)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS uq_company_invitation_company_id_email")
+    op.execute("ALTER TABLE company_invitation ADD CONSTRAINT company_invitation_email_key UNIQUE (email)")
@@ -0,0 +1,62 @@
+"""add job location geohash
+
+Adds the geohash radius searches narrow job locations by, its B-tree index, and backfills it for the
+locations that already have coordinates, so they match radius searches too. Locations are encoded in
+batches with the same encoder the job service uses.
+
+Revision ID: b7e3f5a9c1d6
+Revises: a4d8e1c7b3f2
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.talentgate.job import geohash
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3f5a9c1d6"
+down_revision: Union[str, Sequence[str], None] = "a4d8e1c7b3f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE job_location ADD COLUMN IF NOT EXISTS geohash varchar")
+
+    bind = op.get_bind()
+    select_locations = sa.text(
+        "SELECT id, latitude, longitude FROM job_location "
+        "WHERE id > :after AND geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL "
+        "ORDER BY id LIMIT :limit"
+    )
+    update_location = sa.text("UPDATE job_location SET geohash = :geohash WHERE id = :id")
+    after = 0
+
+    while locations := bind.execute(select_locations, {"after": after, "limit": BATCH_SIZE}).all():
+        bind.execute(
+            update_location,
+            [{"id": id_, "geohash": geohash.encode(latitude, longitude)} for id_, latitude, longitude in locations],
+        )
+        after = locations[-1].id
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_job_location_geohash ON job_location (geohash)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_job_location_geohash")
+    op.execute("ALTER TABLE job_location DROP COLUMN IF EXISTS geohash")
@@ -0,0 +1,37 @@
+"""add company jobs version
+
+Adds the version job facets are cached under, bumped by every job write of the company. Existing
+companies start at 0.
+
+Revision ID: c2f6a8d4e0b9
+Revises: b7e3f5a9c1d6
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2f6a8d4e0b9"
+down_revision: Union[str, Sequence[str], None] = "b7e3f5a9c1d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE company ADD COLUMN IF NOT EXISTS jobs_version integer DEFAULT 0 NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE company DROP COLUMN IF EXISTS jobs_version")
@@ -0,0 +1,45 @@
+"""add application status changed at
+
+Adds the time an application entered its status, which the analytics summaries average time in stage
+over. Existing applications get the time they were last updated, the closest known. updated_at is
+filled from created_at where missing, and indexed together with job_id so that the analytics refresh
+finds the jobs with changed applications from the index alone instead of scanning every partition.
+
+Revision ID: d9a1c3e5f7b2
+Revises: c2f6a8d4e0b9
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d9a1c3e5f7b2"
+down_revision: Union[str, Sequence[str], None] = "c2f6a8d4e0b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE application ADD COLUMN IF NOT EXISTS status_changed_at double precision")
+    op.execute("UPDATE application SET updated_at = created_at WHERE updated_at IS NULL")
+    op.execute(
+        "UPDATE application SET status_changed_at = coalesce(updated_at, created_at) WHERE status_changed_at IS NULL"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_application_updated_at_job_id ON application (updated_at, job_id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_application_updated_at_job_id")
+    op.execute("ALTER TABLE application DROP COLUMN IF EXISTS status_changed_at")
@@ -0,0 +1,146 @@
+import re
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+# tables range partitioned by month on their created_at epoch, see the alembic revision that converts them
+PARTITIONED_TABLES = ("application", "applicant", "evaluation")
+
+PARTITION_NAME = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def month_start(timestamp: float) -> datetime:
+    moment = datetime.fromtimestamp(timestamp, UTC)
+    return datetime(moment.year, moment.month, 1, tzinfo=UTC)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return datetime(year, month_index + 1, 1, tzinfo=UTC)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    match = PARTITION_NAME.search(name)
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=UTC) if match else None
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+async def create_partitions(*, sqlmodel_session: Session, table: str, start: datetime, months: int) -> list[str]:
+    """
+    Create the monthly partitions of a table from start on that do not exist yet, the caller commits.
+
+    Postgres refuses a partition whose range already has rows in the default partition, so for such a
+    month the default partition is detached, the rows are moved into the new partition and the default
+    partition is attached again, all in the caller's transaction.
+    """
+    existing = set(await retrieve_partitions(sqlmodel_session=sqlmodel_session, table=table))
+    default = default_partition_name(table)
+    names = []
+
+    for offset in range(months):
+        month = add_months(start, offset)
+        name = partition_name(table, month)
+        bounds = {"start": month.timestamp(), "end": add_months(month, 1).timestamp()}
+        names.append(name)
+
+        if name in existing:
+            continue
+
+        # the table names come from PARTITIONED_TABLES, the bounds are bound parameters
+        in_range = "created_at >= :start AND created_at < :end"
+        defaulted = (
+            default in existing
+            and sqlmodel_session.execute(
+                text(f"SELECT EXISTS (SELECT FROM {default} WHERE {in_range})"),  # noqa: S608
+                bounds,
+            ).scalar()
+        )
+
+        if defaulted:
+            sqlmodel_session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+
+        sqlmodel_session.execute(
+            text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM ({bounds['start']}) TO ({bounds['end']})")
+        )
+
+        if defaulted:
+            moved = text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_range}")  # noqa: S608
+            sqlmodel_session.execute(moved, bounds)
+            sqlmodel_session.execute(text(f"DELETE FROM {default} WHERE {in_range}"), bounds)  # noqa: S608
+            sqlmodel_session.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+    return names
+
+
+async def retrieve_partitions(*, sqlmodel_session: Session, table: str) -> list[str]:
+    statement = text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table ORDER BY child.relname"
+    )
+
+    return list(sqlmodel_session.execute(statement, {"table": table}).scalars().all())
+
+
+async def detach_partitions(*, sqlmodel_session: Session, table: str, before: datetime) -> list[str]:
+    """
+    Detach the monthly partitions of a table that end on or before the given month, the caller commits.
+
+    Detached partitions are left in place as plain tables, to be archived or dropped separately, and
+    queries on the parent table no longer scan or vacuum them.
+    """
+    names = [
+        name
+        for name in await retrieve_partitions(sqlmodel_session=sqlmodel_session, table=table)
+        if (month := partition_month(name)) is not None and add_months(month, 1) <= before
+    ]
+
+    for name in names:
+        sqlmodel_session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+
+    return names
+
+
+async def maintain_partitions(
+    *,
+    sqlmodel_session: Session,
+    now: float,
+    months_ahead: int,
+    retention_months: int,
+) -> dict[str, list[str]]:
+    """
+    Create the partitions for the current and the next months_ahead months of every partitioned table.
+
+    With a positive retention_months, partitions older than that many months are detached too. Each
+    table is committed on its own.
+    """
+    current_month = month_start(now)
+    maintained = {}
+
+    for table in PARTITIONED_TABLES:
+        maintained[table] = await create_partitions(
+            sqlmodel_session=sqlmodel_session,
+            table=table,
+            start=current_month,
+            months=months_ahead + 1,
+        )
+
+        if retention_months > 0:
+            await detach_partitions(
+                sqlmodel_session=sqlmodel_session,
+                table=table,
+                before=add_months(current_month, -retention_months),
+            )
+
+        sqlmodel_session.commit()
+
+    return maintained
@@ -1,11 +1,14 @@
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 from typing import Any
 
 from redis.asyncio import Redis
 from sqlalchemy import Engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import Session, create_engine
 
 from config import get_settings
+from src.talentgate.metrics import service as metrics_service
 
 settings = get_settings()
 
@@ -14,7 +17,9 @@ def get_postgres_connection_string(schema: str, user: str, password: str, host:
     return f"{schema}://{user}:{password}@{host}:{port}/{database}"
 
 
+@lru_cache
 def get_sqlmodel_engine() -> Engine:
+    """One engine per process, so every session shares its connection pool."""
     url = get_postgres_connection_string(
         schema=settings.postgres_schema,
         user=settings.postgres_user,
@@ -23,7 +28,16 @@ def get_sqlmodel_engine() -> Engine:
         port=settings.postgres_port,
         database=settings.postgres_db,
     )
-    return create_engine(url=url, echo=True)
+    engine = create_engine(url=url, echo=True, poolclass=metrics_service.InstrumentedQueuePool)
+    metrics_service.instrument_engine(engine)
+    return engine
+
+
+def dialect_insert(sqlmodel_session: Session, table: Any) -> Any:  # noqa: ANN401
+    """INSERT of the session dialect, which supports on_conflict_do_nothing and on_conflict_do_update."""
+    if sqlmodel_session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
 
 
 async def get_sqlmodel_session() -> AsyncGenerator[Session, Any]:
@@ -33,7 +47,7 @@ async def get_sqlmodel_session() -> AsyncGenerator[Session, Any]:
 
 
 async def get_redis_client() -> AsyncGenerator[Redis, Any]:
-    yield Redis(
+    yield metrics_service.InstrumentedRedis(
         host=settings.redis_host,
         port=settings.redis_port,
         username=settings.redis_username,
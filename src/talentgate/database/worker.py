@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from datetime import UTC, datetime
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from config import get_settings
+from src.talentgate.database import partition
+from src.talentgate.database.service import get_sqlmodel_engine
+from src.talentgate.metrics import service as metrics_service
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+async def run() -> None:
+    if settings.metrics_worker_port:
+        metrics_service.start_http_server(port=settings.metrics_worker_port)
+
+    engine = get_sqlmodel_engine()
+
+    if engine.dialect.name != "postgresql":
+        logger.warning("Partition maintenance requires postgres")
+        return
+
+    while True:
+        try:
+            with Session(engine, autocommit=False, autoflush=False) as sqlmodel_session:
+                await partition.maintain_partitions(
+                    sqlmodel_session=sqlmodel_session,
+                    now=datetime.now(UTC).timestamp(),
+                    months_ahead=settings.partition_months_ahead,
+                    retention_months=settings.partition_retention_months,
+                )
+        except SQLAlchemyError:
+            logger.exception("Failed to maintain the partitions")
+        else:
+            logger.info("Maintained the partitions of %s", ", ".join(partition.PARTITIONED_TABLES))
+
+        await asyncio.sleep(settings.partition_maintenance_interval)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
@@ -1,18 +1,215 @@
 import smtplib
+import threading
+import time
+from collections import deque
 from collections.abc import Sequence
 from email.message import EmailMessage
+from functools import lru_cache
+from queue import Empty, LifoQueue
 
 from config import get_settings
+from src.talentgate.metrics import service as metrics_service
 
 settings = get_settings()
 
 
+class RateLimiter:
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+
+
+_rate_limiters: dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host: str, rate: float) -> RateLimiter:
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = RateLimiter(rate=rate)
+        return _rate_limiters[host]
+
+
+class EmailClientMetrics:
+    def __init__(self, window: int = 1000) -> None:
+        self.sent = 0
+        self.failed = 0
+        self.connections = 0
+        self.reconnects = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def observe(self, latency: float, *, failed: bool = False) -> None:
+        with self.lock:
+            if failed:
+                self.failed += 1
+            else:
+                self.sent += 1
+            self.latencies.append(latency)
+
+    def connected(self, *, reconnect: bool = False) -> None:
+        with self.lock:
+            self.connections += 1
+            if reconnect:
+                self.reconnects += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            latencies = sorted(self.latencies)
+            counters = {
+                "sent": self.sent,
+                "failed": self.failed,
+                "connections": self.connections,
+                "reconnects": self.reconnects,
+            }
+
+        def percentile(q: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            **counters,
+            "latency_p50": percentile(0.50),
+            "latency_p95": percentile(0.95),
+            "latency_p99": percentile(0.99),
+        }
+
+
+class SMTPConnection:
+    def __init__(self, server: smtplib.SMTP) -> None:
+        self.server = server
+        self.messages = 0
+        self.used_at = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+
+
 class EmailClient:
-    def __init__(self, host: str, port: int, user: str, password: str) -> None:
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        pool_size: int = 4,
+        max_messages: int = 100,
+        keepalive: float = 30.0,
+        rate_limit: float = 0.0,
+        timeout: float = 30.0,
+    ) -> None:
         self.host = host
         self.port = port
         self.user = user
         self.password = password
+        self.max_messages = max_messages
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.rate_limiter = get_rate_limiter(host=host, rate=rate_limit)
+        self.metrics = EmailClientMetrics()
+        self.slots = threading.BoundedSemaphore(pool_size)
+        self.idle: LifoQueue[SMTPConnection] = LifoQueue(maxsize=pool_size)
+
+    def connect(self, *, reconnect: bool = False) -> SMTPConnection:
+        with metrics_service.observe("smtp", "connect"):
+            server = smtplib.SMTP(host=self.host, port=self.port, timeout=self.timeout)
+            server.starttls()
+            server.login(user=self.user, password=self.password)
+        self.metrics.connected(reconnect=reconnect)
+        return SMTPConnection(server=server)
+
+    def is_healthy(self, connection: SMTPConnection) -> bool:
+        if connection.messages >= self.max_messages:
+            return False
+
+        if time.monotonic() - connection.used_at < self.keepalive:
+            return True
+
+        try:
+            status, _ = connection.server.noop()
+        except (smtplib.SMTPException, OSError):
+            return False
+
+        return status == 250  # noqa: PLR2004
+
+    def checkout(self) -> SMTPConnection:
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except Empty:
+                return self.connect()
+
+            if self.is_healthy(connection):
+                return connection
+
+            connection.close()
+
+    def checkin(self, connection: SMTPConnection) -> None:
+        connection.used_at = time.monotonic()
+        self.idle.put_nowait(connection)
+
+    def send(self, connection: SMTPConnection, msg: EmailMessage) -> SMTPConnection:
+        self.rate_limiter.acquire()
+        started_at = time.perf_counter()
+
+        try:
+            with metrics_service.observe("smtp", "send_message"):
+                connection.server.send_message(msg=msg)
+        except smtplib.SMTPServerDisconnected:
+            connection.server.close()
+            connection = self.connect(reconnect=True)
+            with metrics_service.observe("smtp", "send_message"):
+                connection.server.send_message(msg=msg)
+        except smtplib.SMTPException:
+            self.metrics.observe(time.perf_counter() - started_at, failed=True)
+            raise
+
+        self.metrics.observe(time.perf_counter() - started_at)
+        connection.messages += 1
+        return connection
+
+    def send_messages(self, messages: Sequence[EmailMessage]) -> None:
+        if not messages:
+            return
+
+        with self.slots:
+            connection = self.checkout()
+            try:
+                for msg in messages:
+                    if connection.messages >= self.max_messages:
+                        connection.close()
+                        connection = self.connect()
+                    connection = self.send(connection, msg)
+            except BaseException:
+                connection.close()
+                raise
+            self.checkin(connection)
 
     def send_email(
         self,
@@ -29,16 +226,25 @@ class EmailClient:
         msg.set_content(body)
         msg.add_alternative(html, subtype="html")
 
-        with smtplib.SMTP(host=self.host, port=self.port) as server:
-            server.starttls()
-            server.login(user=self.user, password=self.password)
-            server.send_message(msg=msg, from_addr=from_addr, to_addrs=to_addrs)
+        self.send_messages([msg])
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except Empty:
+                return
 
 
+@lru_cache
 def get_email_client() -> EmailClient:
     return EmailClient(
         host=settings.smtp_host,
         port=settings.smtp_port,
         user=settings.smtp_user,
         password=settings.smtp_password,
+        pool_size=settings.smtp_pool_size,
+        max_messages=settings.smtp_max_messages_per_connection,
+        keepalive=settings.smtp_keepalive,
+        rate_limit=settings.smtp_rate_limit,
     )
@@ -0,0 +1,40 @@
+from datetime import UTC, datetime
+
+from sqlmodel import Field, SQLModel
+
+from src.talentgate.database.models import BaseModel
+from src.talentgate.email.enums import EmailOutboxStatus
+
+
+class EmailOutbox(SQLModel, table=True):
+    __tablename__ = "email_outbox"
+
+    id: int | None = Field(default=None, primary_key=True)
+    subject: str
+    body: str | None = Field(default=None)
+    html: str | None = Field(default=None)
+    from_addr: str | None = Field(default=None)
+    to_addrs: str
+    status: str = Field(default=EmailOutboxStatus.PENDING.value, index=True)
+    attempts: int = Field(default=0)
+    last_error: str | None = Field(default=None)
+    available_at: float = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+        index=True,
+    )
+    sent_at: float | None = Field(default=None)
+    created_at: float = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+    )
+    updated_at: float = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+        sa_column_kwargs={"onupdate": lambda: datetime.now(UTC).timestamp()},
+    )
+
+
+class CreateEmailOutbox(BaseModel):
+    subject: str
+    body: str | None = None
+    html: str | None = None
+    from_addr: str | None = None
+    to_addrs: str
@@ -1,7 +1,12 @@
 from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, select
 
 from config import get_settings
-from src.talentgate.email.client import EmailClient
+from src.talentgate.email.enums import EmailOutboxStatus
+from src.talentgate.email.models import CreateEmailOutbox, EmailOutbox
 
 settings = get_settings()
 
@@ -11,16 +16,84 @@ def load_template(file: str) -> str:
         return f.read()
 
 
-def send_email(
-    email_client: EmailClient,
-    subject: str | None = None,
-    body: str | None = None,
-    html: str | None = None,
-    context: dict | None = None,
+async def enqueue_email(
+    *,
+    sqlmodel_session: Session,
+    subject: str,
+    body: str,
+    html: str,
+    context: dict,
     from_addr: str | None = None,
-    to_addrs: str | Sequence[str] | None = None,
-) -> None:
-    body = body.format(**context)
-    html = html.format(**context)
+    to_addrs: str | Sequence[str],
+) -> EmailOutbox:
+    """Stage one email rendered with its context, the caller commits it together with the write it belongs to."""
+    email = CreateEmailOutbox(
+        subject=subject,
+        body=body.format(**context),
+        html=html.format(**context),
+        from_addr=from_addr,
+        to_addrs=to_addrs if isinstance(to_addrs, str) else ", ".join(to_addrs),
+    )
+
+    created_email = EmailOutbox(**email.model_dump())
+
+    sqlmodel_session.add(created_email)
+    sqlmodel_session.flush()
+
+    return created_email
+
+
+def enqueue_emails(*, sqlmodel_session: Session, emails: Sequence[CreateEmailOutbox]) -> None:
+    """Stage many already rendered emails in one multi-row insert, the caller commits."""
+    if not emails:
+        return
+
+    now = datetime.now(UTC).timestamp()
+
+    sqlmodel_session.execute(
+        insert(EmailOutbox),
+        [{**email.model_dump(), "available_at": now, "created_at": now, "updated_at": now} for email in emails],
+    )
+
+
+async def retrieve_pending_emails(*, sqlmodel_session: Session, limit: int) -> list[EmailOutbox]:
+    statement = (
+        select(EmailOutbox)
+        .where(EmailOutbox.status == EmailOutboxStatus.PENDING.value)
+        .where(EmailOutbox.available_at <= datetime.now(UTC).timestamp())
+        .order_by(EmailOutbox.available_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+    return list(sqlmodel_session.exec(statement).all())
+
+
+async def count_pending_emails(*, sqlmodel_session: Session) -> int:
+    statement = (
+        select(func.count()).select_from(EmailOutbox).where(EmailOutbox.status == EmailOutboxStatus.PENDING.value)
+    )
+
+    return sqlmodel_session.exec(statement).one()
+
+
+def mark_email_sent(retrieved_email: EmailOutbox) -> EmailOutbox:
+    retrieved_email.status = EmailOutboxStatus.SENT.value
+    retrieved_email.attempts += 1
+    retrieved_email.last_error = None
+    retrieved_email.sent_at = datetime.now(UTC).timestamp()
+
+    return retrieved_email
+
+
+def mark_email_failed(retrieved_email: EmailOutbox, error: str, max_attempts: int, backoff: float) -> EmailOutbox:
+    retrieved_email.attempts += 1
+    retrieved_email.last_error = error
+
+    if retrieved_email.attempts >= max_attempts:
+        retrieved_email.status = EmailOutboxStatus.FAILED.value
+    else:
+        delay = backoff * 2 ** (retrieved_email.attempts - 1)
+        retrieved_email.available_at = datetime.now(UTC).timestamp() + delay
 
-    email_client.send_email(subject=subject, body=body, html=html, from_addr=from_addr, to_addrs=to_addrs)
+    return retrieved_email
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import smtplib
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, SQLModel
+
+from config import get_settings
+from src.talentgate.database.service import get_sqlmodel_engine
+from src.talentgate.email import service as email_service
+from src.talentgate.email.client import EmailClient, get_email_client
+from src.talentgate.email.models import EmailOutbox
+from src.talentgate.metrics import service as metrics_service
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+async def send_outbox_email(*, email_client: EmailClient, retrieved_email: EmailOutbox) -> tuple[str | None, bool]:
+    """Send one email, and tell the error it failed with, if any, and whether sending it again may succeed."""
+    try:
+        await asyncio.to_thread(
+            email_client.send_email,
+            subject=retrieved_email.subject,
+            body=retrieved_email.body,
+            html=retrieved_email.html,
+            from_addr=retrieved_email.from_addr,
+            to_addrs=retrieved_email.to_addrs,
+        )
+    except (smtplib.SMTPException, OSError) as exc:
+        logger.warning("Failed to send email %s: %s", retrieved_email.id, exc)
+        return str(exc), True
+    except Exception as exc:
+        # a message that cannot even be built fails the same way every time
+        logger.exception("Failed to build email %s", retrieved_email.id)
+        return str(exc), False
+
+    return None, False
+
+
+async def process_outbox(*, sqlmodel_session: Session, email_client: EmailClient, batch_size: int) -> int:
+    """
+    Send one batch of pending emails, keeping the rows locked until their status is committed.
+
+    The status of every email is written in its own savepoint, so a row that cannot be updated is
+    logged and left pending while the rest of the batch is committed. The pending gauge is counted
+    afterwards, so scrapes of /metrics never query the outbox.
+    """
+    retrieved_emails = await email_service.retrieve_pending_emails(sqlmodel_session=sqlmodel_session, limit=batch_size)
+
+    for retrieved_email in retrieved_emails:
+        error, retry = await send_outbox_email(email_client=email_client, retrieved_email=retrieved_email)
+
+        try:
+            with sqlmodel_session.begin_nested():
+                if error is None:
+                    email_service.mark_email_sent(retrieved_email)
+                else:
+                    email_service.mark_email_failed(
+                        retrieved_email,
+                        error=error,
+                        max_attempts=settings.email_outbox_max_attempts if retry else 0,
+                        backoff=settings.email_outbox_retry_backoff,
+                    )
+
+                sqlmodel_session.add(retrieved_email)
+        except SQLAlchemyError:
+            logger.exception("Failed to update email %s", retrieved_email.id)
+
+    sqlmodel_session.commit()
+
+    metrics_service.EMAIL_OUTBOX_PENDING.set(
+        await email_service.count_pending_emails(sqlmodel_session=sqlmodel_session)
+    )
+
+    return len(retrieved_emails)
+
+
+async def run() -> None:
+    if settings.metrics_worker_port:
+        metrics_service.start_http_server(port=settings.metrics_worker_port)
+
+    engine = get_sqlmodel_engine()
+    SQLModel.metadata.create_all(engine)
+    email_client = get_email_client()
+
+    try:
+        while True:
+            try:
+                with Session(engine, autocommit=False, autoflush=False) as sqlmodel_session:
+                    processed = await process_outbox(
+                        sqlmodel_session=sqlmodel_session,
+                        email_client=email_client,
+                        batch_size=settings.email_outbox_batch_size,
+                    )
+            except SQLAlchemyError:
+                logger.exception("Failed to process the email outbox")
+                processed = 0
+
+            if processed < settings.email_outbox_batch_size:
+                await asyncio.sleep(settings.email_outbox_poll_interval)
+    finally:
+        email_client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
@@ -20,3 +20,8 @@ class JobSalaryFrequency(StrEnum):
     WEEKLY = "weekly"
     MONTHLY = "monthly"
     YEARLY = "yearly"
+
+
+class JobImportFormat(StrEnum):
+    CSV = "csv"
+    JSONL = "jsonl"
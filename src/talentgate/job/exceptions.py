@@ -1,7 +1,12 @@
 from fastapi import HTTPException
-from starlette.status import HTTP_404_NOT_FOUND
+from starlette.status import HTTP_404_NOT_FOUND, HTTP_415_UNSUPPORTED_MEDIA_TYPE
 
 IdNotFoundException = HTTPException(
     status_code=HTTP_404_NOT_FOUND,
     detail="Job not found for the provided id.",
 )
+
+UnsupportedImportFormatException = HTTPException(
+    status_code=HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+    detail="Jobs can only be imported from .csv or .jsonl files.",
+)
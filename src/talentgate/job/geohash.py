@@ -0,0 +1,112 @@
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+MAX_PRECISION = 12
+
+# mean earth radius, the haversine distance is accurate to ~0.5% with it
+EARTH_RADIUS = 6371.0088
+
+KILOMETERS_PER_DEGREE = math.pi * EARTH_RADIUS / 180
+
+
+def encode(latitude: float, longitude: float, precision: int = MAX_PRECISION) -> str:
+    latitude_range = [-90.0, 90.0]
+    longitude_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit = 0
+    even = True
+
+    while len(geohash) < precision:
+        value, interval = (longitude, longitude_range) if even else (latitude, latitude_range)
+        middle = (interval[0] + interval[1]) / 2
+
+        if value >= middle:
+            bits = bits << 1 | 1
+            interval[0] = middle
+        else:
+            bits <<= 1
+            interval[1] = middle
+
+        even = not even
+        bit += 1
+
+        if bit == 5:  # noqa: PLR2004
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit = 0
+
+    return "".join(geohash)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """Height and width in degrees of a cell at the given precision."""
+    longitude_bits = math.ceil(precision * 5 / 2)
+    latitude_bits = precision * 5 // 2
+    return 180 / 2**latitude_bits, 360 / 2**longitude_bits
+
+
+def distance(latitude: float, longitude: float, other_latitude: float, other_longitude: float) -> float:
+    """Great-circle distance in kilometers."""
+    d_latitude = math.radians(other_latitude - latitude)
+    d_longitude = math.radians(other_longitude - longitude)
+    a = (
+        math.sin(d_latitude / 2) ** 2
+        + math.cos(math.radians(latitude)) * math.cos(math.radians(other_latitude)) * math.sin(d_longitude / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(min(1.0, a)))
+
+
+def cover(latitude: float, longitude: float, radius: float) -> list[str]:
+    """
+    Geohash cells that together contain every point within radius kilometers.
+
+    Picks the finest precision whose cells are at least radius wide and tall, so the circle never
+    reaches past the eight neighbours of the centre cell. An empty list means the circle is too large
+    to be covered and the caller has to scan.
+    """
+    # cells narrow towards the poles, size them for the poleward edge of the circle
+    edge = min(90.0, abs(latitude) + radius / KILOMETERS_PER_DEGREE)
+
+    precision = 0
+    for candidate in range(1, MAX_PRECISION + 1):
+        height, width = cell_size(candidate)
+        if (
+            height * KILOMETERS_PER_DEGREE < radius
+            or width * KILOMETERS_PER_DEGREE * math.cos(math.radians(edge)) < radius
+        ):
+            break
+        precision = candidate
+
+    if precision == 0:
+        return []
+
+    height, width = cell_size(precision)
+    cells = set()
+
+    for d_latitude in (-height, 0, height):
+        neighbour_latitude = latitude + d_latitude
+
+        if not -90 <= neighbour_latitude <= 90:  # noqa: PLR2004
+            continue
+
+        for d_longitude in (-width, 0, width):
+            neighbour_longitude = (longitude + d_longitude + 180) % 360 - 180
+            cells.add(encode(neighbour_latitude, neighbour_longitude, precision))
+
+    return sorted(cells)
+
+
+def successor(cell: str) -> str | None:
+    """
+    First geohash that sorts after every geohash starting with cell.
+
+    Lets a prefix match run as a plain B-tree range scan, regardless of the column collation.
+    """
+    stripped = cell.rstrip(BASE32[-1])
+
+    if not stripped:
+        return None
+
+    return stripped[:-1] + BASE32[BASE32.index(stripped[-1]) + 1]
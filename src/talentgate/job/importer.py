@@ -0,0 +1,47 @@
+"""
+Import jobs into a company from a CSV or JSONL file without going through the API.
+
+    python -m src.talentgate.job.importer --company-id 1 jobs.csv
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from sqlmodel import Session
+
+from config import get_settings
+from src.talentgate.database.service import get_sqlmodel_engine
+from src.talentgate.job import service as job_service
+from src.talentgate.job.enums import JobImportFormat
+
+settings = get_settings()
+
+
+async def run(path: Path, company_id: int, batch_size: int) -> None:
+    import_format = JobImportFormat.CSV if path.suffix.lower() == ".csv" else JobImportFormat.JSONL
+
+    with path.open(encoding="utf-8", newline="") as lines, Session(get_sqlmodel_engine()) as sqlmodel_session:
+        imported_jobs = await job_service.import_jobs(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company_id,
+            rows=job_service.read_rows(lines, import_format),
+            batch_size=batch_size,
+            max_errors=settings.job_import_max_errors,
+        )
+
+    print(imported_jobs.model_dump_json(indent=2))  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, help="a .csv or .jsonl file")
+    parser.add_argument("--company-id", type=int, required=True, help="company the jobs are created for")
+    parser.add_argument("--batch-size", type=int, default=settings.job_import_batch_size, help="rows per transaction")
+    args = parser.parse_args()
+
+    asyncio.run(run(path=args.path, company_id=args.company_id, batch_size=args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,7 @@ class JobLocation(SQLModel, table=True):
     type: str | None = Field(default=None)
     latitude: float | None = Field(default=None)
     longitude: float | None = Field(default=None)
+    geohash: str | None = Field(default=None, index=True)
     address: JobLocationAddress | None = Relationship(back_populates="location", cascade_delete=True)
     job_id: int | None = Field(default=None, foreign_key="job.id", ondelete="CASCADE")
     job: Optional["Job"] = Relationship(back_populates="location")
@@ -76,6 +77,10 @@ class Job(SQLModel, table=True):
     )
 
 
+# the generated search_vector column and its GIN index are added by the 8b1d4e6f2a9c alembic revision
+JOB_SEARCH_CONFIG = "english"
+
+
 class CreateJobLocationAddress(BaseModel):
     unit: str | None = None
     street: str | None = None
@@ -209,11 +214,38 @@ class UpdatedSalary(BaseModel):
 class JobQueryParameters(SQLModel):
     offset: int | None = None
     limit: int | None = None
+    q: str | None = None
+    latitude: float | None = Field(default=None, ge=-90, le=90)
+    longitude: float | None = Field(default=None, ge=-180, le=180)
+    radius: float | None = Field(default=None, gt=0)
     title: str | None = None
     department: str | None = None
     employment_type: str | None = None
 
 
+class JobFacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class JobFacets(BaseModel):
+    department: list[JobFacetCount] | None = None
+    employment_type: list[JobFacetCount] | None = None
+    location_type: list[JobFacetCount] | None = None
+    currency: list[JobFacetCount] | None = None
+
+
+class JobImportError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportedJobs(BaseModel):
+    created: int = 0
+    failed: int = 0
+    errors: list[JobImportError] | None = None
+
+
 class CreateJob(BaseModel):
     title: str | None = None
     description: str | None = None
@@ -243,6 +275,8 @@ class RetrievedJob(BaseModel):
     employment_type: str | None = None
     location: CreateJobLocation | None = None
     salary: CreateSalary | None = None
+    headline: str | None = None
+    distance: float | None = None
     created_at: float | None = None
     updated_at: float | None = None
 
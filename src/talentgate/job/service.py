@@ -1,24 +1,49 @@
-from collections.abc import Sequence
+import csv
+import hashlib
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import UTC, datetime
 from typing import Any
 
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from sqlalchemy import and_, func, insert, literal, literal_column, null, or_, union_all
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import update as sqlalchemy_update
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
+from config import get_settings
+from src.talentgate.application.models import Application
 from src.talentgate.company.models import Company
+from src.talentgate.counter import service as counter_service
+from src.talentgate.counter.enums import CompanyCounterName, CounterScope
+from src.talentgate.job import geohash
+from src.talentgate.job.enums import JobImportFormat
 from src.talentgate.job.models import (
+    JOB_SEARCH_CONFIG,
     CreateJob,
     CreateJobLocation,
     CreateJobLocationAddress,
     CreateSalary,
+    ImportedJobs,
     Job,
+    JobFacetCount,
+    JobFacets,
+    JobImportError,
     JobLocation,
     JobLocationAddress,
     JobQueryParameters,
     JobSalary,
+    RetrievedJob,
     UpdateJob,
     UpdateJobLocation,
     UpdateJobLocationAddress,
     UpdateSalary,
 )
+from src.talentgate.skill.models import ApplicantSkill
+
+settings = get_settings()
 
 
 async def create_location_address(
@@ -84,6 +109,9 @@ async def create_location(
         job_id=job_id,
     )
 
+    if created_location.latitude is not None and created_location.longitude is not None:
+        created_location.geohash = geohash.encode(created_location.latitude, created_location.longitude)
+
     if "address" in location.model_fields_set and location.address is not None:
         created_location.address = await create_location_address(
             sqlmodel_session=sqlmodel_session, location_id=created_location.id, address=location.address
@@ -134,6 +162,9 @@ async def update_location(
         ),
     )
 
+    if retrieved_location.latitude is not None and retrieved_location.longitude is not None:
+        retrieved_location.geohash = geohash.encode(retrieved_location.latitude, retrieved_location.longitude)
+
     sqlmodel_session.add(retrieved_location)
     sqlmodel_session.commit()
     sqlmodel_session.refresh(retrieved_location)
@@ -204,6 +235,15 @@ async def create(*, sqlmodel_session: Session, company_id: int, job: CreateJob)
             sqlmodel_session=sqlmodel_session, job_id=created_job.id, salary=job.salary
         )
 
+    increment_jobs_version(sqlmodel_session=sqlmodel_session, company_id=company_id)
+
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=company_id,
+        name=CompanyCounterName.JOBS.value,
+    )
+
     sqlmodel_session.add(created_job)
     sqlmodel_session.commit()
     sqlmodel_session.refresh(created_job)
@@ -211,12 +251,33 @@ async def create(*, sqlmodel_session: Session, company_id: int, job: CreateJob)
     return created_job
 
 
+def select_created_at(job_id: int) -> Any:  # noqa: ANN401
+    """
+    Creation time of a job as a scalar subquery.
+
+    Nothing that belongs to a job is older than the job, so bounding the created_at of its applications,
+    applicants and evaluations by it lets postgres skip their monthly partitions from before the job.
+    """
+    return select(Job.created_at).where(Job.id == job_id).scalar_subquery()
+
+
 async def retrieve_by_id(*, sqlmodel_session: Session, company_id: int, job_id: int) -> Job:
-    statement: Any = select(Job).where(Company.id == company_id, Job.id == job_id)
+    statement: Any = select(Job).where(Job.company_id == company_id, Job.id == job_id)
 
     return sqlmodel_session.exec(statement).one_or_none()
 
 
+def filter_by_query_parameters(query_parameters: JobQueryParameters) -> set:
+    return {
+        Job.__table__.columns[attr] == value
+        for attr, value in query_parameters.model_dump(
+            exclude={"offset", "limit", "q", "latitude", "longitude", "radius"},
+            exclude_unset=True,
+            exclude_none=True,
+        ).items()
+    }
+
+
 async def retrieve_by_query_parameters(
     *,
     sqlmodel_session: Session,
@@ -226,19 +287,11 @@ async def retrieve_by_query_parameters(
     offset = query_parameters.offset
     limit = query_parameters.limit
 
-    filters = {
-        Job.__table__.columns[attr] == value
-        for attr, value in query_parameters.model_dump(
-            exclude={"offset", "limit"},
-            exclude_unset=True,
-            exclude_none=True,
-        )
-    }
+    filters = filter_by_query_parameters(query_parameters=query_parameters)
 
     statement: Any = (
         select(Job)
-        .join(JobLocation)
-        .join(JobSalary)
+        .options(selectinload(Job.location), selectinload(Job.salary))
         .where(Job.company_id == company_id, *filters)
         .order_by(Job.id)
         .offset(offset)
@@ -248,6 +301,274 @@ async def retrieve_by_query_parameters(
     return sqlmodel_session.exec(statement).all()
 
 
+def filter_by_search_query(*, dialect: str, q: str) -> set:
+    if dialect == "postgresql":
+        return {literal_column("job.search_vector").op("@@")(func.websearch_to_tsquery(JOB_SEARCH_CONFIG, q))}
+
+    return {
+        or_(Job.title.ilike(f"%{term}%"), Job.department.ilike(f"%{term}%"), Job.description.ilike(f"%{term}%"))
+        for term in q.split()
+    }
+
+
+async def search_by_query_parameters(
+    *,
+    sqlmodel_session: Session,
+    company_id: int,
+    query_parameters: JobQueryParameters,
+) -> list[RetrievedJob]:
+    """
+    Full-text search over title, department and description, best matches first.
+
+    Postgres matches the generated search_vector column through its GIN index and ranks with ts_rank,
+    other databases fall back to a case-insensitive substring match on every term.
+    """
+    offset = query_parameters.offset
+    limit = query_parameters.limit
+
+    filters = filter_by_query_parameters(query_parameters=query_parameters)
+
+    if sqlmodel_session.get_bind().dialect.name == "postgresql":
+        query = func.websearch_to_tsquery(JOB_SEARCH_CONFIG, query_parameters.q)
+        search_vector = literal_column("job.search_vector")
+        rank = func.ts_rank(search_vector, query)
+        headline = func.ts_headline(
+            JOB_SEARCH_CONFIG,
+            func.coalesce(Job.description, ""),
+            query,
+            "MaxFragments=2, MaxWords=30, MinWords=10",
+        )
+        statement: Any = (
+            select(Job, headline)
+            .where(Job.company_id == company_id, search_vector.op("@@")(query), *filters)
+            .order_by(rank.desc(), Job.id)
+        )
+    else:
+        terms = filter_by_search_query(dialect="sqlite", q=query_parameters.q)
+        statement: Any = select(Job, null()).where(Job.company_id == company_id, *terms, *filters).order_by(Job.id)
+
+    statement = statement.options(selectinload(Job.location), selectinload(Job.salary)).offset(offset).limit(limit)
+
+    return [
+        RetrievedJob.model_validate(job).model_copy(update={"headline": headline})
+        for job, headline in sqlmodel_session.exec(statement).all()
+    ]
+
+
+def filter_by_geohash_cells(latitude: float, longitude: float, radius: float) -> set:
+    cells = geohash.cover(latitude, longitude, radius)
+
+    if not cells:
+        return set()
+
+    ranges = []
+    for cell in cells:
+        upper = geohash.successor(cell)
+        if upper is None:
+            ranges.append(JobLocation.geohash >= cell)
+        else:
+            ranges.append(and_(JobLocation.geohash >= cell, JobLocation.geohash < upper))
+
+    return {or_(*ranges)}
+
+
+async def retrieve_nearby_by_query_parameters(
+    *,
+    sqlmodel_session: Session,
+    company_id: int,
+    query_parameters: JobQueryParameters,
+) -> list[RetrievedJob]:
+    """
+    Jobs located within radius kilometers of (latitude, longitude), closest first.
+
+    The geohash cells covering the circle narrow the candidates through the B-tree index on
+    job_location.geohash, the exact haversine distance then filters and orders them. Postgres
+    computes the distance in the query, other databases in Python.
+    """
+    offset = query_parameters.offset or 0
+    limit = query_parameters.limit
+    latitude = query_parameters.latitude
+    longitude = query_parameters.longitude
+    radius = query_parameters.radius
+
+    filters = filter_by_query_parameters(query_parameters=query_parameters)
+
+    if radius is not None:
+        filters |= filter_by_geohash_cells(latitude=latitude, longitude=longitude, radius=radius)
+
+    filters |= {
+        Job.company_id == company_id,
+        JobLocation.latitude.is_not(None),
+        JobLocation.longitude.is_not(None),
+    }
+
+    if sqlmodel_session.get_bind().dialect.name == "postgresql":
+        d_latitude = func.radians(JobLocation.latitude - latitude) / 2
+        d_longitude = func.radians(JobLocation.longitude - longitude) / 2
+        a = func.power(func.sin(d_latitude), 2) + func.cos(func.radians(latitude)) * func.cos(
+            func.radians(JobLocation.latitude)
+        ) * func.power(func.sin(d_longitude), 2)
+        distance = 2 * geohash.EARTH_RADIUS * func.asin(func.sqrt(func.least(1.0, a)))
+
+        if radius is not None:
+            filters.add(distance <= radius)
+
+        statement: Any = (
+            select(Job, distance)
+            .join(JobLocation, JobLocation.job_id == Job.id)
+            .options(selectinload(Job.location), selectinload(Job.salary))
+            .where(*filters)
+            .order_by(distance, Job.id)
+            .offset(offset)
+            .limit(limit)
+        )
+
+        nearby_jobs = sqlmodel_session.exec(statement).all()
+    else:
+        statement: Any = (
+            select(Job, JobLocation.latitude, JobLocation.longitude)
+            .join(JobLocation, JobLocation.job_id == Job.id)
+            .options(selectinload(Job.location), selectinload(Job.salary))
+            .where(*filters)
+        )
+
+        nearby_jobs = sorted(
+            (
+                (job, geohash.distance(latitude, longitude, job_latitude, job_longitude))
+                for job, job_latitude, job_longitude in sqlmodel_session.exec(statement).all()
+            ),
+            key=lambda nearby_job: (nearby_job[1], nearby_job[0].id),
+        )
+        nearby_jobs = [nearby_job for nearby_job in nearby_jobs if radius is None or nearby_job[1] <= radius]
+        nearby_jobs = nearby_jobs[offset : None if limit is None else offset + limit]
+
+    return [RetrievedJob.model_validate(job).model_copy(update={"distance": distance}) for job, distance in nearby_jobs]
+
+
+def increment_jobs_version(*, sqlmodel_session: Session, company_id: int) -> None:
+    """Invalidate everything cached for the company jobs, committed together with the job change."""
+    statement: Any = (
+        sqlalchemy_update(Company)
+        .where(Company.id == company_id)
+        .values(jobs_version=Company.jobs_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    sqlmodel_session.exec(statement)
+
+
+async def retrieve_jobs_version(*, sqlmodel_session: Session, company_id: int) -> int | None:
+    statement: Any = select(Company.jobs_version).where(Company.id == company_id)
+
+    return sqlmodel_session.exec(statement).one_or_none()
+
+
+JOB_FACETS = {
+    "department": Job.department,
+    "employment_type": Job.employment_type,
+    "location_type": JobLocation.type,
+    "currency": JobSalary.currency,
+}
+
+
+async def retrieve_facets_by_query_parameters(
+    *,
+    sqlmodel_session: Session,
+    company_id: int,
+    query_parameters: JobQueryParameters,
+) -> JobFacets:
+    """
+    Job counts per department, employment type, location type and salary currency in a single query.
+
+    Postgres groups once by GROUPING SETS and tells the facets apart with GROUPING(), other databases
+    run the same aggregation as a UNION ALL of one GROUP BY per facet.
+    """
+    dialect = sqlmodel_session.get_bind().dialect.name
+
+    filters = filter_by_query_parameters(query_parameters=query_parameters)
+
+    if query_parameters.q:
+        filters |= filter_by_search_query(dialect=dialect, q=query_parameters.q)
+
+    def grouped(*columns: Any) -> Any:  # noqa: ANN401
+        return (
+            select(*columns, func.count(Job.id))
+            .select_from(Job)
+            .outerjoin(JobLocation, JobLocation.job_id == Job.id)
+            .outerjoin(JobSalary, JobSalary.job_id == Job.id)
+            .where(Job.company_id == company_id, *filters)
+        )
+
+    names = list(JOB_FACETS)
+    columns = list(JOB_FACETS.values())
+
+    if dialect == "postgresql":
+        # GROUPING() sets a bit for every column the row is not grouped by, first column highest
+        masks = {(2 ** len(columns) - 1) ^ (1 << (len(columns) - 1 - index)): name for index, name in enumerate(names)}
+        statement: Any = grouped(func.grouping(*columns), *columns).group_by(func.grouping_sets(*columns))
+        rows = [
+            (masks[mask], values[names.index(masks[mask])], count)
+            for mask, *values, count in sqlmodel_session.exec(statement)
+        ]
+    else:
+        statement: Any = union_all(
+            *(grouped(literal(name), column).group_by(column) for name, column in JOB_FACETS.items())
+        )
+        rows = list(sqlmodel_session.exec(statement))
+
+    facets = {name: [] for name in names}
+    for name, value, count in rows:
+        if value is not None:
+            facets[name].append(JobFacetCount(value=value, count=count))
+
+    return JobFacets(
+        **{
+            name: sorted(counts, key=lambda facet_count: (-facet_count.count, facet_count.value))
+            for name, counts in facets.items()
+        }
+    )
+
+
+async def retrieve_cached_facets_by_query_parameters(
+    *,
+    sqlmodel_session: Session,
+    redis_client: Redis,
+    company_id: int,
+    query_parameters: JobQueryParameters,
+) -> JobFacets:
+    """
+    Facet counts cached per company, filter and jobs version.
+
+    Every job change bumps company.jobs_version, so stale entries are never read again and expire on their own.
+    """
+    if settings.job_facets_cache_ttl <= 0:
+        return await retrieve_facets_by_query_parameters(
+            sqlmodel_session=sqlmodel_session, company_id=company_id, query_parameters=query_parameters
+        )
+
+    version = await retrieve_jobs_version(sqlmodel_session=sqlmodel_session, company_id=company_id)
+    digest = hashlib.sha256(
+        query_parameters.model_dump_json(
+            include={"q", "title", "department", "employment_type"},
+            exclude_none=True,
+        ).encode()
+    ).hexdigest()
+    name = f"company:{company_id}:jobs:{version}:facets:{digest}"
+
+    cached_facets = await redis_client.get(name=name)
+
+    if cached_facets:
+        return JobFacets.model_validate_json(cached_facets)
+
+    facets = await retrieve_facets_by_query_parameters(
+        sqlmodel_session=sqlmodel_session, company_id=company_id, query_parameters=query_parameters
+    )
+
+    await redis_client.set(name=name, value=facets.model_dump_json(), ex=settings.job_facets_cache_ttl)
+
+    return facets
+
+
 async def update(
     *,
     sqlmodel_session: Session,
@@ -278,6 +599,8 @@ async def update(
         ),
     )
 
+    increment_jobs_version(sqlmodel_session=sqlmodel_session, company_id=retrieved_job.company_id)
+
     sqlmodel_session.add(retrieved_job)
     sqlmodel_session.commit()
     sqlmodel_session.refresh(retrieved_job)
@@ -286,7 +609,211 @@ async def update(
 
 
 async def delete(*, sqlmodel_session: Session, retrieved_job: Job) -> Job:
+    increment_jobs_version(sqlmodel_session=sqlmodel_session, company_id=retrieved_job.company_id)
+
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=retrieved_job.company_id,
+        name=CompanyCounterName.JOBS.value,
+        amount=-1,
+    )
+
+    counter_service.delete(sqlmodel_session=sqlmodel_session, scope=CounterScope.JOB, scope_ids=[retrieved_job.id])
+
+    # applications cascade through the ORM, their skills have no relationship and no foreign key to cascade through
+    sqlmodel_session.execute(
+        sql_delete(ApplicantSkill).where(
+            ApplicantSkill.application_id.in_(select(Application.id).where(Application.job_id == retrieved_job.id))
+        )
+    )
+
     sqlmodel_session.delete(retrieved_job)
     sqlmodel_session.commit()
 
     return retrieved_job
+
+
+JOB_CSV_COLUMNS = {
+    "title": ("title",),
+    "description": ("description",),
+    "department": ("department",),
+    "employment_type": ("employment_type",),
+    "location_type": ("location", "type"),
+    "latitude": ("location", "latitude"),
+    "longitude": ("location", "longitude"),
+    "unit": ("location", "address", "unit"),
+    "street": ("location", "address", "street"),
+    "city": ("location", "address", "city"),
+    "state": ("location", "address", "state"),
+    "country": ("location", "address", "country"),
+    "postal_code": ("location", "address", "postal_code"),
+    "salary_min": ("salary", "min"),
+    "salary_max": ("salary", "max"),
+    "salary_frequency": ("salary", "frequency"),
+    "salary_currency": ("salary", "currency"),
+}
+
+
+def read_csv_rows(lines: Iterable[str]) -> Iterator[tuple[int, dict | str]]:
+    """Nest every flat CSV row into the shape of CreateJob, columns not in JOB_CSV_COLUMNS are ignored."""
+    reader = csv.DictReader(lines)
+
+    for row in reader:
+        job: dict = {}
+
+        for column, value in row.items():
+            if column not in JOB_CSV_COLUMNS or value is None or not value.strip():
+                continue
+
+            *parents, field = JOB_CSV_COLUMNS[column]
+            node = job
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[field] = value.strip()
+
+        yield reader.line_num, job
+
+
+def read_jsonl_rows(lines: Iterable[str]) -> Iterator[tuple[int, dict | str]]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            job = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"invalid json: {exc}"
+            continue
+
+        yield line_number, job if isinstance(job, dict) else "expected a json object"
+
+
+def read_rows(lines: Iterable[str], import_format: JobImportFormat) -> Iterator[tuple[int, dict | str]]:
+    if import_format == JobImportFormat.CSV:
+        return read_csv_rows(lines)
+    return read_jsonl_rows(lines)
+
+
+def insert_jobs(*, sqlmodel_session: Session, company_id: int, jobs: list[CreateJob]) -> list[int]:
+    """
+    Stage a batch of jobs with their locations, addresses and salaries in four multi-row inserts.
+
+    The RETURNING clauses keep the order of the parameters, which is how generated ids are matched
+    back to the rows that depend on them. The caller commits.
+    """
+    now = datetime.now(UTC).timestamp()
+
+    job_ids = (
+        sqlmodel_session.execute(
+            insert(Job).returning(Job.id, sort_by_parameter_order=True),
+            [
+                {
+                    **job.model_dump(include={"title", "description", "department", "employment_type"}),
+                    "company_id": company_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for job in jobs
+            ],
+        )
+        .scalars()
+        .all()
+    )
+
+    located = [(job_id, job.location) for job_id, job in zip(job_ids, jobs, strict=True) if job.location]
+
+    if located:
+        location_ids = (
+            sqlmodel_session.execute(
+                insert(JobLocation).returning(JobLocation.id, sort_by_parameter_order=True),
+                [
+                    {
+                        **location.model_dump(include={"type", "latitude", "longitude"}),
+                        "geohash": geohash.encode(location.latitude, location.longitude)
+                        if location.latitude is not None and location.longitude is not None
+                        else None,
+                        "job_id": job_id,
+                    }
+                    for job_id, location in located
+                ],
+            )
+            .scalars()
+            .all()
+        )
+
+        addresses = [
+            {**location.address.model_dump(), "location_id": location_id}
+            for location_id, (_, location) in zip(location_ids, located, strict=True)
+            if location.address
+        ]
+
+        if addresses:
+            sqlmodel_session.execute(insert(JobLocationAddress), addresses)
+
+    salaries = [
+        {**job.salary.model_dump(), "job_id": job_id} for job_id, job in zip(job_ids, jobs, strict=True) if job.salary
+    ]
+
+    if salaries:
+        sqlmodel_session.execute(insert(JobSalary), salaries)
+
+    increment_jobs_version(sqlmodel_session=sqlmodel_session, company_id=company_id)
+
+    counter_service.increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=company_id,
+        name=CompanyCounterName.JOBS.value,
+        amount=len(job_ids),
+    )
+
+    return list(job_ids)
+
+
+async def import_jobs(
+    *,
+    sqlmodel_session: Session,
+    company_id: int,
+    rows: Iterable[tuple[int, dict | str]],
+    batch_size: int,
+    max_errors: int,
+) -> ImportedJobs:
+    """
+    Validate rows against CreateJob and insert the valid ones, one transaction per batch.
+
+    Rows are consumed as they are parsed and only one batch is held at a time. Every failed row is
+    counted, the first max_errors are reported with their line number.
+    """
+    imported_jobs = ImportedJobs(errors=[])
+    batch: list[CreateJob] = []
+
+    def fail(line: int, error: str) -> None:
+        imported_jobs.failed += 1
+        if len(imported_jobs.errors) < max_errors:
+            imported_jobs.errors.append(JobImportError(line=line, error=error))
+
+    def flush() -> None:
+        insert_jobs(sqlmodel_session=sqlmodel_session, company_id=company_id, jobs=batch)
+        sqlmodel_session.commit()
+        imported_jobs.created += len(batch)
+        batch.clear()
+
+    for line, row in rows:
+        if isinstance(row, str):
+            fail(line, row)
+            continue
+
+        try:
+            batch.append(CreateJob.model_validate(row))
+        except ValidationError as exc:
+            fail(line, "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()))
+            continue
+
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    return imported_jobs
@@ -1,3 +1,4 @@
+import uuid
 from collections.abc import Sequence
 from io import BytesIO
 from typing import Annotated
@@ -74,7 +75,7 @@ class DeleteJobDependency:
 async def upload_resume(
     *,
     job_id: int,
-    application_id: int,
+    application_id: uuid.UUID,
     file: Annotated[UploadFile, File()],
     settings: Annotated[Settings, Depends(get_settings)],
     minio_client: Annotated[Minio, Depends(get_minio_client)],
@@ -82,17 +83,17 @@ async def upload_resume(
 ) -> None:
     data = await file.read()
 
-    retrieved_application = application_service.retrieve_by_id(
+    retrieved_application = await application_service.retrieve_by_id(
         sqlmodel_session=sqlmodel_session, job_id=job_id, application_id=application_id
     )
 
     if not retrieved_application:
         raise ApplicationIdNotFoundException
 
-    retrieved_resume = application_service.retrieve_resume(
+    retrieved_resume = application_service.load_resume(
         minio_client=minio_client,
         bucket_name=settings.minio_default_bucket,
-        object_name=f"jobs/{job_id}/applications/{application_id}/resume",
+        object_names=[f"jobs/{job_id}/applications/{application_id}/resume"],
     )
 
     if retrieved_resume:
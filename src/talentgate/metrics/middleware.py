@@ -0,0 +1,73 @@
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.talentgate.metrics.service import (
+    BACKGROUND_TASKS_IN_PROGRESS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+
+
+def resolve_route(scope: Scope) -> str:
+    """Path template of the route that will handle the request, which keeps the label cardinality bounded."""
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+
+        if match == Match.FULL:
+            return route.path
+
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Time every request until its last body chunk is sent, per method, route and status.
+
+    Starlette runs the background tasks of a response after sending it, so whatever runs between the
+    last chunk and the application returning is counted as a background task in progress.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = resolve_route(scope)
+        status = 500
+        responded = False
+        started_at = time.perf_counter()
+
+        def finish() -> None:
+            HTTP_REQUEST_DURATION.labels(method=method, route=route, status=status).observe(
+                time.perf_counter() - started_at
+            )
+            HTTP_REQUESTS_IN_PROGRESS.labels(method=method, route=route).dec()
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, responded
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            await send(message)
+
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                responded = True
+                finish()
+                BACKGROUND_TASKS_IN_PROGRESS.labels(route=route).inc()
+
+        HTTP_REQUESTS_IN_PROGRESS.labels(method=method, route=route).inc()
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            if responded:
+                BACKGROUND_TASKS_IN_PROGRESS.labels(route=route).dec()
+            else:
+                finish()
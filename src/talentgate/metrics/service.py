@@ -0,0 +1,188 @@
+import asyncio
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import prometheus_client
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import QueuePool
+
+HTTP_REQUEST_DURATION = Histogram(
+    "talentgate_http_request_duration_seconds",
+    "Time until the last byte of the response is sent.",
+    ["method", "route", "status"],
+)
+
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "talentgate_http_requests_in_progress",
+    "Requests whose response is not sent yet.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+BACKGROUND_TASKS_IN_PROGRESS = Gauge(
+    "talentgate_background_tasks_in_progress",
+    "Sent responses whose background tasks are still queued or running.",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "talentgate_db_pool_checkout_duration_seconds",
+    "Time spent waiting for a connection from the database pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "talentgate_db_pool_connections",
+    "Connections of the database pool, its size and how many are checked out.",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "talentgate_redis_command_duration_seconds",
+    "Round trip time of a Redis command.",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+REDIS_COMMAND_ERRORS = Counter(
+    "talentgate_redis_command_errors",
+    "Redis commands that raised.",
+    ["command"],
+)
+
+EXTERNAL_CALL_DURATION = Histogram(
+    "talentgate_external_call_duration_seconds",
+    "Time of a call to an external service.",
+    ["service", "operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+EXTERNAL_CALL_ERRORS = Counter(
+    "talentgate_external_call_errors",
+    "Calls to an external service that raised.",
+    ["service", "operation"],
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "talentgate_event_loop_lag_seconds",
+    "How late the event loop wakes up from a sleep.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "talentgate_password_hash_queue_depth",
+    "Password hashes queued for or running in the process pool.",
+    multiprocess_mode="livesum",
+)
+
+LOGIN_THROTTLE_EVENTS = Gauge(
+    "talentgate_login_throttle_events",
+    "Login attempts, attempts rejected while locked out and lockouts, counted in Redis and read back on every login.",
+    ["event"],
+    multiprocess_mode="mostrecent",
+)
+
+EMAIL_OUTBOX_PENDING = Gauge(
+    "talentgate_email_outbox_pending",
+    "Emails waiting in the outbox, counted by the email worker after every batch.",
+    multiprocess_mode="mostrecent",
+)
+
+
+def is_multiprocess() -> bool:
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    Registry to expose.
+
+    With PROMETHEUS_MULTIPROC_DIR set every process writes its samples to files in that directory, and
+    a fresh registry merges them per scrape so each uvicorn worker serves the totals of all of them.
+    """
+    if not is_multiprocess():
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_process_dead() -> None:
+    """Drop the live gauges of this process, call it when the process shuts down."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def start_http_server(port: int) -> None:
+    """Serve the metrics of a worker process, which has no application to mount /metrics on."""
+    prometheus_client.start_http_server(port=port, registry=get_registry())
+
+
+@contextmanager
+def observe(service: str, operation: str) -> Iterator[None]:
+    """Time a call to an external service and count it as an error when it raises."""
+    started_at = time.perf_counter()
+
+    try:
+        yield
+    except Exception:
+        EXTERNAL_CALL_ERRORS.labels(service=service, operation=operation).inc()
+        raise
+    finally:
+        EXTERNAL_CALL_DURATION.labels(service=service, operation=operation).observe(time.perf_counter() - started_at)
+
+
+async def monitor_event_loop(interval: float) -> None:
+    """Record how late every sleep of interval seconds returns, until cancelled."""
+    loop = asyncio.get_running_loop()
+
+    while True:
+        started_at = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - started_at - interval))
+
+
+class InstrumentedQueuePool(QueuePool):
+    def _do_get(self) -> Any:  # noqa: ANN401
+        started_at = time.perf_counter()
+
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_DURATION.observe(time.perf_counter() - started_at)
+
+
+def instrument_engine(engine: Engine) -> None:
+    DB_POOL_CONNECTIONS.labels(state="size").set(engine.pool.size())
+
+    def checkout(*_: Any) -> None:  # noqa: ANN401
+        DB_POOL_CONNECTIONS.labels(state="checked_out").inc()
+
+    def checkin(*_: Any) -> None:  # noqa: ANN401
+        DB_POOL_CONNECTIONS.labels(state="checked_out").dec()
+
+    event.listen(engine, "checkout", checkout)
+    event.listen(engine, "checkin", checkin)
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args: Any, **options: Any) -> Any:  # noqa: ANN401
+        command = str(args[0]).upper()
+        started_at = time.perf_counter()
+
+        try:
+            return await super().execute_command(*args, **options)
+        except RedisError:
+            REDIS_COMMAND_ERRORS.labels(command=command).inc()
+            raise
+        finally:
+            REDIS_COMMAND_DURATION.labels(command=command).observe(time.perf_counter() - started_at)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from src.talentgate.metrics import service as metrics_service
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(path="/metrics", status_code=200, include_in_schema=False)
+async def retrieve_metrics() -> Response:
+    return Response(content=generate_latest(metrics_service.get_registry()), media_type=CONTENT_TYPE_LATEST)
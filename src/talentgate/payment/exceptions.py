@@ -1,8 +1,11 @@
 from fastapi import HTTPException
 from starlette.status import (
+    HTTP_401_UNAUTHORIZED,
     HTTP_404_NOT_FOUND,
 )
 
 UserSubscriptionNotFoundException = HTTPException(
     status_code=HTTP_404_NOT_FOUND, detail="User has no active subscription."
 )
+
+InvalidWebhookSignatureException = HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature.")
@@ -1,8 +1,48 @@
+from datetime import UTC, datetime
+
+from sqlmodel import Field, SQLModel
+
 from src.talentgate.database.models import BaseModel
+from src.talentgate.payment.enums import PaymentEventStatus, PaymentTransactionStatus
+
+
+class PaymentTransaction(SQLModel, table=True):
+    __tablename__ = "payment_transaction"
+
+    id: str = Field(primary_key=True)
+    status: str = Field(default=PaymentTransactionStatus.PENDING.value, index=True)
+    user_id: int = Field(foreign_key="user.id", ondelete="CASCADE")
+    created_at: float = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+    )
+    updated_at: float = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+        sa_column_kwargs={"onupdate": lambda: datetime.now(UTC).timestamp()},
+    )
+
+
+class PaymentEvent(SQLModel, table=True):
+    __tablename__ = "payment_event"
+
+    id: str = Field(primary_key=True)
+    type: str
+    payload: str
+    status: str = Field(default=PaymentEventStatus.PENDING.value, index=True)
+    attempts: int = Field(default=0)
+    last_error: str | None = Field(default=None)
+    occurred_at: float | None = Field(default=None)
+    processed_at: float | None = Field(default=None)
+    created_at: float = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+    )
+    updated_at: float = Field(
+        default_factory=lambda: datetime.now(UTC).timestamp(),
+        sa_column_kwargs={"onupdate": lambda: datetime.now(UTC).timestamp()},
+    )
 
 
 class PaymentCheckout(BaseModel):
-    transaction_id: str | None = None
+    transaction_id: str = Field(min_length=1)
 
 
 class RetrievedSubscription(BaseModel):
@@ -1,5 +1,7 @@
-import asyncio
-from datetime import UTC, timedelta
+import json
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
 
 from paddle_billing import Client, Environment, Options
 from paddle_billing.Entities.Shared import (
@@ -13,15 +15,22 @@ from paddle_billing.Entities.Subscriptions import (
     SubscriptionStatus,
 )
 from paddle_billing.Entities.Transaction import Transaction
+from paddle_billing.Notifications import Secret, Verifier
 from paddle_billing.Resources.Products.Operations import ListProducts, ProductIncludes
 from paddle_billing.Resources.Shared.Operations import OrderBy, Pager
 from paddle_billing.Resources.Subscriptions.Operations import CancelSubscription
 from paddle_billing.Resources.Transactions.Operations import ListTransactions
-from sqlmodel import Session
+from requests import RequestException
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
 
 from config import get_settings
+from src.talentgate.metrics import service as metrics_service
+from src.talentgate.payment.enums import PaymentEventStatus, PaymentTransactionStatus
 from src.talentgate.payment.models import (
     Invoice,
+    PaymentEvent,
+    PaymentTransaction,
     RetrievedPrice,
     RetrievedProduct,
     RetrievedSubscription,
@@ -70,9 +79,10 @@ async def retrieve_subscription(
     amount = None
 
     if retrieved_user.subscription.paddle_subscription_id:
-        subscription = paddle_client.subscriptions.get(
-            subscription_id=retrieved_user.subscription.paddle_subscription_id
-        )
+        with metrics_service.observe("paddle", "get_subscription"):
+            subscription = paddle_client.subscriptions.get(
+                subscription_id=retrieved_user.subscription.paddle_subscription_id
+            )
         next_billing_date = subscription.next_billed_at.timestamp()
 
         price = str(int(subscription.items[0].price.unit_price.amount) // 100)
@@ -94,11 +104,14 @@ async def retrieve_subscription(
 async def retrieve_products(
     paddle_client: Client,
 ) -> list[RetrievedProduct]:
-    products = paddle_client.products.list(
-        operation=ListProducts(
-            includes=[ProductIncludes.Prices],
+    with metrics_service.observe("paddle", "list_products"):
+        products = list(
+            paddle_client.products.list(
+                operation=ListProducts(
+                    includes=[ProductIncludes.Prices],
+                )
+            )
         )
-    )
 
     return list(
         reversed(
@@ -147,7 +160,10 @@ async def update_subscription(
 
 
 async def sync_subscription(paddle_client: Client, sqlmodel_session: Session, retrieved_user: User) -> None:
-    subscription = paddle_client.subscriptions.get(subscription_id=retrieved_user.subscription.paddle_subscription_id)
+    with metrics_service.observe("paddle", "get_subscription"):
+        subscription = paddle_client.subscriptions.get(
+            subscription_id=retrieved_user.subscription.paddle_subscription_id
+        )
 
     await update_subscription(
         sqlmodel_session=sqlmodel_session,
@@ -157,10 +173,11 @@ async def sync_subscription(paddle_client: Client, sqlmodel_session: Session, re
 
 
 async def cancel_subscription(paddle_client: Client, sqlmodel_session: Session, retrieved_user: User) -> None:
-    paddle_client.subscriptions.cancel(
-        subscription_id=retrieved_user.subscription.paddle_subscription_id,
-        operation=CancelSubscription(effective_from=SubscriptionEffectiveFrom("next_billing_period")),
-    )
+    with metrics_service.observe("paddle", "cancel_subscription"):
+        paddle_client.subscriptions.cancel(
+            subscription_id=retrieved_user.subscription.paddle_subscription_id,
+            operation=CancelSubscription(effective_from=SubscriptionEffectiveFrom("next_billing_period")),
+        )
 
     await user_service.update_subscription(
         sqlmodel_session=sqlmodel_session,
@@ -172,12 +189,15 @@ async def cancel_subscription(paddle_client: Client, sqlmodel_session: Session,
 
 
 async def retrieve_invoices(paddle_client: Client, retrieved_user: User) -> list[Invoice] | None:
-    transactions = paddle_client.transactions.list(
-        operation=ListTransactions(
-            subscription_ids=[retrieved_user.subscription.paddle_subscription_id],
-            pager=Pager(after=None, per_page=10, order_by=OrderBy.id_descending()),
+    with metrics_service.observe("paddle", "list_transactions"):
+        transactions = list(
+            paddle_client.transactions.list(
+                operation=ListTransactions(
+                    subscription_ids=[retrieved_user.subscription.paddle_subscription_id],
+                    pager=Pager(after=None, per_page=10, order_by=OrderBy.id_descending()),
+                )
+            )
         )
-    )
 
     return [
         Invoice(
@@ -196,7 +216,8 @@ async def retrieve_invoices(paddle_client: Client, retrieved_user: User) -> list
 
 
 async def retrieve_invoice_document(paddle_client: Client, transaction_id: str) -> None:
-    return paddle_client.transactions.get_invoice_pdf(transaction_id=transaction_id)
+    with metrics_service.observe("paddle", "get_invoice_pdf"):
+        return paddle_client.transactions.get_invoice_pdf(transaction_id=transaction_id)
 
 
 async def confirm_transaction(
@@ -204,45 +225,232 @@ async def confirm_transaction(
     sqlmodel_session: Session,
     retrieved_user: User,
     transaction_id: str,
-    attempt: int = 0,
-    retry: int = 5,
-    interval: float = 5,
 ) -> bool:
-    await asyncio.sleep(interval)
+    with metrics_service.observe("paddle", "get_transaction"):
+        transaction = paddle_client.transactions.get(transaction_id=transaction_id)
 
-    transaction = paddle_client.transactions.get(transaction_id=transaction_id)
-    subscription = paddle_client.subscriptions.get(subscription_id=transaction.subscription_id)
+    if not await verify_transaction(transaction=transaction):
+        return False
 
-    is_transaction_verified = await verify_transaction(transaction=transaction)
-    is_subscription_verified = await verify_subscription(subscription=subscription)
+    with metrics_service.observe("paddle", "get_subscription"):
+        subscription = paddle_client.subscriptions.get(subscription_id=transaction.subscription_id)
 
-    if is_transaction_verified and is_subscription_verified:
-        if retrieved_user.subscription.paddle_subscription_id:
-            await cancel_subscription(
-                paddle_client=paddle_client,
-                sqlmodel_session=sqlmodel_session,
-                retrieved_user=retrieved_user,
-            )
+    if not await verify_subscription(subscription=subscription):
+        return False
 
-        await update_subscription(
+    paddle_subscription_id = retrieved_user.subscription.paddle_subscription_id
+
+    if paddle_subscription_id and paddle_subscription_id != subscription.id:
+        await cancel_subscription(
+            paddle_client=paddle_client,
             sqlmodel_session=sqlmodel_session,
-            subscription=subscription,
             retrieved_user=retrieved_user,
         )
 
-        return True
+    await update_subscription(
+        sqlmodel_session=sqlmodel_session,
+        subscription=subscription,
+        retrieved_user=retrieved_user,
+    )
+
+    return True
+
+
+async def create_transaction(*, sqlmodel_session: Session, user_id: int, transaction_id: str) -> PaymentTransaction:
+    retrieved_transaction = sqlmodel_session.get(PaymentTransaction, transaction_id)
+
+    if retrieved_transaction:
+        return retrieved_transaction
+
+    created_transaction = PaymentTransaction(id=transaction_id, user_id=user_id)
+
+    sqlmodel_session.add(created_transaction)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(created_transaction)
+
+    return created_transaction
+
+
+async def update_transaction(
+    *,
+    sqlmodel_session: Session,
+    retrieved_transaction: PaymentTransaction,
+    status: PaymentTransactionStatus,
+) -> PaymentTransaction:
+    retrieved_transaction.status = status.value
 
-    if attempt >= retry:
+    sqlmodel_session.add(retrieved_transaction)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(retrieved_transaction)
+
+    return retrieved_transaction
+
+
+async def retrieve_pending_transactions(
+    *,
+    sqlmodel_session: Session,
+    created_before: float,
+    limit: int,
+) -> list[PaymentTransaction]:
+    statement: Any = (
+        select(PaymentTransaction)
+        .where(PaymentTransaction.status == PaymentTransactionStatus.PENDING.value)
+        .where(PaymentTransaction.created_at <= created_before)
+        .order_by(PaymentTransaction.created_at)
+        .limit(limit)
+    )
+
+    return list(sqlmodel_session.exec(statement).all())
+
+
+def verify_webhook(body: bytes, signature: str | None, key: str) -> bool:
+    if not signature or not key:
+        return False
+
+    request = SimpleNamespace(headers={"Paddle-Signature": signature}, body=body)
+
+    try:
+        return Verifier().verify(request=request, secrets=Secret(key))
+    except (ValueError, IndexError):
         return False
 
-    attempt += 1
 
-    return await confirm_transaction(
-        paddle_client=paddle_client,
+async def create_event(*, sqlmodel_session: Session, event: dict) -> PaymentEvent | None:
+    """Store a webhook event once; returns None when the event id has already been received."""
+    if sqlmodel_session.get(PaymentEvent, event["event_id"]):
+        return None
+
+    occurred_at = event.get("occurred_at")
+
+    created_event = PaymentEvent(
+        id=event["event_id"],
+        type=event["event_type"],
+        payload=json.dumps(event),
+        occurred_at=datetime.fromisoformat(occurred_at).timestamp() if occurred_at else None,
+    )
+
+    sqlmodel_session.add(created_event)
+
+    try:
+        sqlmodel_session.commit()
+    except IntegrityError:
+        sqlmodel_session.rollback()
+        return None
+
+    sqlmodel_session.refresh(created_event)
+
+    return created_event
+
+
+async def retrieve_pending_events(
+    *, sqlmodel_session: Session, created_before: float, limit: int
+) -> list[PaymentEvent]:
+    statement: Any = (
+        select(PaymentEvent)
+        .where(PaymentEvent.status == PaymentEventStatus.PENDING.value)
+        .where(PaymentEvent.created_at <= created_before)
+        .order_by(PaymentEvent.created_at)
+        .limit(limit)
+    )
+
+    return list(sqlmodel_session.exec(statement).all())
+
+
+async def handle_transaction_event(paddle_client: Client, sqlmodel_session: Session, data: dict) -> bool:
+    """
+    Complete the transaction of a transaction.completed event, False when the transaction is unknown.
+
+    The webhook can arrive before the checkout request has stored the transaction, such an event is
+    left pending for the reconcile worker to try again.
+    """
+    retrieved_transaction = sqlmodel_session.get(PaymentTransaction, data["id"])
+
+    if not retrieved_transaction:
+        return False
+
+    if retrieved_transaction.status == PaymentTransactionStatus.COMPLETED:
+        return True
+
+    retrieved_user = await user_service.retrieve_by_id(
         sqlmodel_session=sqlmodel_session,
-        retrieved_user=retrieved_user,
-        transaction_id=transaction_id,
-        attempt=attempt,
-        retry=retry,
-        interval=interval,
+        user_id=retrieved_transaction.user_id,
+    )
+
+    if await confirm_transaction(paddle_client, sqlmodel_session, retrieved_user, retrieved_transaction.id):
+        await update_transaction(
+            sqlmodel_session=sqlmodel_session,
+            retrieved_transaction=retrieved_transaction,
+            status=PaymentTransactionStatus.COMPLETED,
+        )
+
+    return True
+
+
+async def handle_subscription_event(paddle_client: Client, sqlmodel_session: Session, data: dict) -> None:
+    retrieved_subscription = await user_service.retrieve_subscription_by_paddle_subscription_id(
+        sqlmodel_session=sqlmodel_session,
+        paddle_subscription_id=data["id"],
     )
+
+    if not retrieved_subscription:
+        return
+
+    if data.get("status") == SubscriptionStatus.Canceled.value:
+        await user_service.update_subscription(
+            sqlmodel_session=sqlmodel_session,
+            retrieved_subscription=retrieved_subscription,
+            subscription=UpdateUserSubscription(paddle_subscription_id=None),
+        )
+        return
+
+    with metrics_service.observe("paddle", "get_subscription"):
+        subscription = paddle_client.subscriptions.get(subscription_id=data["id"])
+
+    if await verify_subscription(subscription=subscription):
+        await update_subscription(
+            sqlmodel_session=sqlmodel_session,
+            subscription=subscription,
+            retrieved_user=retrieved_subscription.user,
+        )
+
+
+def record_event_failure(*, retrieved_event: PaymentEvent, error: str) -> None:
+    """Count a failed attempt at an event, it is given up on after payment_event_max_attempts, the caller commits."""
+    retrieved_event.attempts += 1
+    retrieved_event.last_error = error
+
+    if retrieved_event.attempts >= settings.payment_event_max_attempts:
+        retrieved_event.status = PaymentEventStatus.FAILED.value
+
+
+async def process_event(paddle_client: Client, sqlmodel_session: Session, event_id: str) -> PaymentEvent | None:
+    retrieved_event = sqlmodel_session.get(PaymentEvent, event_id)
+
+    if not retrieved_event or retrieved_event.status != PaymentEventStatus.PENDING:
+        return retrieved_event
+
+    data = json.loads(retrieved_event.payload).get("data") or {}
+
+    try:
+        if retrieved_event.type == "transaction.completed":
+            handled = await handle_transaction_event(paddle_client, sqlmodel_session, data)
+        else:
+            handled = True
+
+            if retrieved_event.type.startswith("subscription."):
+                await handle_subscription_event(paddle_client, sqlmodel_session, data)
+    except RequestException as exc:
+        record_event_failure(retrieved_event=retrieved_event, error=str(exc))
+    else:
+        if handled:
+            retrieved_event.attempts += 1
+            retrieved_event.status = PaymentEventStatus.PROCESSED.value
+            retrieved_event.processed_at = datetime.now(UTC).timestamp()
+        else:
+            record_event_failure(retrieved_event=retrieved_event, error=f"Transaction {data.get('id')} not found.")
+
+    sqlmodel_session.add(retrieved_event)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(retrieved_event)
+
+    return retrieved_event
@@ -1,16 +1,19 @@
+import json
 from collections.abc import Sequence
 from io import BytesIO
 from typing import Annotated
 
 import requests
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
 from paddle_billing import Client
 from sqlmodel import Session
 from starlette.responses import StreamingResponse
 
+from config import Settings, get_settings
 from src.talentgate.database.service import get_sqlmodel_session
+from src.talentgate.metrics import service as metrics_service
 from src.talentgate.payment import service as payment_service
-from src.talentgate.payment.exceptions import UserSubscriptionNotFoundException
+from src.talentgate.payment.exceptions import InvalidWebhookSignatureException, UserSubscriptionNotFoundException
 from src.talentgate.payment.models import (
     Invoice,
     PaymentCheckout,
@@ -28,18 +31,14 @@ router = APIRouter(tags=["payment"])
 @router.post("/api/v1/payment/checkout")
 async def payment_checkout(
     *,
-    paddle_client: Annotated[Client, Depends(get_paddle_client)],
     sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
     retrieved_user: Annotated[User, Depends(retrieve_current_user)],
-    background_tasks: BackgroundTasks,
     checkout: PaymentCheckout,
 ) -> dict[str, str | None]:
-    background_tasks.add_task(
-        payment_service.confirm_transaction,
-        paddle_client,
-        sqlmodel_session,
-        retrieved_user,
-        checkout.transaction_id,
+    await payment_service.create_transaction(
+        sqlmodel_session=sqlmodel_session,
+        user_id=retrieved_user.id,
+        transaction_id=checkout.transaction_id,
     )
 
     return {
@@ -47,6 +46,41 @@ async def payment_checkout(
     }
 
 
+@router.post("/api/v1/payment/webhooks")
+async def payment_webhook(
+    *,
+    request: Request,
+    paddle_client: Annotated[Client, Depends(get_paddle_client)],
+    sqlmodel_session: Annotated[Session, Depends(get_sqlmodel_session)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    background_tasks: BackgroundTasks,
+) -> dict[str, str | None]:
+    body = await request.body()
+
+    if not payment_service.verify_webhook(
+        body=body,
+        signature=request.headers.get("Paddle-Signature"),
+        key=settings.paddle_webhook_secret_key,
+    ):
+        raise InvalidWebhookSignatureException
+
+    event = json.loads(body)
+
+    created_event = await payment_service.create_event(sqlmodel_session=sqlmodel_session, event=event)
+
+    if created_event:
+        background_tasks.add_task(
+            payment_service.process_event,
+            paddle_client,
+            sqlmodel_session,
+            created_event.id,
+        )
+
+    return {
+        "event_id": event["event_id"],
+    }
+
+
 @router.get("/api/v1/payment/subscription")
 async def retrieve_subscription(
     *,
@@ -107,10 +141,12 @@ async def retrieve_invoices(
 def retrieve_invoice_document(
     *, paddle_client: Annotated[Client, Depends(get_paddle_client)], transaction_id: str
 ) -> StreamingResponse:
-    invoice_document = paddle_client.transactions.get_invoice_pdf(transaction_id=transaction_id)
+    with metrics_service.observe("paddle", "get_invoice_pdf"):
+        invoice_document = paddle_client.transactions.get_invoice_pdf(transaction_id=transaction_id)
 
-    pdf_response = requests.get(invoice_document.url, timeout=10)
-    pdf_bytes = pdf_response.content
+    with metrics_service.observe("paddle", "download_invoice_pdf"):
+        pdf_response = requests.get(invoice_document.url, timeout=10)
+        pdf_bytes = pdf_response.content
 
     stream = BytesIO(pdf_bytes)
 
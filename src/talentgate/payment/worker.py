@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from datetime import UTC, datetime
+
+from paddle_billing import Client
+from requests import RequestException
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, SQLModel
+
+from config import get_settings
+from src.talentgate.database.service import get_sqlmodel_engine
+from src.talentgate.metrics import service as metrics_service
+from src.talentgate.payment import service as payment_service
+from src.talentgate.payment.enums import PaymentTransactionStatus
+from src.talentgate.payment.models import PaymentTransaction
+from src.talentgate.payment.service import get_paddle_client
+from src.talentgate.user import service as user_service
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_transaction(
+    *,
+    paddle_client: Client,
+    sqlmodel_session: Session,
+    retrieved_transaction: PaymentTransaction,
+    created_before: float,
+) -> None:
+    retrieved_user = await user_service.retrieve_by_id(
+        sqlmodel_session=sqlmodel_session,
+        user_id=retrieved_transaction.user_id,
+    )
+
+    is_confirmed = await payment_service.confirm_transaction(
+        paddle_client,
+        sqlmodel_session,
+        retrieved_user,
+        retrieved_transaction.id,
+    )
+
+    expired = retrieved_transaction.created_at <= created_before - settings.payment_transaction_expiration
+
+    if is_confirmed or expired:
+        await payment_service.update_transaction(
+            sqlmodel_session=sqlmodel_session,
+            retrieved_transaction=retrieved_transaction,
+            status=PaymentTransactionStatus.COMPLETED if is_confirmed else PaymentTransactionStatus.FAILED,
+        )
+
+
+async def reconcile(*, paddle_client: Client, sqlmodel_session: Session, created_before: float, limit: int) -> int:
+    """
+    Catch up on webhook events that were never processed and checkouts whose webhook never arrived.
+
+    An event that fails unexpectedly is rolled back, logged and counted as an attempt, so it is given
+    up on after payment_event_max_attempts instead of stopping the batch. A transaction that fails is
+    logged and left pending until it expires.
+    """
+    retrieved_events = await payment_service.retrieve_pending_events(
+        sqlmodel_session=sqlmodel_session,
+        created_before=created_before,
+        limit=limit,
+    )
+
+    for retrieved_event in retrieved_events:
+        try:
+            await payment_service.process_event(paddle_client, sqlmodel_session, retrieved_event.id)
+        except Exception as exc:
+            logger.exception("Failed to process payment event %s", retrieved_event.id)
+            sqlmodel_session.rollback()
+
+            payment_service.record_event_failure(retrieved_event=retrieved_event, error=str(exc))
+            sqlmodel_session.add(retrieved_event)
+            sqlmodel_session.commit()
+
+    retrieved_transactions = await payment_service.retrieve_pending_transactions(
+        sqlmodel_session=sqlmodel_session,
+        created_before=created_before,
+        limit=limit,
+    )
+
+    for retrieved_transaction in retrieved_transactions:
+        try:
+            await reconcile_transaction(
+                paddle_client=paddle_client,
+                sqlmodel_session=sqlmodel_session,
+                retrieved_transaction=retrieved_transaction,
+                created_before=created_before,
+            )
+        except RequestException as exc:
+            logger.warning("Failed to reconcile transaction %s: %s", retrieved_transaction.id, exc)
+        except Exception:
+            logger.exception("Failed to reconcile transaction %s", retrieved_transaction.id)
+            sqlmodel_session.rollback()
+
+    return len(retrieved_events) + len(retrieved_transactions)
+
+
+async def run() -> None:
+    if settings.metrics_worker_port:
+        metrics_service.start_http_server(port=settings.metrics_worker_port)
+
+    engine = get_sqlmodel_engine()
+    SQLModel.metadata.create_all(engine)
+    paddle_client = get_paddle_client()
+
+    while True:
+        try:
+            with Session(engine, autocommit=False, autoflush=False) as sqlmodel_session:
+                await reconcile(
+                    paddle_client=paddle_client,
+                    sqlmodel_session=sqlmodel_session,
+                    created_before=datetime.now(UTC).timestamp() - settings.payment_reconcile_delay,
+                    limit=settings.payment_reconcile_batch_size,
+                )
+        except SQLAlchemyError:
+            logger.exception("Failed to reconcile payments")
+
+        await asyncio.sleep(settings.payment_reconcile_interval)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
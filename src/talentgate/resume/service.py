@@ -1,12 +1,18 @@
+import asyncio
+import json
 import re
+from collections.abc import AsyncIterator, Awaitable, Callable
 from io import BytesIO
 from typing import Any
 
 import requests
 from google import genai
-from google.genai.types import GenerateContentConfig, ThinkingConfig
+from google.genai.errors import APIError
+from google.genai.types import CreateCachedContentConfig, GenerateContentConfig, ThinkingConfig
 
 from config import get_settings
+from src.talentgate.metrics import service as metrics_service
+from src.talentgate.resume import similarity
 
 settings = get_settings()
 
@@ -17,59 +23,10 @@ url = f"{schema}://{host}:{port}/v1/convert/file"
 
 client = genai.Client(api_key=settings.gemini_api_key)
 
-CLEAN_PATTERNS = [
-    (r"·(?=\s*$)", ""),
-    (r"^\s*-\s*$", ""),
-    (r"^\s*-\s+", "- "),
-    (r"\n{3,}", "\n\n"),
-    (r"\s+[a-zA-Z]\s*$", ""),
-    (r"[\uE000-\uF8FF]", ""),
-    (r"<!--\s*image\s*-->", ""),
-]
+model = "gemini-3-flash-preview"
 
+INSTRUCTIONS = """
 
-def clean(contents: str) -> str:
-    for pattern, repl in CLEAN_PATTERNS:
-        contents = re.sub(pattern, repl, contents, flags=re.MULTILINE)
-
-    return contents.strip()
-
-
-def convert(file: bytes) -> Any:
-    files = {
-        "files": (
-            "resume.pdf",
-            BytesIO(file),
-            "application/pdf",
-        ),
-    }
-
-    data = {
-        "to_formats": "md",
-        "include_images": "false",
-        "image_export_mode": "placeholder",
-        "do_table_structure": "false",
-        "do_ocr": "false",
-        "force_ocr": "false",
-        "md_page_break_placeholder": "",
-        "extract_tables": "false",
-        "abort_on_error": "true",
-    }
-
-    headers = {
-        "Authorization": f"Bearer {settings.docling_api_key}",
-    }
-
-    response = requests.post(url=url, files=files, data=data, headers=headers)
-
-    return response.json()["document"]["md_content"]
-
-
-def parse(file: bytes, job_description: str) -> str | None:
-    contents = convert(file)
-    contents = clean(contents)
-
-    prompt = f"""
     You are a structured data extraction and evaluation engine.
 
     Your task is to:
@@ -154,56 +111,121 @@ def parse(file: bytes, job_description: str) -> str | None:
 
     JSON SCHEMA (STRICT):
 
-    {{
-      "applicant": {{
+    {
+      "applicant": {
         "firstname": string | null,
         "lastname": string | null,
         "email": string | null,
         "phone": string | null,
-        "address": {{
+        "address": {
           "unit": string | null,
           "street": string | null,
           "city": string | null,
           "state": string | null,
           "country": string | null,
           "postal_code": string | null
-        }},
+        },
         "links":[
-          {{
+          {
             "type": "LINKEDIN" | "GITHUB" | "MEDIUM" | "OTHER" | null,
             "url": string | null
-          }}
+          }
         ],
-        "education": {{
+        "education": {
           "institution": string | null,
           "degree": string | null,
           "field_of_study": string | null,
           "start_date": string | null,
           "end_date": string | null
-        }},
+        },
         "experiences": [
-          {{
+          {
             "title": string | null,
             "company": string | null,
             "description": string | null,
             "skills": string | null,
             "start_date": string | null,
             "end_date": string | null
-          }}
+          }
         ]
-      }},
+      },
       "summary": string | null,
-      "evaluation": {{
-        "education": {{
+      "evaluation": {
+        "education": {
           "score": number | null
-        }},
-        "experience": {{
+        },
+        "experience": {
           "score": number | null
-        }},
+        },
         "overview": string | null,
         "overall_score": number | null
-      }}
-    }}
+      }
+    }
+"""
+
+BATCH_INSTRUCTIONS = """
+    BATCH MODE:
+        - Several resumes are provided, each introduced by a "RESUME <id>:" header.
+        - Evaluate every resume independently against the same Job Description.
+        - Return a JSON array with exactly one result per resume, in the order given.
+        - Each result follows the JSON SCHEMA above and adds an "id" field holding the resume id.
+"""
+
+CLEAN_PATTERNS = [
+    (r"·(?=\s*$)", ""),
+    (r"^\s*-\s*$", ""),
+    (r"^\s*-\s+", "- "),
+    (r"\n{3,}", "\n\n"),
+    (r"\s+[a-zA-Z]\s*$", ""),
+    (r"[\uE000-\uF8FF]", ""),
+    (r"<!--\s*image\s*-->", ""),
+]
+
+
+def clean(contents: str) -> str:
+    for pattern, repl in CLEAN_PATTERNS:
+        contents = re.sub(pattern, repl, contents, flags=re.MULTILINE)
+
+    return contents.strip()
+
+
+def convert(file: bytes) -> Any:
+    files = {
+        "files": (
+            "resume.pdf",
+            BytesIO(file),
+            "application/pdf",
+        ),
+    }
+
+    data = {
+        "to_formats": "md",
+        "include_images": "false",
+        "image_export_mode": "placeholder",
+        "do_table_structure": "false",
+        "do_ocr": "false",
+        "force_ocr": "false",
+        "md_page_break_placeholder": "",
+        "extract_tables": "false",
+        "abort_on_error": "true",
+    }
+
+    headers = {
+        "Authorization": f"Bearer {settings.docling_api_key}",
+    }
+
+    with metrics_service.observe("docling", "convert"):
+        response = requests.post(url=url, files=files, data=data, headers=headers)
+
+        return response.json()["document"]["md_content"]
+
+
+def parse(file: bytes, job_description: str) -> str | None:
+    contents = convert(file)
+    contents = clean(contents)
+
+    prompt = f"""
+    {INSTRUCTIONS}
 
     -----------------------------------
 
@@ -220,12 +242,246 @@ def parse(file: bytes, job_description: str) -> str | None:
     Return ONLY the JSON result.
     """
 
-    response = client.models.generate_content(
-        model="gemini-3-flash-preview",
-        contents=prompt,
-        config=GenerateContentConfig(
-            response_mime_type="application/json", temperature=0.0, thinking_config=ThinkingConfig(thinking_budget=-1)
-        ),
-    )
+    with metrics_service.observe("gemini", "generate_content"):
+        response = client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=GenerateContentConfig(
+                response_mime_type="application/json",
+                temperature=0.0,
+                thinking_config=ThinkingConfig(thinking_budget=-1),
+            ),
+        )
 
     return response.text
+
+
+def load_and_convert(load: Callable[[], bytes | None]) -> str | None:
+    file = load()
+
+    return convert(file) if file is not None else None
+
+
+async def convert_async(
+    key: str,
+    load: Callable[[], bytes | None],
+    semaphore: asyncio.Semaphore,
+) -> tuple[str, str | None]:
+    async with semaphore:
+        try:
+            contents = await asyncio.to_thread(load_and_convert, load)
+        except (requests.RequestException, KeyError, ValueError):
+            return key, None
+
+    return key, clean(contents) if contents is not None else None
+
+
+async def create_context(job_description: str, ttl: int) -> str | None:
+    """
+    Cache the instructions and the job description once for a batch run.
+
+    Gemini refuses to cache prompts below its minimum token count, in which case
+    None is returned and every packed request carries the context inline.
+    """
+    try:
+        with metrics_service.observe("gemini", "create_cache"):
+            cached_content = await client.aio.caches.create(
+                model=model,
+                config=CreateCachedContentConfig(
+                    system_instruction=f"{INSTRUCTIONS}\n{BATCH_INSTRUCTIONS}",
+                    contents=[f"JOB DESCRIPTION:\n{job_description}"],
+                    ttl=f"{ttl}s",
+                ),
+            )
+    except APIError:
+        return None
+
+    return cached_content.name
+
+
+async def delete_context(name: str) -> None:
+    try:
+        with metrics_service.observe("gemini", "delete_cache"):
+            await client.aio.caches.delete(name=name)
+    except APIError:
+        return
+
+
+async def parse_batch(
+    resumes: list[tuple[str, str]],
+    job_description: str,
+    context: str | None = None,
+) -> dict[str, dict]:
+    sections = "\n\n".join(f"RESUME {key}:\n{contents}" for key, contents in resumes)
+
+    if context:
+        prompt = f"{sections}\n\nReturn ONLY the JSON array."
+        config = GenerateContentConfig(
+            cached_content=context,
+            response_mime_type="application/json",
+            temperature=0.0,
+            thinking_config=ThinkingConfig(thinking_budget=-1),
+        )
+    else:
+        prompt = f"JOB DESCRIPTION:\n{job_description}\n\n{sections}\n\nReturn ONLY the JSON array."
+        config = GenerateContentConfig(
+            system_instruction=f"{INSTRUCTIONS}\n{BATCH_INSTRUCTIONS}",
+            response_mime_type="application/json",
+            temperature=0.0,
+            thinking_config=ThinkingConfig(thinking_budget=-1),
+        )
+
+    try:
+        with metrics_service.observe("gemini", "generate_content"):
+            response = await client.aio.models.generate_content(model=model, contents=prompt, config=config)
+        results = json.loads(response.text or "[]")
+    except (APIError, ValueError):
+        return {}
+
+    if not isinstance(results, list):
+        return {}
+
+    return {str(result.get("id")): result for result in results if isinstance(result, dict)}
+
+
+async def convert_resumes(
+    resumes: dict[str, Callable[[], bytes | None]],
+    concurrency: int,
+) -> AsyncIterator[tuple[str, str | None]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    conversions = [convert_async(key=key, load=load, semaphore=semaphore) for key, load in resumes.items()]
+
+    for conversion in asyncio.as_completed(conversions):
+        yield await conversion
+
+
+async def screen_resumes(
+    conversions: AsyncIterator[tuple[str, str | None]],
+    job_description: str,
+    threshold: float,
+    top_k: int,
+    similarities: dict[str, float],
+) -> AsyncIterator[tuple[str, str | None]]:
+    """
+    Hold converted resumes back until every conversion is done, then release the most similar ones.
+
+    Failed conversions pass straight through, resumes below the threshold or outside the top k are dropped.
+    The similarity of every released resume is recorded in similarities. Without a threshold or top k
+    conversions are released as they complete.
+    """
+    if threshold <= 0 and top_k <= 0:
+        async for conversion in conversions:
+            yield conversion
+        return
+
+    converted = {}
+
+    async for key, contents in conversions:
+        if contents is None:
+            yield key, None
+        else:
+            converted[key] = contents
+
+    similarities.update(
+        await asyncio.to_thread(
+            similarity.screen,
+            documents=converted,
+            query=job_description,
+            dimensions=settings.resume_similarity_dimensions,
+            k=top_k or None,
+            threshold=threshold,
+        )
+    )
+
+    for key in similarities:
+        yield key, converted[key]
+
+
+async def ignore_progress(*_: int) -> None:
+    return
+
+
+async def evaluate(
+    *,
+    resumes: dict[str, Callable[[], bytes | None]],
+    job_description: str,
+    batch_size: int = 5,
+    concurrency: int = 4,
+    context_ttl: int = 900,
+    similarity_threshold: float = 0.0,
+    similarity_top_k: int = 0,
+    on_progress: Callable[[int, int, int], Awaitable[None]] = ignore_progress,
+) -> dict[str, dict]:
+    """
+    Evaluate many resumes against one job description.
+
+    Every resume is given by a function that loads it, or returns None when there is none. It is
+    called in the worker thread of its conversion, so no more than concurrency resumes are held
+    in memory at once. Docling conversions run concurrently and every full batch of converted resumes is
+    sent to Gemini as one packed request while the remaining conversions continue.
+    Resumes that fail to convert or are missing from the model output are left out of
+    the returned mapping.
+
+    With a similarity threshold or top k, every conversion is awaited first and only the
+    resumes whose hashed TF-IDF cosine similarity to the job description passes the screen
+    are sent to Gemini, the others are reported as skipped.
+    """
+    results: dict[str, dict] = {}
+    similarities: dict[str, float] = {}
+    failed = 0
+    skipped = 0
+
+    async def parse_resumes(batch: list[tuple[str, str]]) -> None:
+        nonlocal failed
+
+        parsed = await parse_batch(resumes=batch, job_description=job_description, context=context)
+
+        for key, _ in batch:
+            if key in parsed:
+                results[key] = {**parsed[key], "similarity": similarities.get(key)}
+            else:
+                failed += 1
+
+        await on_progress(len(results), failed, skipped)
+
+    context = await create_context(job_description=job_description, ttl=context_ttl)
+
+    tasks = []
+    batch: list[tuple[str, str]] = []
+    dispatched = 0
+    unconverted = 0
+
+    try:
+        conversions = screen_resumes(
+            conversions=convert_resumes(resumes=resumes, concurrency=concurrency),
+            job_description=job_description,
+            threshold=similarity_threshold,
+            top_k=similarity_top_k,
+            similarities=similarities,
+        )
+
+        async for key, contents in conversions:
+            if contents is None:
+                unconverted += 1
+                failed += 1
+                continue
+
+            batch.append((key, contents))
+            dispatched += 1
+
+            if len(batch) >= batch_size:
+                tasks.append(asyncio.create_task(parse_resumes(batch)))
+                batch = []
+
+        if batch:
+            tasks.append(asyncio.create_task(parse_resumes(batch)))
+
+        skipped = len(resumes) - unconverted - dispatched
+
+        await asyncio.gather(*tasks)
+        await on_progress(len(results), failed, skipped)
+    finally:
+        if context:
+            await delete_context(name=context)
+
+    return results
@@ -0,0 +1,106 @@
+import re
+import zlib
+from collections.abc import Sequence
+from itertools import pairwise
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOP_WORDS = frozenset(
+    {
+        "a", "about", "after", "all", "also", "an", "and", "any", "are", "as", "at", "be", "been", "being", "both",
+        "but", "by", "can", "do", "each", "for", "from", "has", "have", "he", "her", "his", "i", "if", "in", "into",
+        "is", "it", "its", "me", "more", "my", "not", "of", "on", "or", "other", "our", "over", "she", "so", "such",
+        "than", "that", "the", "their", "them", "then", "there", "these", "they", "this", "those", "through", "to",
+        "under", "up", "us", "was", "we", "were", "what", "when", "where", "which", "while", "who", "will", "with",
+        "within", "would", "you", "your",
+    }
+)  # fmt: skip
+
+
+def tokenize(text: str) -> list[str]:
+    words = [word for word in TOKEN_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in pairwise(words)]
+
+
+def hash_tokens(text: str, dimensions: int) -> tuple[np.ndarray, np.ndarray]:
+    """Bucket indices and counts of the hashed terms of one document."""
+    buckets = np.fromiter(
+        (zlib.crc32(token.encode()) % dimensions for token in tokenize(text)),
+        dtype=np.int64,
+    )
+    return np.unique(buckets, return_counts=True)
+
+
+def vectorize(texts: Sequence[str], dimensions: int) -> np.ndarray:
+    """
+    L2-normalized hashed TF-IDF rows, one per text, stored as float16.
+
+    Terms are hashed into a fixed number of buckets, so there is no vocabulary to fit or keep. Term
+    frequencies are sublinear and the inverse document frequencies come from the texts themselves.
+    """
+    hashed = [hash_tokens(text, dimensions) for text in texts]
+
+    document_frequency = np.zeros(dimensions, dtype=np.float32)
+    for buckets, _ in hashed:
+        document_frequency[buckets] += 1
+
+    idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+
+    vectors = np.zeros((len(texts), dimensions), dtype=np.float16)
+
+    for row, (buckets, counts) in enumerate(hashed):
+        weights = (1 + np.log(counts.astype(np.float32))) * idf[buckets]
+        norm = np.linalg.norm(weights)
+
+        if norm > 0:
+            vectors[row, buckets] = weights / norm
+
+    return vectors
+
+
+def top_k(
+    vectors: np.ndarray,
+    query: np.ndarray,
+    k: int | None = None,
+    threshold: float = 0.0,
+    block_size: int = 1024,
+) -> list[tuple[int, float]]:
+    """
+    Rows whose cosine similarity to the query reaches the threshold, best first, at most k of them.
+
+    Rows are unit length, so the cosine is a dot product. It is computed one block of rows at a time in
+    float32, which keeps the float16 matrix as the only full-size array in memory.
+    """
+    query = query.astype(np.float32)
+    scores = np.empty(len(vectors), dtype=np.float32)
+
+    for start in range(0, len(vectors), block_size):
+        scores[start : start + block_size] = vectors[start : start + block_size].astype(np.float32) @ query
+
+    candidates = np.flatnonzero(scores >= threshold)
+
+    if k is not None and 0 < k < len(candidates):
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+
+    candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+    return [(int(index), float(scores[index])) for index in candidates]
+
+
+def screen(
+    documents: dict[str, str],
+    query: str,
+    dimensions: int,
+    k: int | None = None,
+    threshold: float = 0.0,
+) -> dict[str, float]:
+    """Keys of the documents most similar to the query, best first, with their cosine similarity."""
+    if not documents:
+        return {}
+
+    keys = list(documents)
+    vectors = vectorize([query, *documents.values()], dimensions)
+
+    return {keys[index]: score for index, score in top_k(vectors[1:], vectors[0], k=k, threshold=threshold)}
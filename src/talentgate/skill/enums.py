@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class SkillMatch(StrEnum):
+    ALL = "all"
+    ANY = "any"
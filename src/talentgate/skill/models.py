@@ -0,0 +1,41 @@
+import uuid
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+from src.talentgate.database.models import BaseModel
+from src.talentgate.skill.enums import SkillMatch
+
+
+class Skill(SQLModel, table=True):
+    __tablename__ = "skill"
+
+    id: int | None = Field(default=None, primary_key=True)
+    name: str = Field(unique=True)
+
+
+class ApplicantSkill(SQLModel, table=True):
+    __tablename__ = "applicant_skill"
+
+    application_id: uuid.UUID = Field(foreign_key="application.id", primary_key=True, ondelete="CASCADE")
+    skill_id: int = Field(foreign_key="skill.id", primary_key=True, ondelete="CASCADE")
+
+
+# the primary key serves lookups by application, this one serves lookups by skill as index-only scans
+Index("ix_applicant_skill_skill_id_application_id", ApplicantSkill.skill_id, ApplicantSkill.application_id)
+
+
+class SkillQueryParameters(BaseModel):
+    skills: list[str] = Field(min_length=1, max_length=20)
+    match: SkillMatch = SkillMatch.ALL
+    offset: int | None = None
+    limit: int | None = None
+
+
+class SkilledApplication(BaseModel):
+    id: uuid.UUID
+    status: str | None = None
+    overall_score: float | None = None
+    firstname: str | None = None
+    lastname: str | None = None
+    email: str | None = None
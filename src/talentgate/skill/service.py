@@ -0,0 +1,158 @@
+import re
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import and_, intersect, union
+from sqlalchemy import delete as sql_delete
+from sqlmodel import Session, select
+
+from src.talentgate.application.models import Applicant, Application
+from src.talentgate.database.service import dialect_insert
+from src.talentgate.job import service as job_service
+from src.talentgate.skill.enums import SkillMatch
+from src.talentgate.skill.models import ApplicantSkill, Skill, SkilledApplication, SkillQueryParameters
+
+SKILL_SEPARATORS = re.compile(r"[,;|•\n]+")
+
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "dotnet": ".net",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "ml": "machine learning",
+    "nlp": "natural language processing",
+    "cicd": "ci/cd",
+    "scikit learn": "scikit-learn",
+    "sklearn": "scikit-learn",
+}
+
+
+def canonicalize(skill: str) -> str | None:
+    name = " ".join(skill.lower().split()).strip(" .-*:()")
+
+    if not name or len(name) > 64:  # noqa: PLR2004
+        return None
+
+    return SKILL_ALIASES.get(name, name)
+
+
+def split_skills(skills: str | Iterable[str] | None) -> list[str]:
+    if not skills:
+        return []
+
+    if isinstance(skills, str):
+        skills = SKILL_SEPARATORS.split(skills)
+
+    return list(dict.fromkeys(name for skill in skills if (name := canonicalize(skill))))
+
+
+def create_skills(*, sqlmodel_session: Session, names: Iterable[str]) -> dict[str, int]:
+    names = list(dict.fromkeys(names))
+
+    if not names:
+        return {}
+
+    statement: Any = dialect_insert(sqlmodel_session, Skill).on_conflict_do_nothing(index_elements=["name"])
+    sqlmodel_session.execute(statement, [{"name": name} for name in names])
+
+    return dict(sqlmodel_session.exec(select(Skill.name, Skill.id).where(Skill.name.in_(names))).all())
+
+
+def replace_applicant_skills(*, sqlmodel_session: Session, skills: dict[uuid.UUID, list[str]]) -> None:
+    """Stage the canonical skills of every application, the caller commits together with its evaluations."""
+    skill_ids = create_skills(
+        sqlmodel_session=sqlmodel_session,
+        names=(name for names in skills.values() for name in names),
+    )
+
+    sqlmodel_session.execute(sql_delete(ApplicantSkill).where(ApplicantSkill.application_id.in_(list(skills))))
+
+    rows = [
+        {"application_id": application_id, "skill_id": skill_ids[name]}
+        for application_id, names in skills.items()
+        for name in dict.fromkeys(names)
+        if name in skill_ids
+    ]
+
+    if rows:
+        sqlmodel_session.execute(dialect_insert(sqlmodel_session, ApplicantSkill), rows)
+
+
+def delete_applicant_skills(*, sqlmodel_session: Session, application_ids: list[uuid.UUID]) -> None:
+    """Stage the deletion of the skills of the applications, the caller commits together with the applications."""
+    sqlmodel_session.execute(sql_delete(ApplicantSkill).where(ApplicantSkill.application_id.in_(application_ids)))
+
+
+async def retrieve_applications_by_skills(
+    *,
+    sqlmodel_session: Session,
+    job_id: int,
+    query_parameters: SkillQueryParameters,
+) -> list[SkilledApplication]:
+    """
+    Applications of a job whose applicant has all, or any, of the requested skills.
+
+    Each skill resolves to the application ids under it through the (skill_id, application_id) index,
+    the sets are then intersected for all or united for any before joining back to the applications.
+    """
+    names = split_skills(query_parameters.skills)
+
+    skill_ids = list(sqlmodel_session.exec(select(Skill.id).where(Skill.name.in_(names))).all())
+
+    if not skill_ids or (query_parameters.match == SkillMatch.ALL and len(skill_ids) < len(names)):
+        return []
+
+    selects = [
+        select(ApplicantSkill.application_id).where(ApplicantSkill.skill_id == skill_id) for skill_id in skill_ids
+    ]
+
+    if len(selects) == 1:
+        matched = selects[0].subquery()
+    elif query_parameters.match == SkillMatch.ALL:
+        matched = intersect(*selects).subquery()
+    else:
+        matched = union(*selects).subquery()
+
+    job_created_at = job_service.select_created_at(job_id)
+
+    statement: Any = (
+        select(
+            Application.id,
+            Application.status,
+            Application.overall_score,
+            Applicant.firstname,
+            Applicant.lastname,
+            Applicant.email,
+        )
+        .join(matched, matched.c.application_id == Application.id)
+        .outerjoin(
+            Applicant,
+            and_(Applicant.application_id == Application.id, Applicant.created_at >= job_created_at),
+        )
+        .where(Application.job_id == job_id, Application.created_at >= job_created_at)
+        .order_by(Application.overall_score.desc().nulls_last(), Application.id)
+        .offset(query_parameters.offset)
+        .limit(query_parameters.limit)
+    )
+
+    return [SkilledApplication.model_validate(row) for row in sqlmodel_session.exec(statement).mappings().all()]
@@ -7,6 +7,7 @@ from minio.helpers import ObjectWriteResult
 from sqlmodel import Session, select
 
 from src.talentgate.auth import service as auth_service
+from src.talentgate.metrics import service as metrics_service
 from src.talentgate.user.models import (
     CreateUser,
     CreateUserSubscription,
@@ -28,24 +29,26 @@ async def upload_profile(
     length: int,
     content_type: str,
 ) -> ObjectWriteResult:
-    return minio_client.put_object(
-        bucket_name=bucket_name,
-        object_name=object_name,
-        data=data,
-        length=length,
-        content_type=content_type,
-    )
+    with metrics_service.observe("minio", "put_object"):
+        return minio_client.put_object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            data=data,
+            length=length,
+            content_type=content_type,
+        )
 
 
 async def retrieve_profile(*, minio_client: Minio, bucket_name: str, object_name: str) -> bytes:
     response = None
 
     try:
-        response = minio_client.get_object(
-            bucket_name=bucket_name,
-            object_name=object_name,
-        )
-        data = response.data
+        with metrics_service.observe("minio", "get_object"):
+            response = minio_client.get_object(
+                bucket_name=bucket_name,
+                object_name=object_name,
+            )
+            data = response.data
     finally:
         if response:
             response.close()
@@ -89,6 +92,18 @@ async def retrieve_subscription_by_id(
     return sqlmodel_session.exec(statement).one_or_none()
 
 
+async def retrieve_subscription_by_paddle_subscription_id(
+    *,
+    sqlmodel_session: Session,
+    paddle_subscription_id: str,
+) -> UserSubscription | None:
+    statement: Any = select(UserSubscription).where(
+        UserSubscription.paddle_subscription_id == paddle_subscription_id,
+    )
+
+    return sqlmodel_session.exec(statement).first()
+
+
 async def update_subscription(
     *,
     sqlmodel_session: Session,
@@ -109,8 +124,22 @@ async def update_subscription(
     return retrieved_subscription
 
 
+async def build(*, user: CreateUser) -> User:
+    password = await auth_service.encode_password_async(password=user.password)
+
+    built_user = User(
+        **user.model_dump(exclude_unset=True, exclude_none=True, exclude={"password", "subscription"}),
+        password=password,
+    )
+
+    if "subscription" in user.model_fields_set and user.subscription is not None:
+        built_user.subscription = UserSubscription(**user.subscription.model_dump(exclude_unset=True))
+
+    return built_user
+
+
 async def create(*, sqlmodel_session: Session, user: CreateUser) -> User:
-    password = auth_service.encode_password(password=user.password)
+    password = await auth_service.encode_password_async(password=user.password)
 
     created_user = User(
         **user.model_dump(exclude_unset=True, exclude_none=True, exclude={"password", "subscription"}),
@@ -177,7 +206,7 @@ async def update(
     user: UpdateUser | UpdateCurrentUser,
 ) -> User:
     if "password" in user.model_fields_set and user.password is not None:
-        retrieved_user.password = auth_service.encode_password(password=user.password)
+        retrieved_user.password = await auth_service.encode_password_async(password=user.password)
 
     if "subscription" in user.model_fields_set and user.subscription is not None:
         retrieved_subscription = await retrieve_subscription_by_id(
@@ -55,7 +55,7 @@ async def retrieve_current_user(
 ) -> User:
     token = request.cookies.get("access_token") or getattr(http_authorization, "credentials", None)
 
-    is_verified = auth_service.verify_token(
+    is_verified = auth_service.verify_access_token(
         token=token,
         key=settings.access_token_key,
     )
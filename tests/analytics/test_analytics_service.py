@@ -0,0 +1,51 @@
+import secrets
+
+from sqlmodel import Session
+
+from src.talentgate.analytics.service import refresh_changed, retrieve_company_analytics, subtract
+from src.talentgate.application.models import Application
+from src.talentgate.company.models import Company
+from src.talentgate.job.models import Job
+
+
+async def test_retrieve_company_analytics(sqlmodel_session: Session) -> None:
+    job = Job(title="analytics job")
+    company = Company(name=secrets.token_hex(12), jobs=[job])
+
+    sqlmodel_session.add(company)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(company)
+
+    applications = [
+        Application(job_id=job.id, status="applied", overall_score=80.0),
+        Application(job_id=job.id, status="applied", overall_score=60.0),
+        Application(job_id=job.id, status="applied"),
+        Application(job_id=job.id, status="interview", overall_score=90.0),
+    ]
+    sqlmodel_session.add_all(applications)
+    sqlmodel_session.commit()
+
+    analytics = await retrieve_company_analytics(sqlmodel_session=sqlmodel_session, company_id=company.id)
+
+    assert analytics.applications == 0
+
+    assert await refresh_changed(sqlmodel_session=sqlmodel_session, lag=60, batch_size=10) >= 1
+
+    analytics = await retrieve_company_analytics(sqlmodel_session=sqlmodel_session, company_id=company.id)
+
+    assert analytics.applications == 4
+    assert analytics.average_overall_score == 230 / 3
+    assert [(stage.status, stage.applications) for stage in analytics.jobs[0].stages] == [
+        ("applied", 3),
+        ("interview", 1),
+    ]
+    assert analytics.jobs[0].stages[0].average_overall_score == 70.0
+    assert 0 <= analytics.jobs[0].stages[0].average_days_in_stage < 1
+
+    subtract(sqlmodel_session=sqlmodel_session, retrieved_application=applications[3])
+    sqlmodel_session.commit()
+
+    analytics = await retrieve_company_analytics(sqlmodel_session=sqlmodel_session, company_id=company.id)
+
+    assert analytics.applications == 3
+    assert [stage.status for stage in analytics.jobs[0].stages] == ["applied"]
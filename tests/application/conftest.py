@@ -7,18 +7,26 @@ from sqlmodel import Session
 
 from config import get_settings
 from src.talentgate.application.models import (
+    Applicant,
+    ApplicantAddress,
+    ApplicantLink,
     Application,
-    ApplicationAddress,
-    ApplicationLink,
 )
+from src.talentgate.job.models import Job
 
 settings = get_settings()
 
 
+@pytest.fixture
+def sqlmodel_session(savepoint_sqlmodel_session: Session) -> Session:
+    # upsert rolls back a lost key claim
+    return savepoint_sqlmodel_session
+
+
 @pytest.fixture
 def make_application_address(sqlmodel_session: Session):
     def make(**kwargs):
-        address = ApplicationAddress(
+        address = ApplicantAddress(
             unit=kwargs.get("unit") or secrets.token_hex(12),
             street=kwargs.get("street") or secrets.token_hex(12),
             city=kwargs.get("city") or secrets.token_hex(12),
@@ -58,7 +66,7 @@ def application_address(make_application_address, request):
 @pytest.fixture
 def make_application_link(sqlmodel_session: Session):
     def make(type: str = "type", url: str = "url"):
-        link = ApplicationLink(type=type, url=url)
+        link = ApplicantLink(type=type, url=url)
 
         sqlmodel_session.add(link)
         sqlmodel_session.commit()
@@ -98,14 +106,18 @@ def resume(make_resume):
 
 
 @pytest.fixture
-def make_application(sqlmodel_session: Session):
+def make_application(sqlmodel_session: Session, job: Job):
     def make(**kwargs):
         application = Application(
-            firstname=kwargs.get("firstname") or secrets.token_hex(12),
-            lastname=kwargs.get("lastname") or secrets.token_hex(12),
-            email=kwargs.get("email") or f"{secrets.token_hex(16)}@example.com",
-            phone=kwargs.get("phone") or 1234,
-            resume=kwargs.get("resume") or "resume",
+            job_id=kwargs.get("job_id") or job.id,
+            status=kwargs.get("status") or "applied",
+            overall_score=kwargs.get("overall_score"),
+            applicant=Applicant(
+                firstname=kwargs.get("firstname") or secrets.token_hex(12),
+                lastname=kwargs.get("lastname") or secrets.token_hex(12),
+                email=kwargs.get("email") or f"{secrets.token_hex(16)}@example.com",
+                phone=kwargs.get("phone") or "1234",
+            ),
         )
 
         sqlmodel_session.add(application)
@@ -124,12 +136,12 @@ def application(make_application, request):
     lastname = param.get("lastname", None)
     email = param.get("email", None)
     phone = param.get("phone", None)
-    resume = param.get("resume", None)
+    status = param.get("status", None)
 
     return make_application(
         firstname=firstname,
         lastname=lastname,
         email=email,
         phone=phone,
-        resume=resume,
+        status=status,
     )
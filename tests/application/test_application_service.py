@@ -1,23 +1,59 @@
+import csv
+import json
+import re
 from datetime import datetime
-from io import BytesIO
+from io import BytesIO, StringIO
+from types import SimpleNamespace
 
+import pytest
 from minio import Minio
-from sqlmodel import Session
+from minio.error import S3Error
+from urllib3.exceptions import MaxRetryError
+from sqlalchemy import delete as sql_delete
+from sqlmodel import Session, select
 
+from src.talentgate.application import service as application_service
+from src.talentgate.application.enums import ApplicationExportFormat, ApplicationStatus
 from src.talentgate.application.models import (
     Application,
+    ApplicationRankingQueryParameters,
+    ApplicationKey,
+    ApplicationStatusTransition,
+    CreateApplicant,
     CreateApplication,
+    CreatedEducationEvaluation,
+    CreatedExperienceEvaluation,
+    CreateEvaluation,
+    EducationEvaluation,
+    Evaluation,
+    ExperienceEvaluation,
     UpdateApplication,
 )
 from src.talentgate.application.service import (
     create,
+    create_evaluations,
     delete,
+    evaluate_job_applications,
+    export_applications,
+    retrieve_ranking,
+    transition_status,
+    write_export,
     retrieve_by_email,
     retrieve_by_id,
     retrieve_by_phone,
+    retrieve_evaluation_progress,
     retrieve_resume,
     update,
+    upsert,
 )
+from src.talentgate.job import service as job_service
+from src.talentgate.job.models import Job
+from src.talentgate.resume import service as resume_service
+from src.talentgate.counter.enums import CounterScope
+from src.talentgate.counter.service import reconcile, retrieve_job_application_counters
+from src.talentgate.email.models import EmailOutbox
+from src.talentgate.skill import service as skill_service
+from src.talentgate.skill.models import ApplicantSkill
 
 
 async def test_create_resume(minio_client: Minio) -> None:
@@ -120,3 +156,446 @@ async def test_delete(sqlmodel_session, make_application) -> None:
     )
 
     assert retrieved_application.firstname == deleted_application.firstname
+
+
+class GeminiModels:
+    async def generate_content(self, *, model, contents, config):
+        keys = re.findall(r"RESUME (\S+):\n(.*)", contents)
+        results = [
+            {"id": key, "evaluation": {"overall_score": 80.0}} for key, resume in keys if "unparseable" not in resume
+        ]
+
+        return SimpleNamespace(text=json.dumps(results))
+
+
+class GeminiCaches:
+    async def create(self, *, model, config):
+        return SimpleNamespace(name="cachedContents/test")
+
+    async def delete(self, *, name):
+        pass
+
+
+async def test_evaluate_job_applications(
+    monkeypatch, sqlmodel_session: Session, redis_client, minio_client: Minio, job: Job, make_application
+) -> None:
+    monkeypatch.setattr(resume_service, "convert", lambda file: file.decode())
+    monkeypatch.setattr(
+        resume_service, "client", SimpleNamespace(aio=SimpleNamespace(models=GeminiModels(), caches=GeminiCaches()))
+    )
+
+    completed, skipped, unparseable, missing = (make_application() for _ in range(4))
+
+    for application, object_name, resume in (
+        (completed, f"jobs/{job.id}/applications/{completed.id}/resume", b"python engineer"),
+        (skipped, f"jobs/{job.id}/applications/{skipped.id}/resume", b"pastry chef"),
+        (
+            unparseable,
+            f"companies/{job.company_id}/jobs/{job.id}/applications/{unparseable.id}/resume",
+            b"unparseable python engineer",
+        ),
+    ):
+        minio_client.put_object(bucket_name="talentgate", object_name=object_name, data=resume, length=len(resume))
+
+    job.description = "python engineer"
+
+    await evaluate_job_applications(
+        sqlmodel_session=sqlmodel_session,
+        redis_client=redis_client,
+        minio_client=minio_client,
+        bucket_name="talentgate",
+        retrieved_job=job,
+        batch_size=2,
+        concurrency=2,
+        similarity_threshold=0.1,
+    )
+
+    progress = await retrieve_evaluation_progress(redis_client=redis_client, job_id=job.id)
+
+    assert progress.status == "completed"
+    assert (progress.total, progress.completed, progress.failed, progress.skipped) == (4, 1, 2, 1)
+
+    sqlmodel_session.refresh(completed)
+    sqlmodel_session.refresh(missing)
+
+    assert completed.overall_score == 80.0
+    assert missing.overall_score is None
+
+
+async def test_evaluate_job_applications_unreadable_resumes(
+    monkeypatch, sqlmodel_session: Session, redis_client, minio_client: Minio, job: Job, make_application
+) -> None:
+    monkeypatch.setattr(resume_service, "convert", lambda file: file.decode())
+    monkeypatch.setattr(
+        resume_service, "client", SimpleNamespace(aio=SimpleNamespace(models=GeminiModels(), caches=GeminiCaches()))
+    )
+
+    completed, denied, unreachable = (make_application() for _ in range(3))
+
+    def read_resume(*, minio_client, bucket_name, object_name):
+        if str(denied.id) in object_name:
+            raise S3Error(None, "AccessDenied", "Access denied.", object_name, None, None)
+        if str(unreachable.id) in object_name:
+            raise MaxRetryError(None, object_name)
+
+        return b"python engineer"
+
+    monkeypatch.setattr(application_service, "read_resume", read_resume)
+
+    await evaluate_job_applications(
+        sqlmodel_session=sqlmodel_session,
+        redis_client=redis_client,
+        minio_client=minio_client,
+        bucket_name="talentgate",
+        retrieved_job=job,
+        batch_size=2,
+        concurrency=2,
+    )
+
+    progress = await retrieve_evaluation_progress(redis_client=redis_client, job_id=job.id)
+
+    assert progress.status == "completed"
+    assert (progress.total, progress.completed, progress.failed) == (3, 1, 2)
+
+    sqlmodel_session.refresh(completed)
+
+    assert completed.overall_score == 80.0
+
+
+async def test_evaluate_job_applications_failure(
+    monkeypatch, sqlmodel_session: Session, redis_client, minio_client: Minio, job: Job, application: Application
+) -> None:
+    async def evaluate(**kwargs):
+        await kwargs["on_progress"](0, 1, 0)
+        raise RuntimeError
+
+    monkeypatch.setattr(resume_service, "evaluate", evaluate)
+
+    with pytest.raises(RuntimeError):
+        await evaluate_job_applications(
+            sqlmodel_session=sqlmodel_session,
+            redis_client=redis_client,
+            minio_client=minio_client,
+            bucket_name="talentgate",
+            retrieved_job=job,
+            batch_size=2,
+            concurrency=2,
+        )
+
+    progress = await retrieve_evaluation_progress(redis_client=redis_client, job_id=job.id)
+
+    assert progress.status == "failed"
+    assert (progress.total, progress.completed, progress.failed) == (1, 0, 1)
+
+
+async def test_retrieve_ranking(sqlmodel_session: Session, job: Job, make_application) -> None:
+    applications = [make_application(overall_score=score) for score in (90.0, 80.0, 80.0, 70.0, None)]
+    tied = sorted(application.id for application in applications[1:3])
+
+    first_page = await retrieve_ranking(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job.id,
+        query_parameters=ApplicationRankingQueryParameters(limit=2),
+    )
+
+    assert [application.id for application in first_page] == [applications[0].id, tied[0]]
+    assert first_page[0].firstname == applications[0].applicant.firstname
+
+    second_page = await retrieve_ranking(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job.id,
+        query_parameters=ApplicationRankingQueryParameters(
+            limit=2, after_score=first_page[-1].overall_score, after_id=first_page[-1].id
+        ),
+    )
+
+    assert [application.id for application in second_page] == [tied[1], applications[3].id]
+    assert [application.percentile for application in first_page + second_page] == pytest.approx(
+        [1.0, 1 / 3, 1 / 3, 0.0]
+    )
+
+
+async def test_retrieve_ranking_score_range(sqlmodel_session: Session, job: Job, make_application) -> None:
+    for score in (90.0, 80.0, 70.0, 60.0):
+        make_application(overall_score=score)
+
+    ranking = await retrieve_ranking(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job.id,
+        query_parameters=ApplicationRankingQueryParameters(min_score=65.0, max_score=85.0),
+    )
+
+    # the percentile stays relative to every evaluated application of the job
+    assert [(application.overall_score, application.percentile) for application in ranking] == [
+        (80.0, pytest.approx(2 / 3)),
+        (70.0, pytest.approx(1 / 3)),
+    ]
+
+
+async def test_retrieve_ranking_other_job(sqlmodel_session: Session, job: Job, make_job, make_application) -> None:
+    make_application(overall_score=90.0)
+
+    ranking = await retrieve_ranking(
+        sqlmodel_session=sqlmodel_session,
+        job_id=make_job().id,
+        query_parameters=ApplicationRankingQueryParameters(),
+    )
+
+    assert ranking == []
+
+
+async def test_export_applications(sqlmodel_session: Session, job: Job, make_job, make_application) -> None:
+    applications = [make_application(overall_score=score) for score in (90.0, None, 70.0)]
+    make_application(job_id=make_job().id)
+
+    sqlmodel_session.add(Evaluation(application_id=applications[0].id, overview="overview", overall_score=90.0))
+    sqlmodel_session.commit()
+
+    rows = list(export_applications(sqlmodel_session=sqlmodel_session, job_id=job.id, batch_size=2))
+
+    assert [row["id"] for row in rows] == [str(application.id) for application in applications]
+    assert rows[0]["email"] == applications[0].applicant.email
+    assert rows[0]["overview"] == "overview"
+    assert rows[1]["overall_score"] is None
+
+
+async def test_write_export() -> None:
+    rows = [
+        {"id": "1", "status": "applied", "firstname": "Jane", "overview": 'says "hi", twice'},
+        {"id": "2", "status": "rejected", "firstname": "Ünal", "overview": "line\nbreak"},
+    ]
+
+    ndjson = "".join(write_export(iter(rows), ApplicationExportFormat.NDJSON))
+
+    assert [json.loads(line) for line in ndjson.splitlines()] == rows
+
+    chunks = list(write_export(iter(rows), ApplicationExportFormat.CSV))
+    exported = list(csv.DictReader(StringIO("".join(chunks))))
+
+    assert len(chunks) == len(rows) + 1
+    assert [{key: row[key] for key in rows[0]} for row in exported] == rows
+    assert exported[0]["lastname"] == ""
+
+
+async def test_transition_status(sqlmodel_session: Session, job: Job, make_application) -> None:
+    applied, other_applied, interview = (
+        make_application(status=status) for status in ("applied", "applied", "interview")
+    )
+    reconcile(sqlmodel_session=sqlmodel_session, scope=CounterScope.JOB, scope_id=job.id)
+    sqlmodel_session.commit()
+
+    transitioned = await transition_status(
+        sqlmodel_session=sqlmodel_session,
+        retrieved_job=job,
+        transition=ApplicationStatusTransition(status=ApplicationStatus.SCREENING, ids=[applied.id, interview.id]),
+    )
+
+    assert [(application.id, application.status) for application in transitioned.updated] == [(applied.id, "screening")]
+    assert transitioned.skipped == [interview.id]
+
+    sqlmodel_session.refresh(other_applied)
+    assert other_applied.status == "applied"
+
+    counters = await retrieve_job_application_counters(sqlmodel_session=sqlmodel_session, job_id=job.id)
+    assert counters.total == 3
+    assert {name: value for name, value in counters.statuses.items() if value} == {
+        "applied": 1,
+        "screening": 1,
+        "interview": 1,
+    }
+
+    emails = sqlmodel_session.exec(select(EmailOutbox)).all()
+    assert [email.to_addrs for email in emails] == [applied.applicant.email]
+
+
+async def test_transition_status_from_status(sqlmodel_session: Session, job: Job, make_application) -> None:
+    applications = [make_application(status=status) for status in ("applied", "screening", "interview", "rejected")]
+
+    transitioned = await transition_status(
+        sqlmodel_session=sqlmodel_session,
+        retrieved_job=job,
+        transition=ApplicationStatusTransition(
+            status=ApplicationStatus.REJECTED, from_status=ApplicationStatus.SCREENING, notify=False
+        ),
+    )
+
+    assert [application.id for application in transitioned.updated] == [applications[1].id]
+    assert transitioned.skipped == []
+    assert sqlmodel_session.exec(select(EmailOutbox)).all() == []
+
+    for application in applications:
+        sqlmodel_session.refresh(application)
+
+    assert [application.status for application in applications] == ["applied", "rejected", "interview", "rejected"]
+
+
+async def test_transition_status_other_job(sqlmodel_session: Session, job: Job, make_job, make_application) -> None:
+    application = make_application(job_id=make_job().id)
+
+    transitioned = await transition_status(
+        sqlmodel_session=sqlmodel_session,
+        retrieved_job=job,
+        transition=ApplicationStatusTransition(status=ApplicationStatus.SCREENING, ids=[application.id]),
+    )
+
+    assert transitioned.updated == []
+    assert transitioned.skipped == [application.id]
+
+
+async def test_upsert(sqlmodel_session: Session, job: Job) -> None:
+    created_application, created = await upsert(
+        sqlmodel_session=sqlmodel_session,
+        application=CreateApplication(
+            job_id=job.id,
+            applicant=CreateApplicant(firstname="firstname", email="Email@Gmail.com", phone="+90 534 654 32 25"),
+        ),
+    )
+
+    assert created
+
+    for applicant in (
+        CreateApplicant(firstname="other", email=" email@gmail.com "),
+        CreateApplicant(firstname="other", email="other@gmail.com", phone="0090 534 654 3225"),
+    ):
+        retrieved_application, created = await upsert(
+            sqlmodel_session=sqlmodel_session,
+            application=CreateApplication(job_id=job.id, applicant=applicant),
+        )
+
+        assert not created
+        assert retrieved_application.id == created_application.id
+        assert retrieved_application.applicant.firstname == "firstname"
+
+    assert len(sqlmodel_session.exec(select(Application)).all()) == 1
+    assert {key.key for key in sqlmodel_session.exec(select(ApplicationKey)).all()} == {
+        "email:email@gmail.com",
+        "phone:+905346543225",
+    }
+
+
+async def test_upsert_other_job(sqlmodel_session: Session, job: Job, make_job) -> None:
+    applicant = CreateApplicant(email="email@gmail.com")
+
+    first_application, _ = await upsert(
+        sqlmodel_session=sqlmodel_session,
+        application=CreateApplication(job_id=job.id, applicant=applicant),
+    )
+    second_application, created = await upsert(
+        sqlmodel_session=sqlmodel_session,
+        application=CreateApplication(job_id=make_job().id, applicant=applicant),
+    )
+
+    assert created
+    assert second_application.id != first_application.id
+
+
+async def test_upsert_stale_keys(sqlmodel_session: Session, job: Job) -> None:
+    applicant = CreateApplicant(email="email@gmail.com", phone="+905346543225")
+
+    deleted_application, _ = await upsert(
+        sqlmodel_session=sqlmodel_session,
+        application=CreateApplication(job_id=job.id, applicant=applicant),
+    )
+    deleted_application_id = deleted_application.id
+
+    sqlmodel_session.execute(sql_delete(Application).where(Application.id == deleted_application_id))
+    sqlmodel_session.commit()
+
+    created_application, created = await upsert(
+        sqlmodel_session=sqlmodel_session,
+        application=CreateApplication(job_id=job.id, applicant=applicant),
+    )
+
+    assert created
+    assert created_application.id != deleted_application_id
+    assert {key.application_id for key in sqlmodel_session.exec(select(ApplicationKey)).all()} == {
+        created_application.id
+    }
+
+
+async def test_upsert_partially_stale_keys(sqlmodel_session: Session, job: Job) -> None:
+    deleted_application, _ = await upsert(
+        sqlmodel_session=sqlmodel_session,
+        application=CreateApplication(job_id=job.id, applicant=CreateApplicant(email="email@gmail.com")),
+    )
+    retrieved_application, _ = await upsert(
+        sqlmodel_session=sqlmodel_session,
+        application=CreateApplication(job_id=job.id, applicant=CreateApplicant(phone="+905346543225")),
+    )
+    retrieved_application_id = retrieved_application.id
+
+    sqlmodel_session.execute(sql_delete(Application).where(Application.id == deleted_application.id))
+    sqlmodel_session.commit()
+
+    upserted_application, created = await upsert(
+        sqlmodel_session=sqlmodel_session,
+        application=CreateApplication(
+            job_id=job.id,
+            applicant=CreateApplicant(email="email@gmail.com", phone="+905346543225"),
+        ),
+    )
+
+    assert not created
+    assert upserted_application.id == retrieved_application_id
+
+
+async def test_delete_reapply(sqlmodel_session: Session, job: Job) -> None:
+    application = CreateApplication(job_id=job.id, applicant=CreateApplicant(email="email@gmail.com"))
+
+    deleted_application, _ = await upsert(sqlmodel_session=sqlmodel_session, application=application)
+    await create_evaluations(
+        sqlmodel_session=sqlmodel_session,
+        evaluations={deleted_application.id: CreateEvaluation(overall_score=80.0)},
+        skills={deleted_application.id: ["python"]},
+    )
+    sqlmodel_session.commit()
+
+    await delete(sqlmodel_session=sqlmodel_session, retrieved_application=deleted_application)
+
+    for model in (ApplicationKey, ApplicantSkill, Evaluation):
+        assert sqlmodel_session.exec(select(model)).all() == []
+
+    created_application, created = await upsert(sqlmodel_session=sqlmodel_session, application=application)
+
+    assert created
+    assert created_application.id != deleted_application.id
+
+
+async def test_create_evaluations(sqlmodel_session: Session, application: Application) -> None:
+    for score in (60.0, 80.0):
+        await create_evaluations(
+            sqlmodel_session=sqlmodel_session,
+            evaluations={
+                application.id: CreateEvaluation(
+                    overall_score=score,
+                    education=CreatedEducationEvaluation(score=score),
+                    experience=CreatedExperienceEvaluation(score=score),
+                )
+            },
+        )
+        sqlmodel_session.commit()
+
+    evaluations = sqlmodel_session.exec(select(Evaluation)).all()
+    education_evaluations = sqlmodel_session.exec(select(EducationEvaluation)).all()
+    experience_evaluations = sqlmodel_session.exec(select(ExperienceEvaluation)).all()
+
+    assert [evaluation.overall_score for evaluation in evaluations] == [80.0]
+    assert [evaluation.evaluation_id for evaluation in education_evaluations] == [evaluations[0].id]
+    assert [evaluation.evaluation_id for evaluation in experience_evaluations] == [evaluations[0].id]
+
+
+async def test_delete_job_applicant_skills(sqlmodel_session: Session, job: Job, make_job, make_application) -> None:
+    deleted_application = make_application()
+    retained_application = make_application(job_id=make_job().id)
+
+    skill_service.replace_applicant_skills(
+        sqlmodel_session=sqlmodel_session,
+        skills={deleted_application.id: ["python"], retained_application.id: ["python"]},
+    )
+    sqlmodel_session.commit()
+
+    await job_service.delete(sqlmodel_session=sqlmodel_session, retrieved_job=job)
+
+    assert [skill.application_id for skill in sqlmodel_session.exec(select(ApplicantSkill)).all()] == [
+        retained_application.id
+    ]
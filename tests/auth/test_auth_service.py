@@ -1,10 +1,13 @@
+import time
 import uuid
+from typing import Any
 
 import pytest
 from redis import Redis
 
 from config import Settings
 from src.talentgate.auth import service as auth_service
+from src.talentgate.auth.keys import SigningKeySet, generate_signing_key, load_signing_keys
 from src.talentgate.user.models import User
 
 
@@ -62,3 +65,118 @@ async def test_retrieve_blacklisted_token(redis_client: Redis) -> None:
     await redis_client.set(name=f"token:blacklist:{jti}", value=jti)
     retrieved_token = await auth_service.retrieve_blacklisted_token(redis_client=redis_client, jti=jti)
     assert retrieved_token == jti
+
+
+async def test_encode_password_async() -> None:
+    encoded_password = await auth_service.encode_password_async(password="password")
+
+    assert await auth_service.verify_password_async(password="password", encoded_password=encoded_password) == True
+    assert await auth_service.verify_password_async(password="invalid", encoded_password=encoded_password) == False
+
+
+async def test_needs_rehash(settings: Settings) -> None:
+    encoded_password = auth_service.encode_password(password="password")
+
+    assert auth_service.needs_rehash(encoded_password=encoded_password) == False
+    assert auth_service.needs_rehash(encoded_password=encoded_password.replace("$r=8$", "$r=4$")) == True
+
+
+async def test_rotate_refresh_token(redis_client: Redis) -> None:
+    fid = str(uuid.uuid4())
+    jti = str(uuid.uuid4())
+    rotated_jti = str(uuid.uuid4())
+
+    assert await auth_service.rotate_refresh_token(redis_client=redis_client, jti=jti, fid=fid, ex=60) == True
+    assert await auth_service.rotate_refresh_token(redis_client=redis_client, jti=jti, fid=fid, ex=60) == False
+    assert await auth_service.rotate_refresh_token(redis_client=redis_client, jti=rotated_jti, fid=fid, ex=60) == False
+
+
+async def test_rotate_refresh_token_revoke_family(redis_client: Redis) -> None:
+    fid = str(uuid.uuid4())
+
+    assert (
+        await auth_service.rotate_refresh_token(
+            redis_client=redis_client, jti=str(uuid.uuid4()), fid=fid, ex=60, revoke_family=True
+        )
+        == True
+    )
+    assert (
+        await auth_service.rotate_refresh_token(redis_client=redis_client, jti=str(uuid.uuid4()), fid=fid, ex=60)
+        == False
+    )
+
+
+async def test_signing_key_set(tmp_path: Any) -> None:
+    generate_signing_key(directory=str(tmp_path))
+    keys = load_signing_keys(directory=str(tmp_path))
+    signing_key_set = SigningKeySet(keys=keys, active_kid=next(iter(keys)))
+
+    token = signing_key_set.encode(payload={"user_id": "1", "exp": time.time() + 60})
+    header, payload, _ = auth_service.decode_token(token=token)
+
+    assert header["alg"] == "EdDSA"
+    assert header["kid"] == signing_key_set.active_kid
+    assert payload["user_id"] == "1"
+    assert signing_key_set.verify(token=token) == True
+    assert signing_key_set.verify(token=token[:-4] + "AAAA") == False
+    assert signing_key_set.jwks()["keys"][0]["kid"] == signing_key_set.active_kid
+
+
+async def test_expired_signing_key_set_token(tmp_path: Any) -> None:
+    generate_signing_key(directory=str(tmp_path))
+    keys = load_signing_keys(directory=str(tmp_path))
+    signing_key_set = SigningKeySet(keys=keys, active_kid=next(iter(keys)))
+
+    token = signing_key_set.encode(payload={"user_id": "1", "exp": time.time() - 1})
+
+    assert signing_key_set.verify(token=token) == False
+
+
+@pytest.mark.parametrize(
+    "host, forwarded_for, client_ip",
+    [
+        ["203.0.113.7", None, "203.0.113.7"],
+        ["203.0.113.7", "198.51.100.1", "203.0.113.7"],
+        ["172.18.0.2", "203.0.113.7", "203.0.113.7"],
+        ["172.18.0.2", "198.51.100.1, 203.0.113.7", "203.0.113.7"],
+        ["172.18.0.2", "203.0.113.7, 172.18.0.3", "203.0.113.7"],
+        ["172.18.0.2", None, "172.18.0.2"],
+        [None, None, "unknown"],
+    ],
+)
+async def test_retrieve_client_ip(host: str | None, forwarded_for: str | None, client_ip: str) -> None:
+    assert (
+        auth_service.retrieve_client_ip(host=host, forwarded_for=forwarded_for, trusted_proxies=["172.16.0.0/12"])
+        == client_ip
+    )
+
+
+async def test_throttle_login(redis_client: Redis) -> None:
+    for attempt in range(1, 3):
+        attempts, retry_after = await auth_service.throttle_login(
+            redis_client=redis_client,
+            email="User@example.com",
+            ip="203.0.113.7",
+            email_limit=2,
+            ip_limit=10,
+            window=60,
+            lockout=30,
+        )
+
+        assert (attempts, retry_after) == (attempt, 0)
+
+    _, retry_after = await auth_service.throttle_login(
+        redis_client=redis_client,
+        email="user@example.com",
+        ip="198.51.100.1",
+        email_limit=2,
+        ip_limit=10,
+        window=60,
+        lockout=30,
+    )
+
+    assert retry_after == 30
+    assert await auth_service.retrieve_login_throttle_stats(redis_client=redis_client) == {
+        "attempts": 3,
+        "lockouts": 1,
+    }
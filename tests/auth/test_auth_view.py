@@ -2,6 +2,8 @@ import pytest
 from fastapi.testclient import TestClient
 from starlette.datastructures import Headers
 
+from config import Settings
+
 from src.talentgate.auth import service as auth_service
 from src.talentgate.user.enums import UserSubscriptionPlan, UserSubscriptionStatus
 from src.talentgate.user.models import User
@@ -268,3 +270,25 @@ async def test_logout_with_invalid_refresh_token(
     )
 
     assert response.status_code == 401
+
+
+@pytest.mark.parametrize(
+    "user",
+    [{"email": "username@example.com", "password": auth_service.encode_password("password")}],
+    indirect=True,
+)
+async def test_login_throttled(client: TestClient, user: User, settings: Settings) -> None:
+    for _ in range(settings.login_throttle_email_limit):
+        client.post(url="/api/v1/auth/login", json={"email": user.email, "password": "invalid_password"})
+
+    response = client.post(url="/api/v1/auth/login", json={"email": user.email, "password": "password"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) == settings.login_throttle_lockout
+
+
+async def test_retrieve_jwks(client: TestClient) -> None:
+    response = client.get(url="/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
@@ -0,0 +1,138 @@
+import inspect
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+
+from tests.company.conftest import (
+    make_company,
+    make_company_employee,
+    make_company_link,
+    make_company_location,
+    make_company_location_address,
+)
+from tests.conftest import engine
+
+REPORT_KEY = "budget/report"
+
+report_key = pytest.StashKey[dict]()
+
+
+@dataclass
+class Measurement:
+    queries: int = 0
+    db_time: float = 0.0
+    allocated: int = 0
+
+
+@contextmanager
+def measure() -> Iterator[Measurement]:
+    """Count the statements run on the test engine, their time and the peak of Python allocations."""
+    measurement = Measurement()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("budget_started_at", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        measurement.queries += 1
+        measurement.db_time += time.perf_counter() - conn.info["budget_started_at"].pop()
+
+    tracing = tracemalloc.is_tracing()
+
+    if not tracing:
+        tracemalloc.start()
+
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+    try:
+        yield measurement
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+        _, peak = tracemalloc.get_traced_memory()
+        measurement.allocated = peak - current
+
+        if not tracing:
+            tracemalloc.stop()
+
+
+async def resolve(result: Any) -> Any:
+    return await result if inspect.isawaitable(result) else result
+
+
+@pytest.fixture
+def budget(request) -> Callable:
+    """
+    Run an operation once to warm the caches, then measure a second run and fail when it exceeds its budget.
+
+        await budget(
+            "company_service.retrieve_by_id",
+            lambda: retrieve_by_id(sqlmodel_session=sqlmodel_session, company_id=company.id),
+            queries=1,
+            db_time=0.05,
+            allocated=64 * 1024,
+        )
+
+    The measurement of every operation is kept for the report printed at the end of the session.
+    """
+
+    async def check(operation: str, call: Callable, *, queries: int, db_time: float, allocated: int) -> Any:
+        await resolve(call())
+
+        with measure() as measurement:
+            result = await resolve(call())
+
+        request.config.stash.setdefault(report_key, {})[operation] = asdict(measurement)
+
+        exceeded = [
+            f"{name} {getattr(measurement, name)} > {limit}"
+            for name, limit in (("queries", queries), ("db_time", db_time), ("allocated", allocated))
+            if getattr(measurement, name) > limit
+        ]
+
+        if exceeded:
+            pytest.fail(f"{operation} exceeded its budget: {', '.join(exceeded)}")
+
+        return result
+
+    return check
+
+
+def format_change(name: str, value: float, previous: float | None) -> str:
+    units = {"queries": (1, "", "d"), "db_time": (1000, "ms", ".1f"), "allocated": (1 / 1024, "KiB", ".1f")}
+    scale, unit, spec = units[name]
+
+    if previous is None:
+        return f"{name}={value * scale:{spec}}{unit} (new)"
+
+    return f"{name}={value * scale:{spec}}{unit} ({(value - previous) * scale:+{spec}}{unit})"
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    report = config.stash.get(report_key, {})
+
+    if not report:
+        return
+
+    cache = getattr(config, "cache", None)
+    previous_report = cache.get(REPORT_KEY, {}) if cache else {}
+
+    terminalreporter.section("budgets")
+
+    for operation, measurement in sorted(report.items()):
+        previous = previous_report.get(operation, {})
+        changes = [format_change(name, value, previous.get(name)) for name, value in measurement.items()]
+        terminalreporter.write_line(f"{operation:<48} {' '.join(changes)}")
+
+    if cache:
+        cache.set(REPORT_KEY, {**previous_report, **report})
@@ -0,0 +1,115 @@
+import secrets
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from starlette.datastructures import Headers
+
+from src.talentgate.company import service as company_service
+from src.talentgate.company.enums import CompanyEmployeeTitle
+from src.talentgate.company.models import Company, CreateCompany
+from src.talentgate.counter import service as counter_service
+from src.talentgate.counter.enums import CounterScope
+from src.talentgate.job import service as job_service
+from src.talentgate.job.models import CreateJob, JobQueryParameters
+
+
+async def test_company_service_create(sqlmodel_session: Session, budget) -> None:
+    await budget(
+        "company_service.create",
+        lambda: company_service.create(
+            sqlmodel_session=sqlmodel_session,
+            company=CreateCompany(name=secrets.token_hex(12)),
+        ),
+        queries=2,
+        db_time=0.05,
+        allocated=96 * 1024,
+    )
+
+
+async def test_company_service_retrieve_by_id(sqlmodel_session: Session, company: Company, budget) -> None:
+    await budget(
+        "company_service.retrieve_by_id",
+        lambda: company_service.retrieve_by_id(sqlmodel_session=sqlmodel_session, company_id=company.id),
+        queries=1,
+        db_time=0.05,
+        allocated=64 * 1024,
+    )
+
+
+async def test_job_service_create(sqlmodel_session: Session, company: Company, budget) -> None:
+    await budget(
+        "job_service.create",
+        lambda: job_service.create(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company.id,
+            job=CreateJob(title="Python Engineer", department="Engineering"),
+        ),
+        queries=5,
+        db_time=0.05,
+        allocated=192 * 1024,
+    )
+
+
+async def test_job_service_insert_jobs(sqlmodel_session: Session, company: Company, budget) -> None:
+    jobs = [CreateJob(title=f"Python Engineer {index}", department="Engineering") for index in range(100)]
+
+    def insert_jobs() -> None:
+        job_service.insert_jobs(sqlmodel_session=sqlmodel_session, company_id=company.id, jobs=jobs)
+        sqlmodel_session.commit()
+
+    # sqlite cannot keep the order of a multi-row RETURNING, so there every job is its own statement
+    await budget("job_service.insert_jobs", insert_jobs, queries=103, db_time=0.5, allocated=1024 * 1024)
+
+
+async def test_job_service_retrieve_by_query_parameters(sqlmodel_session: Session, company: Company, budget) -> None:
+    await budget(
+        "job_service.retrieve_by_query_parameters",
+        lambda: job_service.retrieve_by_query_parameters(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company.id,
+            query_parameters=JobQueryParameters(limit=20),
+        ),
+        queries=3,
+        db_time=0.05,
+        allocated=128 * 1024,
+    )
+
+
+async def test_counter_service_retrieve_company_counters(sqlmodel_session: Session, company: Company, budget) -> None:
+    # the fixture company has no counter rows yet, the budget is for reading maintained counters
+    counter_service.reconcile(sqlmodel_session=sqlmodel_session, scope=CounterScope.COMPANY, scope_id=company.id)
+    sqlmodel_session.commit()
+
+    await budget(
+        "counter_service.retrieve_company_counters",
+        lambda: counter_service.retrieve_company_counters(sqlmodel_session=sqlmodel_session, company_id=company.id),
+        queries=1,
+        db_time=0.05,
+        allocated=64 * 1024,
+    )
+
+
+@pytest.mark.parametrize("company_employee", [{"title": CompanyEmployeeTitle.FOUNDER}], indirect=True)
+async def test_retrieve_current_company(client: TestClient, company: Company, headers: Headers, budget) -> None:
+    response = await budget(
+        "GET /api/v1/me/company",
+        lambda: client.get(url="/api/v1/me/company", headers=headers),
+        queries=2,
+        db_time=0.05,
+        allocated=128 * 1024,
+    )
+
+    assert response.status_code == 200
+
+
+async def test_retrieve_career_jobs(client: TestClient, company: Company, budget) -> None:
+    response = await budget(
+        "GET /api/v1/careers/companies/{company_id}/jobs",
+        lambda: client.get(url=f"/api/v1/careers/companies/{company.id}/jobs"),
+        queries=3,
+        db_time=0.05,
+        allocated=192 * 1024,
+    )
+
+    assert response.status_code == 200
@@ -13,9 +13,16 @@ from src.talentgate.company.service import (
     retrieve_by_name,
     upload_logo,
     retrieve_logo,
+    invite_employees,
 )
+from src.talentgate.company.models import CompanyInvitation
+from src.talentgate.email.models import EmailOutbox
+from sqlmodel import select
 
 from src.talentgate.job.models import Job, JobQueryParameters
+from src.talentgate.application.models import Application
+from src.talentgate.skill import service as skill_service
+from src.talentgate.skill.models import ApplicantSkill
 
 
 async def test_upload_logo(minio_client: Minio):
@@ -127,3 +134,42 @@ async def test_delete(sqlmodel_session: Session, company: Company) -> None:
 
     assert deleted_company.name == company.name
     assert deleted_company.overview == company.overview
+
+
+async def test_delete_applicant_skills(sqlmodel_session: Session, company: Company) -> None:
+    deleted_application = Application(job=Job(title="deleted", company_id=company.id))
+    retained_application = Application(job=Job(title="retained"))
+
+    sqlmodel_session.add_all([deleted_application, retained_application])
+    sqlmodel_session.commit()
+
+    skill_service.replace_applicant_skills(
+        sqlmodel_session=sqlmodel_session,
+        skills={deleted_application.id: ["python"], retained_application.id: ["python"]},
+    )
+    sqlmodel_session.commit()
+
+    await delete(sqlmodel_session=sqlmodel_session, retrieved_company=company)
+
+    assert [skill.application_id for skill in sqlmodel_session.exec(select(ApplicantSkill)).all()] == [
+        retained_application.id
+    ]
+
+
+async def test_invite_employees(sqlmodel_session: Session, company: Company) -> None:
+    contexts = {
+        f"{uuid4().hex}@talentgate.com": {"company_name": company.name, "link": "first"},
+        f"{uuid4().hex}@talentgate.com": {"company_name": company.name, "link": "second"},
+    }
+
+    await invite_employees(sqlmodel_session=sqlmodel_session, company_id=company.id, contexts=contexts)
+    await invite_employees(sqlmodel_session=sqlmodel_session, company_id=company.id, contexts=contexts)
+
+    invitations = sqlmodel_session.exec(
+        select(CompanyInvitation).where(CompanyInvitation.email.in_(list(contexts)))
+    ).all()
+    emails = sqlmodel_session.exec(select(EmailOutbox).where(EmailOutbox.to_addrs.in_(list(contexts)))).all()
+
+    assert sorted(invitation.email for invitation in invitations) == sorted(contexts)
+    assert all(invitation.company_id == company.id for invitation in invitations)
+    assert len(emails) == 4
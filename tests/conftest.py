@@ -10,6 +10,7 @@ from typing import Any, BinaryIO, Sequence, Optional, Dict
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from minio import Minio
+from minio.error import S3Error
 from minio.helpers import ObjectWriteResult
 from redis import Redis
 from redis.typing import EncodableT, ExpiryT, KeyT
@@ -19,6 +20,7 @@ from urllib3 import BaseHTTPResponse, HTTPHeaderDict, HTTPResponse
 
 from config import Settings, get_settings
 from src.talentgate.application.views import router as application_router
+from src.talentgate.auth import service as auth_service
 from src.talentgate.auth.views import router as auth_router
 
 from src.talentgate.company.views import router as company_router
@@ -75,6 +77,19 @@ async def sqlmodel_session(app: FastAPI) -> AsyncGenerator[Session, Any]:
     connection.close()
 
 
+@pytest.fixture
+async def savepoint_sqlmodel_session(app: FastAPI) -> AsyncGenerator[Session, Any]:
+    """Session whose own rollbacks stop at a savepoint, for code that rolls back on purpose."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    SQLModel.metadata.create_all(engine)
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
 @pytest.fixture
 async def email_client() -> Any:
     class SMTPClient:
@@ -106,6 +121,10 @@ async def redis_client() -> Any:
     class RedisClient:
         def __init__(self):
             self.store = {}
+            self.scripts = {
+                auth_service.LOGIN_THROTTLE_SCRIPT: self.throttle_login,
+                auth_service.ROTATE_REFRESH_TOKEN_SCRIPT: self.rotate_refresh_token,
+            }
 
         async def set(
             self,
@@ -119,9 +138,95 @@ async def redis_client() -> Any:
         async def get(self, name: KeyT):
             return self.store.get(name)
 
+        async def delete(self, *names: KeyT):
+            return sum(self.store.pop(name, None) is not None for name in names)
+
+        async def hgetall(self, name: KeyT):
+            return {key: str(value) for key, value in self.store.get(name, {}).items()}
+
+        async def eval(self, script: str, numkeys: int, *keys_and_args: Any):
+            return self.scripts[script](list(keys_and_args[:numkeys]), list(keys_and_args[numkeys:]))
+
+        def hincrby(self, name: KeyT, key: str, amount: int = 1):
+            hash_ = self.store.setdefault(name, {})
+            hash_[key] = hash_.get(key, 0) + amount
+            return hash_[key]
+
+        def throttle_login(self, keys: list, args: list):
+            now, window, lockout, member, *limits = args
+            windows = (len(keys) - 1) // 2
+            stats = keys[-1]
+            self.hincrby(stats, "attempts")
+
+            def result(attempts: int, retry_after: int) -> list:
+                return [attempts, retry_after, [item for pair in self.store[stats].items() for item in pair]]
+
+            for lock in keys[windows : 2 * windows]:
+                if self.store.get(lock, 0) > now:
+                    self.hincrby(stats, "rejected")
+                    return result(0, self.store[lock] - now)
+
+            attempts = 0
+
+            for index, key in enumerate(keys[:windows]):
+                window_ = [score for score in self.store.get(key, []) if score > now - window]
+                window_.append(now)
+                self.store[key] = window_
+
+                if len(window_) > int(limits[index]):
+                    self.store[keys[windows + index]] = now + lockout
+                    self.hincrby(stats, "lockouts")
+                    return result(0, lockout)
+
+                if index == 0:
+                    attempts = len(window_)
+
+            return result(attempts, 0)
+
+        def rotate_refresh_token(self, keys: list, args: list):
+            token, family = keys
+            jti, ex, revoke_family = args
+
+            if family in self.store:
+                return -1
+
+            if token in self.store:
+                self.store[family] = jti
+                return 0
+
+            self.store[token] = jti
+
+            if revoke_family:
+                self.store[family] = jti
+
+            return 1
+
+        def pipeline(self, transaction: bool = True):
+            return RedisPipeline(self)
+
         async def close(self):
             pass
 
+    class RedisPipeline:
+        def __init__(self, client):
+            self.client = client
+            self.commands = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+        def hset(self, name: KeyT, mapping: dict):
+            self.commands.append(lambda: self.client.store.setdefault(name, {}).update(mapping))
+
+        def expire(self, name: KeyT, time: ExpiryT):
+            self.commands.append(lambda: True)
+
+        async def execute(self):
+            return [command() for command in self.commands]
+
     return RedisClient()
 
 
@@ -187,6 +292,18 @@ def minio_client() -> Any:
             bucket_name: str,
             object_name: str,
         ) -> BaseHTTPResponse:
+            if object_name not in self.buckets.get(bucket_name, {}):
+                raise S3Error(
+                    response=HTTPResponse(status=404),
+                    code="NoSuchKey",
+                    message="The specified key does not exist.",
+                    resource=f"/{bucket_name}/{object_name}",
+                    request_id="",
+                    host_id="",
+                    bucket_name=bucket_name,
+                    object_name=object_name,
+                )
+
             data = self.buckets[bucket_name][object_name]
 
             if hasattr(data, "getvalue"):
@@ -279,6 +396,7 @@ def settings() -> Settings:
         refresh_token_expiration=86400,
         refresh_token_key="ZcQ5TRjUmn28XeFoBKHvAGd0wL7iyE6Y",
         minio_default_bucket="talentgate",
+        login_throttle_delay=0.0,
     )
 
 
@@ -0,0 +1,102 @@
+import secrets
+
+from sqlmodel import Session
+
+from src.talentgate.application.models import Application
+from src.talentgate.company.models import Company, CompanyEmployee, CompanyInvitation
+from src.talentgate.counter.enums import CompanyCounterName, CounterScope
+from src.talentgate.counter.service import (
+    increment,
+    reconcile,
+    retrieve_company_counters,
+    retrieve_job_application_counters,
+)
+from src.talentgate.job.models import CreateJob
+from src.talentgate.job.service import create, delete
+
+
+async def test_increment(sqlmodel_session: Session) -> None:
+    company = Company(name=secrets.token_hex(12))
+
+    sqlmodel_session.add(company)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(company)
+
+    for amount in (1, 2, -1):
+        increment(
+            sqlmodel_session=sqlmodel_session,
+            scope=CounterScope.COMPANY,
+            scope_id=company.id,
+            name=CompanyCounterName.INVITATIONS.value,
+            amount=amount,
+        )
+    sqlmodel_session.commit()
+
+    counters = await retrieve_company_counters(sqlmodel_session=sqlmodel_session, company_id=company.id)
+
+    assert counters.invitations == 2
+    assert counters.jobs == 0
+
+
+async def test_company_counters_without_rows(sqlmodel_session: Session) -> None:
+    company = Company(
+        name=secrets.token_hex(12),
+        employees=[CompanyEmployee(title="founder")],
+        invitations=[CompanyInvitation(email="first@talentgate.com"), CompanyInvitation(email="second@talentgate.com")],
+    )
+
+    sqlmodel_session.add(company)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(company)
+
+    counters = await retrieve_company_counters(sqlmodel_session=sqlmodel_session, company_id=company.id)
+
+    assert counters.employees == 1
+    assert counters.invitations == 2
+    assert counters.jobs == 0
+
+
+async def test_job_counters(sqlmodel_session: Session) -> None:
+    company = Company(name=secrets.token_hex(12))
+
+    sqlmodel_session.add(company)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(company)
+
+    first_job = await create(sqlmodel_session=sqlmodel_session, company_id=company.id, job=CreateJob(title="first"))
+    second_job = await create(sqlmodel_session=sqlmodel_session, company_id=company.id, job=CreateJob(title="second"))
+
+    assert (await retrieve_company_counters(sqlmodel_session=sqlmodel_session, company_id=company.id)).jobs == 2
+
+    await delete(sqlmodel_session=sqlmodel_session, retrieved_job=second_job)
+
+    assert (await retrieve_company_counters(sqlmodel_session=sqlmodel_session, company_id=company.id)).jobs == 1
+
+    sqlmodel_session.add_all(
+        [Application(job_id=first_job.id, status=status) for status in ("applied", "applied", "interview")]
+    )
+    sqlmodel_session.commit()
+
+    counters = await retrieve_job_application_counters(sqlmodel_session=sqlmodel_session, job_id=first_job.id)
+
+    assert counters.total == 0
+
+    reconcile(sqlmodel_session=sqlmodel_session, scope=CounterScope.JOB, scope_id=first_job.id)
+    sqlmodel_session.commit()
+
+    counters = await retrieve_job_application_counters(sqlmodel_session=sqlmodel_session, job_id=first_job.id)
+
+    assert counters.total == 3
+    assert counters.statuses == {"applied": 2, "interview": 1}
+
+    increment(
+        sqlmodel_session=sqlmodel_session,
+        scope=CounterScope.COMPANY,
+        scope_id=company.id,
+        name=CompanyCounterName.JOBS.value,
+        amount=5,
+    )
+    reconcile(sqlmodel_session=sqlmodel_session, scope=CounterScope.COMPANY)
+    sqlmodel_session.commit()
+
+    assert (await retrieve_company_counters(sqlmodel_session=sqlmodel_session, company_id=company.id)).jobs == 1
@@ -0,0 +1,70 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from src.talentgate.database.partition import (
+    add_months,
+    create_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+def test_month_start() -> None:
+    assert month_start(datetime(2026, 3, 31, 23, 59, tzinfo=UTC).timestamp()) == datetime(2026, 3, 1, tzinfo=UTC)
+
+
+def test_add_months() -> None:
+    assert add_months(datetime(2026, 11, 1, tzinfo=UTC), 2) == datetime(2027, 1, 1, tzinfo=UTC)
+    assert add_months(datetime(2026, 1, 1, tzinfo=UTC), -13) == datetime(2024, 12, 1, tzinfo=UTC)
+
+
+def test_partition_name() -> None:
+    month = datetime(2026, 4, 1, tzinfo=UTC)
+
+    assert partition_name("application", month) == "application_2026_04"
+    assert partition_month("application_2026_04") == month
+    assert partition_month("application_default") is None
+
+
+class PartitionSession:
+    """Records the statements of create_partitions against a table with the given partitions."""
+
+    def __init__(self, partitions, defaulted):
+        self.partitions = partitions
+        self.defaulted = defaulted
+        self.statements = []
+
+    def execute(self, statement, parameters=None):
+        sql = str(statement)
+
+        if "pg_inherits" in sql:
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.partitions))
+
+        self.statements.append(sql.split(" WHERE ")[0])
+
+        return SimpleNamespace(scalar=lambda: parameters["start"] in self.defaulted)
+
+
+async def test_create_partitions() -> None:
+    march, april = datetime(2026, 3, 1, tzinfo=UTC), datetime(2026, 4, 1, tzinfo=UTC)
+    sqlmodel_session = PartitionSession(
+        partitions=["application_2026_02", "application_2026_03", "application_default"],
+        defaulted={april.timestamp()},
+    )
+
+    names = await create_partitions(sqlmodel_session=sqlmodel_session, table="application", start=march, months=3)
+
+    assert names == ["application_2026_03", "application_2026_04", "application_2026_05"]
+    assert sqlmodel_session.statements == [
+        "SELECT EXISTS (SELECT FROM application_default",
+        "ALTER TABLE application DETACH PARTITION application_default",
+        f"CREATE TABLE application_2026_04 PARTITION OF application "
+        f"FOR VALUES FROM ({april.timestamp()}) TO ({add_months(april, 1).timestamp()})",
+        "INSERT INTO application_2026_04 SELECT * FROM application_default",
+        "DELETE FROM application_default",
+        "ALTER TABLE application ATTACH PARTITION application_default DEFAULT",
+        "SELECT EXISTS (SELECT FROM application_default",
+        f"CREATE TABLE application_2026_05 PARTITION OF application "
+        f"FOR VALUES FROM ({add_months(april, 1).timestamp()}) TO ({add_months(april, 2).timestamp()})",
+    ]
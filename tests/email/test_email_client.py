@@ -0,0 +1,81 @@
+import smtplib
+from email.message import EmailMessage
+from typing import Any
+
+import pytest
+
+from src.talentgate.email.client import EmailClient
+
+
+class SMTP:
+    instances: list["SMTP"] = []
+
+    def __init__(self, host: str, port: int, timeout: float) -> None:
+        self.messages: list[EmailMessage] = []
+        self.disconnected = False
+        SMTP.instances.append(self)
+
+    def starttls(self) -> None:
+        pass
+
+    def login(self, user: str, password: str) -> None:
+        pass
+
+    def noop(self) -> tuple[int, bytes]:
+        return 250, b"OK"
+
+    def send_message(self, msg: EmailMessage) -> None:
+        if self.disconnected:
+            raise smtplib.SMTPServerDisconnected
+        self.messages.append(msg)
+
+    def quit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def smtp(monkeypatch: Any) -> type[SMTP]:
+    SMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP", SMTP)
+    return SMTP
+
+
+def make_message(to_addrs: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg.add_header("Subject", "Subject")
+    msg.add_header("To", to_addrs)
+    msg.set_content("Body")
+    return msg
+
+
+async def test_send_messages_reuses_connection(smtp: type[SMTP]) -> None:
+    email_client = EmailClient(host="smtp.example.com", port=587, user="user", password="password")
+
+    email_client.send_messages([make_message(f"user{i}@example.com") for i in range(5)])
+    email_client.send_email(subject="Subject", body="Body", html="<p>Body</p>", to_addrs="user@example.com")
+
+    assert len(smtp.instances) == 1
+    assert len(smtp.instances[0].messages) == 6
+    assert email_client.metrics.snapshot()["sent"] == 6
+
+
+async def test_send_messages_recycles_connection(smtp: type[SMTP]) -> None:
+    email_client = EmailClient(host="smtp.example.com", port=587, user="user", password="password", max_messages=2)
+
+    email_client.send_messages([make_message(f"user{i}@example.com") for i in range(5)])
+
+    assert len(smtp.instances) == 3
+
+
+async def test_send_messages_reconnects(smtp: type[SMTP]) -> None:
+    email_client = EmailClient(host="smtp.example.com", port=587, user="user", password="password")
+
+    email_client.send_messages([make_message("user@example.com")])
+    smtp.instances[0].disconnected = True
+    email_client.send_messages([make_message("user@example.com")])
+
+    assert len(smtp.instances) == 2
+    assert email_client.metrics.snapshot()["reconnects"] == 1
@@ -0,0 +1,146 @@
+import smtplib
+from typing import Any
+
+from sqlmodel import Session
+
+from src.talentgate.email import service as email_service
+from src.talentgate.email import worker as email_worker
+from src.talentgate.email.enums import EmailOutboxStatus
+
+
+async def test_enqueue_email(sqlmodel_session: Session) -> None:
+    created_email = await email_service.enqueue_email(
+        sqlmodel_session=sqlmodel_session,
+        subject="Subject",
+        body="Hello {firstname}",
+        html="<p>Hello {firstname}</p>",
+        context={"firstname": "firstname"},
+        from_addr="from@example.com",
+        to_addrs=["user1@example.com", "user2@example.com"],
+    )
+
+    assert created_email.status == EmailOutboxStatus.PENDING
+    assert created_email.body == "Hello firstname"
+    assert created_email.to_addrs == "user1@example.com, user2@example.com"
+
+
+async def test_process_outbox(sqlmodel_session: Session, email_client: Any) -> None:
+    created_email = await email_service.enqueue_email(
+        sqlmodel_session=sqlmodel_session,
+        subject="Subject",
+        body="Body",
+        html="<p>Body</p>",
+        context={},
+        to_addrs="user@example.com",
+    )
+
+    processed = await email_worker.process_outbox(
+        sqlmodel_session=sqlmodel_session,
+        email_client=email_client,
+        batch_size=10,
+    )
+
+    assert processed == 1
+    assert len(email_client.inbox) == 1
+    assert created_email.status == EmailOutboxStatus.SENT
+    assert created_email.attempts == 1
+
+
+async def test_process_outbox_retries(sqlmodel_session: Session, email_client: Any) -> None:
+    def send_email(**kwargs: Any) -> None:
+        raise smtplib.SMTPServerDisconnected
+
+    email_client.send_email = send_email
+
+    created_email = await email_service.enqueue_email(
+        sqlmodel_session=sqlmodel_session,
+        subject="Subject",
+        body="Body",
+        html="<p>Body</p>",
+        context={},
+        to_addrs="user@example.com",
+    )
+
+    await email_worker.process_outbox(sqlmodel_session=sqlmodel_session, email_client=email_client, batch_size=10)
+
+    assert created_email.status == EmailOutboxStatus.PENDING
+    assert created_email.attempts == 1
+    assert created_email.available_at > created_email.created_at
+
+    processed = await email_worker.process_outbox(
+        sqlmodel_session=sqlmodel_session,
+        email_client=email_client,
+        batch_size=10,
+    )
+
+    assert processed == 0
+
+
+async def test_process_outbox_continues_after_failure(sqlmodel_session: Session, email_client: Any) -> None:
+    send_email = email_client.send_email
+
+    def send_or_fail(**kwargs: Any) -> None:
+        if kwargs["subject"] == "Broken":
+            raise ValueError("invalid header")
+        send_email(**kwargs)
+
+    email_client.send_email = send_or_fail
+
+    broken_email, created_email = [
+        await email_service.enqueue_email(
+            sqlmodel_session=sqlmodel_session,
+            subject=subject,
+            body="Body",
+            html="<p>Body</p>",
+            context={},
+            to_addrs="user@example.com",
+        )
+        for subject in ("Broken", "Subject")
+    ]
+
+    processed = await email_worker.process_outbox(
+        sqlmodel_session=sqlmodel_session,
+        email_client=email_client,
+        batch_size=10,
+    )
+
+    assert processed == 2
+    assert broken_email.status == EmailOutboxStatus.FAILED
+    assert broken_email.last_error == "invalid header"
+    assert created_email.status == EmailOutboxStatus.SENT
+    assert len(email_client.inbox) == 1
+
+
+async def test_process_outbox_skips_unwritable_row(monkeypatch, sqlmodel_session: Session, email_client: Any) -> None:
+    broken_email, created_email = [
+        await email_service.enqueue_email(
+            sqlmodel_session=sqlmodel_session,
+            subject=subject,
+            body="Body",
+            html="<p>Body</p>",
+            context={},
+            to_addrs="user@example.com",
+        )
+        for subject in ("Broken", "Subject")
+    ]
+    sqlmodel_session.commit()
+
+    mark_email_sent = email_service.mark_email_sent
+
+    def mark_sent(retrieved_email):
+        mark_email_sent(retrieved_email)
+        if retrieved_email.subject == "Broken":
+            retrieved_email.status = None
+        return retrieved_email
+
+    monkeypatch.setattr(email_service, "mark_email_sent", mark_sent)
+
+    processed = await email_worker.process_outbox(
+        sqlmodel_session=sqlmodel_session,
+        email_client=email_client,
+        batch_size=10,
+    )
+
+    assert processed == 2
+    assert created_email.status == EmailOutboxStatus.SENT
+    assert broken_email.status == EmailOutboxStatus.PENDING
@@ -0,0 +1,23 @@
+from src.talentgate.job.geohash import cover, distance, encode, successor
+
+
+def test_encode() -> None:
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_distance() -> None:
+    assert round(distance(52.5200, 13.4050, 48.8566, 2.3522)) == 877
+
+
+def test_cover() -> None:
+    cells = cover(41.0082, 28.9784, 10)
+
+    assert len(cells) == 9
+    assert any(encode(41.0082, 28.9784).startswith(cell) for cell in cells)
+    assert any(encode(41.0, 29.08).startswith(cell) for cell in cells)
+
+
+def test_successor() -> None:
+    assert successor("sxk") == "sxm"
+    assert successor("u4z") == "u5"
+    assert successor("zz") is None
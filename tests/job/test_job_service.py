@@ -1,8 +1,33 @@
+import secrets
+
 from sqlmodel import Session
 
+from src.talentgate.company.models import Company
 from src.talentgate.job.enums import JobEmploymentType
-from src.talentgate.job.models import CreateJob, Job, UpdateJob
-from src.talentgate.job.service import create, delete, retrieve_by_id, update
+from src.talentgate.job.models import (
+    CreateJob,
+    CreateJobLocation,
+    CreateSalary,
+    Job,
+    JobFacetCount,
+    JobQueryParameters,
+    UpdateJob,
+)
+from src.talentgate.job.service import (
+    create,
+    create_location,
+    delete,
+    import_jobs,
+    read_csv_rows,
+    read_jsonl_rows,
+    retrieve_by_id,
+    retrieve_cached_facets_by_query_parameters,
+    retrieve_facets_by_query_parameters,
+    retrieve_jobs_version,
+    retrieve_nearby_by_query_parameters,
+    search_by_query_parameters,
+    update,
+)
 
 
 async def test_create(sqlmodel_session: Session) -> None:
@@ -57,3 +82,187 @@ async def test_delete(sqlmodel_session: Session, job: Job) -> None:
     assert deleted_job.title == job.title
     assert deleted_job.description == job.description
     assert deleted_job.department == job.department
+
+
+async def test_search_by_query_parameters(sqlmodel_session: Session) -> None:
+    company = Company(
+        name=secrets.token_hex(12),
+        jobs=[
+            Job(title="Senior Python Engineer", department="Engineering", description="Build APIs"),
+            Job(title="Data Engineer", department="Data", description="Python pipelines"),
+            Job(title="Account Manager", department="Sales", description="Grow accounts"),
+        ],
+    )
+
+    sqlmodel_session.add(company)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(company)
+
+    retrieved_jobs = await search_by_query_parameters(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        query_parameters=JobQueryParameters(q="python engineer"),
+    )
+
+    assert [retrieved_job.title for retrieved_job in retrieved_jobs] == ["Senior Python Engineer", "Data Engineer"]
+
+    retrieved_jobs = await search_by_query_parameters(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        query_parameters=JobQueryParameters(q="python", department="Data"),
+    )
+
+    assert [retrieved_job.title for retrieved_job in retrieved_jobs] == ["Data Engineer"]
+
+
+async def test_retrieve_nearby_by_query_parameters(sqlmodel_session: Session) -> None:
+    company = Company(
+        name=secrets.token_hex(12),
+        jobs=[Job(title="Kadikoy"), Job(title="Besiktas"), Job(title="Ankara"), Job(title="Remote")],
+    )
+
+    sqlmodel_session.add(company)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(company)
+
+    for job, (latitude, longitude) in zip(
+        company.jobs[:3], [(40.9903, 29.0292), (41.0422, 29.0083), (39.9334, 32.8597)], strict=True
+    ):
+        await create_location(
+            sqlmodel_session=sqlmodel_session,
+            job_id=job.id,
+            location=CreateJobLocation(latitude=latitude, longitude=longitude),
+        )
+
+    retrieved_jobs = await retrieve_nearby_by_query_parameters(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        query_parameters=JobQueryParameters(latitude=41.0369, longitude=28.9850, radius=25),
+    )
+
+    assert [retrieved_job.title for retrieved_job in retrieved_jobs] == ["Besiktas", "Kadikoy"]
+    assert retrieved_jobs[0].distance < retrieved_jobs[1].distance < 25
+
+    retrieved_jobs = await retrieve_nearby_by_query_parameters(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        query_parameters=JobQueryParameters(latitude=41.0369, longitude=28.9850, offset=1, limit=5),
+    )
+
+    assert [retrieved_job.title for retrieved_job in retrieved_jobs] == ["Kadikoy", "Ankara"]
+
+
+async def test_retrieve_facets_by_query_parameters(sqlmodel_session: Session, redis_client) -> None:
+    company = Company(name=secrets.token_hex(12))
+
+    sqlmodel_session.add(company)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(company)
+
+    for department, location_type, currency in [
+        ("Engineering", "remote", "USD"),
+        ("Engineering", "onsite", "EUR"),
+        ("Sales", "remote", "USD"),
+    ]:
+        await create(
+            sqlmodel_session=sqlmodel_session,
+            company_id=company.id,
+            job=CreateJob(
+                title=f"{department} job",
+                department=department,
+                employment_type=JobEmploymentType.FULL_TIME,
+                location=CreateJobLocation(type=location_type),
+                salary=CreateSalary(currency=currency),
+            ),
+        )
+
+    facets = await retrieve_facets_by_query_parameters(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        query_parameters=JobQueryParameters(),
+    )
+
+    assert facets.department == [
+        JobFacetCount(value="Engineering", count=2),
+        JobFacetCount(value="Sales", count=1),
+    ]
+    assert facets.employment_type == [JobFacetCount(value=JobEmploymentType.FULL_TIME, count=3)]
+    assert facets.location_type == [JobFacetCount(value="remote", count=2), JobFacetCount(value="onsite", count=1)]
+    assert facets.currency == [JobFacetCount(value="USD", count=2), JobFacetCount(value="EUR", count=1)]
+
+    facets = await retrieve_facets_by_query_parameters(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        query_parameters=JobQueryParameters(department="Engineering"),
+    )
+
+    assert facets.currency == [JobFacetCount(value="EUR", count=1), JobFacetCount(value="USD", count=1)]
+
+    assert await retrieve_jobs_version(sqlmodel_session=sqlmodel_session, company_id=company.id) == 3
+
+    cached_facets = await retrieve_cached_facets_by_query_parameters(
+        sqlmodel_session=sqlmodel_session,
+        redis_client=redis_client,
+        company_id=company.id,
+        query_parameters=JobQueryParameters(),
+    )
+
+    assert cached_facets.department == [
+        JobFacetCount(value="Engineering", count=2),
+        JobFacetCount(value="Sales", count=1),
+    ]
+    assert any(key.startswith(f"company:{company.id}:jobs:3:facets:") for key in redis_client.store)
+
+
+async def test_import_jobs(sqlmodel_session: Session) -> None:
+    company = Company(name=secrets.token_hex(12))
+
+    sqlmodel_session.add(company)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(company)
+
+    lines = [
+        "title,department,location_type,latitude,longitude,city,salary_min,salary_currency\n",
+        "Backend Engineer,Engineering,onsite,52.52,13.405,Berlin,50000,EUR\n",
+        "Account Manager,Sales,remote,,,,,\n",
+        "Data Analyst,Data,,,,,not a number,USD\n",
+        "Platform Engineer,Engineering,,,,,,\n",
+    ]
+
+    imported_jobs = await import_jobs(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        rows=read_csv_rows(lines),
+        batch_size=2,
+        max_errors=10,
+    )
+
+    assert imported_jobs.created == 3
+    assert imported_jobs.failed == 1
+    assert imported_jobs.errors[0].line == 4
+    assert imported_jobs.errors[0].error.startswith("salary.min")
+
+    sqlmodel_session.refresh(company)
+
+    jobs = {job.title: job for job in company.jobs}
+
+    assert set(jobs) == {"Backend Engineer", "Account Manager", "Platform Engineer"}
+    assert jobs["Backend Engineer"].location.address.city == "Berlin"
+    assert jobs["Backend Engineer"].location.geohash.startswith("u33")
+    assert jobs["Backend Engineer"].salary.min == 50000
+    assert jobs["Account Manager"].location.address is None
+    assert jobs["Account Manager"].salary is None
+    assert jobs["Platform Engineer"].location is None
+    assert await retrieve_jobs_version(sqlmodel_session=sqlmodel_session, company_id=company.id) == 2
+
+    imported_jobs = await import_jobs(
+        sqlmodel_session=sqlmodel_session,
+        company_id=company.id,
+        rows=read_jsonl_rows(['{"title": "Designer"}\n', "\n", "{not json\n", "[]\n"]),
+        batch_size=10,
+        max_errors=1,
+    )
+
+    assert imported_jobs.created == 1
+    assert imported_jobs.failed == 2
+    assert [error.line for error in imported_jobs.errors] == [3]
@@ -1,11 +1,15 @@
 import json
+import uuid
 from datetime import datetime, timedelta
 
 import pytest
 from fastapi.testclient import TestClient
+from minio import Minio
+from sqlmodel import Session
 from starlette.datastructures import Headers
 
 from config import get_settings
+from src.talentgate.application.models import Application
 from src.talentgate.company.models import Company
 from src.talentgate.job.enums import JobEmploymentType
 from src.talentgate.job.models import (
@@ -96,3 +100,34 @@ async def test_delete_job(client: TestClient, job: Job, headers: Headers) -> Non
     response = client.delete(url=f"/api/v1/jobs/{job.id}", headers=headers)
 
     assert response.status_code == 200
+
+
+async def test_upload_resume(
+    client: TestClient,
+    sqlmodel_session: Session,
+    minio_client: Minio,
+    job: Job,
+) -> None:
+    application = Application(job_id=job.id)
+
+    sqlmodel_session.add(application)
+    sqlmodel_session.commit()
+
+    url = f"/api/v1/jobs/{job.id}/applications/{application.id}/resume"
+    files = {"file": ("resume.pdf", b"resume", "application/pdf")}
+
+    response = client.post(url=url, files=files)
+
+    assert response.status_code == 201
+
+    stored = minio_client.buckets[settings.minio_default_bucket][f"jobs/{job.id}/applications/{application.id}/resume"]
+
+    assert stored.read() == b"resume"
+
+    response = client.post(url=url, files=files)
+
+    assert response.status_code == 409
+
+    response = client.post(url=f"/api/v1/jobs/{job.id}/applications/{uuid.uuid4()}/resume", files=files)
+
+    assert response.status_code == 404
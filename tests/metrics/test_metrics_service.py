@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlmodel import Session
+
+from src.talentgate.auth.service import throttle_login
+from src.talentgate.email.models import EmailOutbox
+from src.talentgate.email.worker import process_outbox
+from src.talentgate.metrics.middleware import MetricsMiddleware
+from src.talentgate.metrics.service import monitor_event_loop, observe
+from src.talentgate.metrics.views import router as metrics_router
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_observe() -> None:
+    calls = sample("talentgate_external_call_duration_seconds_count", service="minio", operation="get_object")
+    errors = sample("talentgate_external_call_errors_total", service="minio", operation="get_object")
+
+    with observe("minio", "get_object"):
+        pass
+
+    with pytest.raises(ValueError), observe("minio", "get_object"):
+        raise ValueError
+
+    assert (
+        sample("talentgate_external_call_duration_seconds_count", service="minio", operation="get_object") == calls + 2
+    )
+    assert sample("talentgate_external_call_errors_total", service="minio", operation="get_object") == errors + 1
+
+
+async def test_metrics_middleware() -> None:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def retrieve_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    requests = sample("talentgate_http_request_duration_seconds_count", **labels, status="200")
+
+    with TestClient(app) as client:
+        assert client.get("/items/1").status_code == 200
+        assert client.get("/items/2").status_code == 200
+        assert client.get("/missing").status_code == 404
+
+    assert sample("talentgate_http_request_duration_seconds_count", **labels, status="200") == requests + 2
+    assert sample("talentgate_http_requests_in_progress", **labels) == 0
+    assert sample("talentgate_background_tasks_in_progress", route="/items/{item_id}") == 0
+    assert sample("talentgate_http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+
+
+async def test_monitor_event_loop() -> None:
+    samples = sample("talentgate_event_loop_lag_seconds_count")
+
+    task = asyncio.create_task(monitor_event_loop(interval=0.01))
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    assert sample("talentgate_event_loop_lag_seconds_count") > samples
+
+
+async def test_retrieve_metrics(sqlmodel_session: Session, redis_client: Any, email_client: Any) -> None:
+    for _ in range(2):
+        sqlmodel_session.add(EmailOutbox(subject="subject", to_addrs="to@example.com"))
+    sqlmodel_session.commit()
+
+    await process_outbox(sqlmodel_session=sqlmodel_session, email_client=email_client, batch_size=1)
+
+    for _ in range(2):
+        await throttle_login(
+            redis_client=redis_client,
+            email="user@example.com",
+            ip="127.0.0.1",
+            email_limit=1,
+            ip_limit=10,
+            window=60,
+            lockout=60,
+        )
+
+    app = FastAPI()
+    app.include_router(metrics_router)
+
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "talentgate_email_outbox_pending 1.0" in response.text
+    assert 'talentgate_login_throttle_events{event="attempts"} 2.0' in response.text
+    assert 'talentgate_login_throttle_events{event="lockouts"} 1.0' in response.text
+    assert "talentgate_http_request_duration_seconds" in response.text
@@ -0,0 +1,8 @@
+import pytest
+from sqlmodel import Session
+
+
+@pytest.fixture
+def sqlmodel_session(savepoint_sqlmodel_session: Session) -> Session:
+    # the payment worker rolls back an event that failed unexpectedly
+    return savepoint_sqlmodel_session
@@ -0,0 +1,138 @@
+import hashlib
+import hmac
+import json
+import time
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+from sqlmodel import Session
+
+from config import get_settings
+from src.talentgate.payment import service as payment_service
+from src.talentgate.payment.enums import PaymentEventStatus
+from src.talentgate.payment.models import PaymentCheckout
+from src.talentgate.payment.worker import reconcile
+from src.talentgate.user.models import User
+
+settings = get_settings()
+
+
+def sign(body: bytes, key: str) -> str:
+    timestamp = int(time.time())
+    digest = hmac.new(key.encode(), f"{timestamp}:{body.decode()}".encode(), hashlib.sha256).hexdigest()
+    return f"ts={timestamp};h1={digest}"
+
+
+def make_event(event_id: str, event_type: str, data: dict) -> dict:
+    return {
+        "event_id": event_id,
+        "event_type": event_type,
+        "occurred_at": "2025-01-01T00:00:00+00:00",
+        "data": data,
+    }
+
+
+async def test_verify_webhook() -> None:
+    body = json.dumps(make_event("evt_1", "subscription.updated", {"id": "sub_1"})).encode()
+
+    assert payment_service.verify_webhook(body=body, signature=sign(body, "secret"), key="secret") is True
+    assert payment_service.verify_webhook(body=body, signature=sign(body, "invalid"), key="secret") is False
+    assert payment_service.verify_webhook(body=body, signature=None, key="secret") is False
+
+
+async def test_create_event_is_idempotent(sqlmodel_session: Session) -> None:
+    event = make_event("evt_1", "subscription.updated", {"id": "sub_1"})
+
+    created_event = await payment_service.create_event(sqlmodel_session=sqlmodel_session, event=event)
+    duplicated_event = await payment_service.create_event(sqlmodel_session=sqlmodel_session, event=event)
+
+    assert created_event.id == "evt_1"
+    assert created_event.status == PaymentEventStatus.PENDING
+    assert duplicated_event is None
+
+
+async def test_process_subscription_canceled_event(sqlmodel_session: Session, paddle_client: Any, user: User) -> None:
+    user.subscription.paddle_subscription_id = "sub_1"
+    sqlmodel_session.add(user.subscription)
+    sqlmodel_session.commit()
+
+    created_event = await payment_service.create_event(
+        sqlmodel_session=sqlmodel_session,
+        event=make_event("evt_1", "subscription.canceled", {"id": "sub_1", "status": "canceled"}),
+    )
+
+    processed_event = await payment_service.process_event(paddle_client, sqlmodel_session, created_event.id)
+
+    assert processed_event.status == PaymentEventStatus.PROCESSED
+    assert user.subscription.paddle_subscription_id is None
+
+
+async def test_process_transaction_event_before_checkout(sqlmodel_session: Session, paddle_client: Any) -> None:
+    created_event = await payment_service.create_event(
+        sqlmodel_session=sqlmodel_session,
+        event=make_event("evt_1", "transaction.completed", {"id": "txn_1"}),
+    )
+
+    processed_event = await payment_service.process_event(paddle_client, sqlmodel_session, created_event.id)
+
+    assert processed_event.status == PaymentEventStatus.PENDING
+    assert processed_event.attempts == 1
+    assert processed_event.last_error == "Transaction txn_1 not found."
+
+    for _ in range(settings.payment_event_max_attempts - 1):
+        processed_event = await payment_service.process_event(paddle_client, sqlmodel_session, created_event.id)
+
+    assert processed_event.status == PaymentEventStatus.FAILED
+    assert processed_event.attempts == settings.payment_event_max_attempts
+
+
+async def test_reconcile_failing_event(sqlmodel_session: Session, paddle_client: Any, user: User) -> None:
+    user.subscription.paddle_subscription_id = "sub_1"
+    sqlmodel_session.add(user.subscription)
+    sqlmodel_session.commit()
+
+    failing_event = await payment_service.create_event(
+        sqlmodel_session=sqlmodel_session,
+        event=make_event("evt_1", "transaction.completed", {}),
+    )
+    processed_event = await payment_service.create_event(
+        sqlmodel_session=sqlmodel_session,
+        event=make_event("evt_2", "subscription.canceled", {"id": "sub_1", "status": "canceled"}),
+    )
+
+    await reconcile(
+        paddle_client=paddle_client,
+        sqlmodel_session=sqlmodel_session,
+        created_before=time.time() + 1,
+        limit=10,
+    )
+
+    sqlmodel_session.refresh(failing_event)
+    sqlmodel_session.refresh(processed_event)
+
+    assert failing_event.status == PaymentEventStatus.PENDING
+    assert failing_event.attempts == 1
+    assert failing_event.last_error == "'id'"
+    assert processed_event.status == PaymentEventStatus.PROCESSED
+
+
+async def test_create_transaction(sqlmodel_session: Session, user: User) -> None:
+    created_transaction = await payment_service.create_transaction(
+        sqlmodel_session=sqlmodel_session,
+        user_id=user.id,
+        transaction_id="txn_1",
+    )
+    retrieved_transaction = await payment_service.create_transaction(
+        sqlmodel_session=sqlmodel_session,
+        user_id=user.id,
+        transaction_id="txn_1",
+    )
+
+    assert created_transaction.id == retrieved_transaction.id == "txn_1"
+
+
+@pytest.mark.parametrize("checkout", [{}, {"transaction_id": None}, {"transaction_id": ""}])
+async def test_payment_checkout_requires_transaction_id(checkout: dict) -> None:
+    with pytest.raises(ValidationError):
+        PaymentCheckout.model_validate(checkout)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.talentgate.resume.similarity import screen, tokenize, top_k, vectorize
+
+
+def test_tokenize() -> None:
+    assert tokenize("The C++ and Node.js developer.") == [
+        "c++",
+        "node.js",
+        "developer",
+        "c++ node.js",
+        "node.js developer",
+    ]
+
+
+def test_vectorize() -> None:
+    vectors = vectorize(["python django postgres", "python django postgres", ""], dimensions=256)
+
+    assert vectors.dtype == np.float16
+    assert vectors.shape == (3, 256)
+    assert np.isclose(np.linalg.norm(vectors[0].astype(np.float32)), 1, atol=1e-2)
+    assert np.array_equal(vectors[0], vectors[1])
+    assert not vectors[2].any()
+
+
+def test_top_k() -> None:
+    vectors = np.eye(4, dtype=np.float16)
+    query = np.array([0.8, 0.6, 0.0, 0.1], dtype=np.float16)
+
+    assert [index for index, _ in top_k(vectors, query, block_size=3)] == [0, 1, 3, 2]
+    assert [index for index, _ in top_k(vectors, query, k=2)] == [0, 1]
+    assert [index for index, _ in top_k(vectors, query, threshold=0.5)] == [0, 1]
+
+
+def test_screen() -> None:
+    documents = {
+        "backend": "Senior Python engineer building Django REST APIs on PostgreSQL and Kubernetes",
+        "frontend": "React and TypeScript engineer focused on design systems",
+        "chef": "Pastry chef with ten years of restaurant kitchen experience",
+    }
+
+    similarities = screen(
+        documents,
+        query="We are hiring a Python engineer to build Django APIs backed by PostgreSQL",
+        dimensions=4096,
+        threshold=0.05,
+    )
+
+    assert list(similarities)[0] == "backend"
+    assert "chef" not in similarities
+
+    similarities = screen(documents, query="python django engineer", dimensions=4096, k=1)
+
+    assert list(similarities) == ["backend"]
@@ -0,0 +1,80 @@
+import uuid
+
+from sqlmodel import Session
+
+from src.talentgate.application.models import Applicant, Application
+from src.talentgate.job.models import Job
+from src.talentgate.skill.enums import SkillMatch
+from src.talentgate.skill.models import SkillQueryParameters
+from src.talentgate.skill.service import (
+    canonicalize,
+    replace_applicant_skills,
+    retrieve_applications_by_skills,
+    split_skills,
+)
+
+
+def test_canonicalize() -> None:
+    assert canonicalize("  Python3 ") == "python"
+    assert canonicalize("K8s") == "kubernetes"
+    assert canonicalize("Google   Cloud") == "gcp"
+    assert canonicalize("C++") == "c++"
+    assert canonicalize(" - ") is None
+
+
+def test_split_skills() -> None:
+    assert split_skills("Python, Django; postgres | JS\n• python") == ["python", "django", "postgresql", "javascript"]
+    assert split_skills(["ReactJS", "react"]) == ["react"]
+    assert split_skills(None) == []
+
+
+async def test_retrieve_applications_by_skills(sqlmodel_session: Session) -> None:
+    job = Job(title="job title")
+
+    sqlmodel_session.add(job)
+    sqlmodel_session.commit()
+    sqlmodel_session.refresh(job)
+
+    applications = [
+        Application(job_id=job.id, overall_score=score, applicant=Applicant(firstname=firstname))
+        for firstname, score in [("ada", 90), ("linus", 70), ("grace", 80)]
+    ]
+
+    sqlmodel_session.add_all(applications)
+    sqlmodel_session.commit()
+
+    skills: dict[uuid.UUID, list[str]] = {
+        applications[0].id: split_skills("python, postgres, k8s"),
+        applications[1].id: split_skills("c, python"),
+        applications[2].id: split_skills("cobol"),
+    }
+
+    replace_applicant_skills(sqlmodel_session=sqlmodel_session, skills=skills)
+    sqlmodel_session.commit()
+
+    retrieved_applications = await retrieve_applications_by_skills(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job.id,
+        query_parameters=SkillQueryParameters(skills=["Python", "PostgreSQL"]),
+    )
+
+    assert [application.firstname for application in retrieved_applications] == ["ada"]
+
+    retrieved_applications = await retrieve_applications_by_skills(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job.id,
+        query_parameters=SkillQueryParameters(skills=["kubernetes", "COBOL"], match=SkillMatch.ANY),
+    )
+
+    assert [application.firstname for application in retrieved_applications] == ["ada", "grace"]
+
+    replace_applicant_skills(sqlmodel_session=sqlmodel_session, skills={applications[0].id: ["go"]})
+    sqlmodel_session.commit()
+
+    retrieved_applications = await retrieve_applications_by_skills(
+        sqlmodel_session=sqlmodel_session,
+        job_id=job.id,
+        query_parameters=SkillQueryParameters(skills=["python"]),
+    )
+
+    assert [application.firstname for application in retrieved_applications] == ["linus"]